@@ -0,0 +1,20 @@
+"""
+Backend de SQLite que inicia las transacciones con BEGIN IMMEDIATE.
+
+Con el BEGIN de Django (DEFERRED), una transacción que lee y luego escribe, como el
+registro de un voto, pide el lock de escritura recién en su primera escritura. Si
+otra conexión ya lo tiene, SQLite devuelve "database is locked" de inmediato, sin
+esperar `busy_timeout`, porque esperar podría producir un deadlock. Con BEGIN
+IMMEDIATE el lock se pide al iniciar la transacción, donde sí se respeta
+`busy_timeout`, y las escrituras concurrentes esperan su turno en lugar de fallar.
+
+Uso:
+    DATABASES = {'default': {'ENGINE': 'quizes.backends.sqlite3', ...}}
+"""
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
@@ -0,0 +1,220 @@
+"""
+Módulo del backend de cache compartido sobre un archivo SQLite.
+
+Los caches de Django en memoria (`LocMemCache`) son propios de cada proceso, y los
+de archivo y base de datos implementan `incr` como una lectura seguida de una
+escritura, por lo que dos procesos que incrementan a la vez pueden obtener el mismo
+valor. El leaderboard (survey/leaderboard.py) numera sus eventos con `incr` y el
+cache de páginas (survey/page_cache.py) versiona las páginas con él, así que con
+varios workers necesitan un cache compartido con `add` e `incr` atómicos.
+
+Clases:
+    - SQLiteCache: Backend de cache de Django guardado en un archivo SQLite,
+      compartido por todos los procesos del servidor, con `add` e `incr` atómicos.
+
+Uso:
+    CACHES = {
+        'default': {
+            'BACKEND': 'quizes.cache.SQLiteCache',
+            'LOCATION': '/var/tmp/quizes/cache.sqlite3',
+        },
+    }
+
+Para varios servidores se debe usar un cache de red con operaciones atómicas
+(memcached o redis).
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """
+    Backend de cache de Django sobre un archivo SQLite en modo WAL.
+
+    Cada entrada es una fila `(key, value, expires)`. Los enteros se guardan como
+    INTEGER, de modo que `incr` los suma con una única sentencia UPDATE dentro de una
+    transacción BEGIN IMMEDIATE; el resto de los valores se guardan serializados con
+    pickle. `add` es un único upsert que solo reemplaza entradas vencidas.
+
+    Cada hilo usa su propia conexión, y un proceso creado con fork abre conexiones
+    nuevas en lugar de usar las del proceso padre.
+
+    Atributos:
+        - location (str): Ruta del archivo SQLite.
+        - busy_timeout (float): Segundos que una escritura espera el lock
+          (`OPTIONS['BUSY_TIMEOUT']`, 5 por defecto).
+
+    Al superar `MAX_ENTRIES` se descartan las entradas vencidas y, si no alcanza,
+    `1 / CULL_FREQUENCY` de las entradas que vencen antes; las entradas sin
+    vencimiento se descartan en último lugar.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.location = str(location)
+        self.busy_timeout = params.get("OPTIONS", {}).get("BUSY_TIMEOUT", 5)
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        directory = os.path.dirname(self.location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Sin isolation_level cada sentencia se confirma sola; las que deben ser
+        # atómicas en conjunto se agrupan con BEGIN IMMEDIATE
+        connection = sqlite3.connect(
+            self.location, timeout=self.busy_timeout, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)"
+        )
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def _encode(value):
+        # Los enteros se guardan tal cual para que incr los sume en SQL
+        if type(value) is int:
+            return value
+
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, int):
+            return value
+
+        return pickle.loads(value)
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+
+        return key
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        cursor = self._connection().execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+            "expires = excluded.expires WHERE cache.expires <= ?",
+            (key, self._encode(value), self.get_backend_timeout(timeout), time.time()),
+        )
+        added = cursor.rowcount == 1
+        if added:
+            self._cull()
+
+        return added
+
+    def get(self, key, default=None, version=None):
+        key = self._key(key, version)
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+
+        return default if row is None else self._decode(row[0])
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(keys))
+        rows = self._connection().execute(
+            f"SELECT key, value FROM cache WHERE key IN ({placeholders}) "
+            "AND (expires IS NULL OR expires > ?)",
+            (*keys, time.time()),
+        )
+
+        return {keys[key]: self._decode(value) for key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, self._encode(value), self.get_backend_timeout(timeout)),
+        )
+        self._cull()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        cursor = self._connection().execute(
+            "UPDATE cache SET expires = ? WHERE key = ? "
+            "AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self._key(key, version)
+        cursor = self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        # La suma y la lectura del resultado ocurren con el lock de escritura, por
+        # lo que dos procesos nunca obtienen el mismo valor
+        made_key = self._key(key, version)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = connection.execute(
+                "UPDATE cache SET value = value + ? WHERE key = ? "
+                "AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?)",
+                (delta, made_key, time.time()),
+            )
+            row = None
+            if cursor.rowcount == 1:
+                row = connection.execute(
+                    "SELECT value FROM cache WHERE key = ?", (made_key,)
+                ).fetchone()
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+        if row is None:
+            raise ValueError(f"Key '{key}' not found")
+
+        return row[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache")
+
+    def _cull(self):
+        connection = self._connection()
+        connection.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+
+        count = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self._max_entries:
+            connection.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                "ORDER BY expires IS NULL, expires LIMIT ?)",
+                (max(count // self._cull_frequency, count - self._max_entries),),
+            )
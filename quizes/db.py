@@ -0,0 +1,22 @@
+"""
+Módulo de configuración de las conexiones a la base de datos.
+
+Funciones:
+    - set_sqlite_pragmas(sender, connection): Receptor de `connection_created` que
+      aplica los PRAGMA de `SURVEY_SQLITE_PRAGMAS` a cada conexión nueva de SQLite.
+
+Con `CONN_MAX_AGE` las conexiones se reutilizan entre requests, por lo que los
+PRAGMA se aplican una vez por conexión y no en cada request.
+"""
+
+from django.conf import settings
+
+
+def set_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+
+    # Se ejecutan sobre la conexión de sqlite3 para no abrir una transacción ni
+    # registrar las consultas en connection.queries
+    for name, value in getattr(settings, "SURVEY_SQLITE_PRAGMAS", {}).items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,119 @@
+"""
+Módulo de enrutamiento de lecturas a una réplica de la base de datos.
+
+Las vistas de lectura más pedidas (`SURVEY_READ_VIEWS`: los listados y el overlay)
+leen las tablas de la aplicación `survey` desde la réplica (`SURVEY_READ_DATABASE`),
+mientras que los votos, la creación y edición de preguntas y cualquier otra
+escritura van a la base principal. Las sesiones y los usuarios autenticados siempre
+se leen de la principal.
+
+Clases:
+    - ReadReplicaRouter: Router de Django que envía las lecturas de las vistas de
+      lectura a la réplica y las escrituras a la principal.
+    - ReadReplicaMiddleware: Activa la réplica en las vistas de lectura y fija a la
+      principal al usuario que acaba de escribir.
+
+Lectura de las propias escrituras:
+    La réplica puede estar atrasada respecto de la principal. Cuando un request
+    escribe (por ejemplo, un voto), la respuesta incluye una cookie que dura
+    `SURVEY_READ_STICKINESS` segundos; mientras exista, las vistas de lectura de ese
+    usuario leen de la principal y muestran su propio voto.
+
+Sin `SURVEY_READ_DATABASE` todas las consultas usan la base principal.
+"""
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Estado del request actual: si sus lecturas van a la réplica y si escribió
+_state = Local()
+
+STICKY_COOKIE = "survey_primary"
+
+
+def read_database():
+    return getattr(settings, "SURVEY_READ_DATABASE", None)
+
+
+class ReadReplicaRouter:
+    """
+    Router de lecturas a la réplica y escrituras a la base principal.
+
+    Atributos:
+        - route_app_labels (set): Aplicaciones cuyas tablas se leen de la réplica.
+
+    Métodos:
+        - `db_for_read(model)`: Devuelve la réplica para los modelos de
+          `route_app_labels` dentro de una vista de lectura.
+        - `db_for_write(model)`: Devuelve siempre la base principal y registra que el
+          request escribió.
+        - `allow_migrate(db, app_label)`: Impide migrar la réplica, que es una copia
+          de la principal.
+    """
+
+    route_app_labels = {"survey"}
+
+    def db_for_read(self, model, **hints):
+        if getattr(_state, "replica", False) and (
+            model._meta.app_label in self.route_app_labels
+        ):
+            return read_database()
+
+        return None
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+
+        # Explícito: una instancia leída de la réplica también se guarda en la principal
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == read_database():
+            return False
+
+        return None
+
+
+class ReadReplicaMiddleware:
+    """
+    Middleware que activa la réplica para las vistas de `SURVEY_READ_VIEWS`.
+
+    Un request usa la réplica si su vista está en `SURVEY_READ_VIEWS` y no trae la
+    cookie de lectura de las propias escrituras. Si el request escribió en la base de
+    datos, la respuesta renueva esa cookie por `SURVEY_READ_STICKINESS` segundos.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.replica = False
+        _state.wrote = False
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.replica = False
+
+        if _state.wrote and read_database():
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=getattr(settings, "SURVEY_READ_STICKINESS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not read_database() or STICKY_COOKIE in request.COOKIES:
+            return None
+
+        views = getattr(settings, "SURVEY_READ_VIEWS", [])
+        _state.replica = request.resolver_match.view_name in views
+
+        return None
@@ -48,6 +48,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'quizes.routers.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'quizes.urls'
@@ -81,6 +82,44 @@ DATABASES = {
     }
 }
 
+# Lecturas de los listados desde una réplica (quizes/routers.py). Con
+# SURVEY_READ_DATABASE = None todas las consultas usan 'default'.
+
+DATABASE_ROUTERS = ['quizes.routers.ReadReplicaRouter']
+
+SURVEY_READ_DATABASE = None
+
+SURVEY_READ_VIEWS = [
+    'survey:question-list',
+    'survey:question-edit-list',
+    'survey:question-overlay',
+]
+
+# Segundos que un usuario lee de la base principal después de escribir, para ver
+# sus propios votos aunque la réplica esté atrasada
+
+SURVEY_READ_STICKINESS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Páginas renderizadas (survey/page_cache.py): descarte por cantidad. El TTL de
+    # cada página es SURVEY_PAGE_CACHE_TIMEOUT
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'survey-pages',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -127,4 +166,65 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = '/registration/login/'
 LOGIN_REDIRECT_URL = '/'
-LOGOUT_REDIRECT_URL = '/'
\ No newline at end of file
+LOGOUT_REDIRECT_URL = '/'
+
+# Leaderboard en memoria del ranking de preguntas (survey/leaderboard.py)
+# Para sincronizar varios workers, el alias debe apuntar a un cache compartido.
+
+SURVEY_LEADERBOARD_CAPACITY = 1000
+
+SURVEY_LEADERBOARD_CACHE = 'default'
+
+# Cache de páginas renderizadas para usuarios anónimos (survey/page_cache.py)
+
+SURVEY_PAGE_CACHE = 'pages'
+
+SURVEY_PAGE_CACHE_TIMEOUT = 60
+
+# Con True, el listado principal se sirve sin estado del usuario desde el cache y
+# el navegador aplica los votos del usuario con el endpoint question-overlay.
+
+SURVEY_LIST_OVERLAY = False
+
+# Segundos que el navegador y los caches intermedios guardan la descripción de una
+# pregunta (endpoint question-description). Una edición tarda a lo sumo ese tiempo
+# en verse en los listados.
+
+SURVEY_DESCRIPTION_MAX_AGE = 300
+
+# Buffer de escritura diferida de votos (survey/vote_buffer.py). Con True, las vistas
+# de votación encolan los votos y un hilo los guarda en lotes cada
+# SURVEY_VOTE_BUFFER_INTERVAL milisegundos o al acumular SURVEY_VOTE_BUFFER_SIZE votos.
+# Los votos que no se pudieron guardar al cerrar se respaldan en un archivo por proceso
+# junto a SURVEY_VOTE_BUFFER_SPOOL (vote_buffer.<pid>-<ms>.json).
+
+SURVEY_VOTE_BUFFER = False
+
+SURVEY_VOTE_BUFFER_INTERVAL = 500
+
+SURVEY_VOTE_BUFFER_SIZE = 500
+
+SURVEY_VOTE_BUFFER_SPOOL = BASE_DIR / 'vote_buffer.json'
+
+# Calentamiento del proceso al iniciar (survey/apps.py). Se activa en
+# quizes/settings_production.py, junto con el loader de plantillas cacheado.
+
+SURVEY_WARMUP = False
+
+# PRAGMA que se aplican a cada conexión nueva de SQLite (quizes/db.py). La
+# configuración de producción activa WAL, synchronous=NORMAL, busy_timeout y mmap.
+
+SURVEY_SQLITE_PRAGMAS = {}
+
+# Recálculo incremental de los puntajes (`python manage.py refresh_question_scores`).
+# Cada ejecución vuelve a contar las preguntas con votos escritos desde la anterior,
+# con SURVEY_SCORE_REFRESH_OVERLAP segundos de margen.
+
+SURVEY_SCORE_REFRESH_OVERLAP = 60
+
+# Estrategia de ranking de las preguntas (survey/ranking.py): 'default' (puntos del
+# enunciado), 'hot' (decaimiento en el tiempo), 'wilson' (cota de Wilson sobre las
+# respuestas) o la ruta de una clase propia. Al cambiarla se debe ejecutar
+# `python manage.py recompute_rankings` para recalcular el ranking guardado.
+
+SURVEY_RANKING_STRATEGY = 'default'
@@ -0,0 +1,120 @@
+"""
+Django settings for quizes project in production.
+
+Extiende quizes/settings.py con la configuración para servir la aplicación con
+varios workers:
+- DEBUG desactivado y SECRET_KEY / ALLOWED_HOSTS desde variables de entorno.
+- SQLite en modo WAL con conexiones persistentes y una réplica opcional para los
+  listados.
+- Caches compartidos por los workers en archivos SQLite, para que el leaderboard,
+  el cache de páginas y las invalidaciones de los comandos lleguen a todos.
+- Loader de plantillas cacheado: cada plantilla se lee y compila una sola vez por
+  proceso.
+- Calentamiento de cada worker al iniciar (SurveyConfig.ready en survey/apps.py).
+
+Uso:
+    DJANGO_SETTINGS_MODULE=quizes.settings_production
+"""
+
+import os
+
+from quizes.settings import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+# SQLite: cada worker reutiliza su conexión por CONN_MAX_AGE segundos y cada conexión
+# nueva recibe los PRAGMA de SURVEY_SQLITE_PRAGMAS (quizes/db.py):
+# - journal_mode=WAL: los lectores no se bloquean con las escrituras del ranking.
+# - synchronous=NORMAL: en WAL no se pierde la integridad ante un corte de energía;
+#   solo las últimas transacciones confirmadas.
+# - busy_timeout: milisegundos que una escritura espera el lock antes de fallar.
+# - mmap_size y cache_size (en KiB si es negativo): lecturas desde memoria.
+# El backend quizes.backends.sqlite3 inicia las transacciones con BEGIN IMMEDIATE,
+# para que las escrituras concurrentes esperen busy_timeout en lugar de fallar.
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'quizes.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+    }
+}
+
+# Réplica de solo lectura para los listados (quizes/routers.py), si se indica su
+# archivo en DJANGO_REPLICA_NAME. La copia desde la base principal se hace fuera de
+# la aplicación (por ejemplo, con la API de backup de SQLite o Litestream).
+
+if os.environ.get('DJANGO_REPLICA_NAME'):
+    DATABASES['replica'] = dict(
+        DATABASES['default'], NAME=os.environ['DJANGO_REPLICA_NAME']
+    )
+    SURVEY_READ_DATABASE = 'replica'
+
+SURVEY_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -16000,
+    'temp_store': 'MEMORY',
+}
+
+# Caches compartidos por todos los workers del servidor (quizes/cache.py), en
+# archivos SQLite dentro de SURVEY_CACHE_DIR. El leaderboard numera sus eventos y el
+# cache de páginas versiona las páginas con incr, que en este backend es atómico; con
+# caches en memoria cada worker mostraría su propio ranking y los comandos
+# (rollover_rankings, refresh_question_scores) no invalidarían a los workers. Con
+# varios servidores, ambos alias deben apuntar a memcached o redis.
+
+SURVEY_CACHE_DIR = os.environ.get('SURVEY_CACHE_DIR', BASE_DIR / 'cache')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'quizes.cache.SQLiteCache',
+        'LOCATION': os.path.join(SURVEY_CACHE_DIR, 'default.sqlite3'),
+    },
+    'pages': dict(
+        CACHES['pages'],
+        BACKEND='quizes.cache.SQLiteCache',
+        LOCATION=os.path.join(SURVEY_CACHE_DIR, 'pages.sqlite3'),
+    ),
+}
+
+# Con 'loaders' definido, APP_DIRS debe ser False: el loader de aplicaciones se
+# incluye dentro del loader cacheado
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Calentamiento de cada worker al iniciar (survey/apps.py): compila estas plantillas,
+# resuelve el URLconf y carga el leaderboard
+
+SURVEY_WARMUP = os.environ.get('SURVEY_WARMUP', '1') == '1'
+
+SURVEY_WARMUP_TEMPLATES = [
+    'base.html',
+    'survey/question_list.html',
+    'survey/question_cards.html',
+    'survey/pagination.html',
+]
@@ -0,0 +1,80 @@
+"""
+Este script mide el costo de renderizar las tarjetas del listado de preguntas
+(`survey/question_cards.html`).
+
+Para 20, 200 y 2.000 preguntas mide el mejor tiempo de renderizado y el tamaño del
+HTML generado, en total y por tarjeta, para un usuario anónimo y para el autor de
+las preguntas en su listado (que además muestra los botones de editar y eliminar).
+
+Las preguntas son registros en memoria (`QuestionRecord`), por lo que el script no
+consulta ni modifica la base de datos.
+
+Uso:
+    python manage.py shell < scripts/bench_question_cards.py
+"""
+
+import time
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from survey.records import QuestionRecord
+
+SIZES = [20, 200, 2000]
+REPEATS = 5
+
+
+def make_questions(n, author):
+    questions = [
+        QuestionRecord(i, f"Pregunta {i}", author.pk, author.username, i % 100)
+        for i in range(1, n + 1)
+    ]
+    for question in questions:
+        question.set_votes(question.pk % 6, question.pk % 2 == 0, question.pk % 3 == 0)
+
+    return questions
+
+
+def measure(template, context, request):
+    """
+    Devuelve el mejor tiempo de renderizado en milisegundos y el tamaño en bytes del
+    HTML generado.
+    """
+    html = template.render(context, request)
+
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        template.render(context, request)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, len(html.encode())
+
+
+template = get_template("survey/question_cards.html")
+author = User(pk=1, username="bench-author")
+factory = RequestFactory()
+
+cases = [
+    ("anónimo", AnonymousUser(), "/"),
+    ("autor", author, "/question/edit-list/"),
+]
+
+print(
+    f"{'filas':>6} {'usuario':>8} {'tiempo (ms)':>12} {'µs/tarjeta':>11} "
+    f"{'KiB':>9} {'bytes/tarjeta':>14}"
+)
+for size in SIZES:
+    questions = make_questions(size, author)
+    for name, user, path in cases:
+        request = factory.get(path)
+        request.user = user
+        context = {"questions": questions}
+
+        elapsed, length = measure(template, context, request)
+        print(
+            f"{size:>6} {name:>8} {elapsed:>12.2f} {elapsed * 1000 / size:>11.1f} "
+            f"{length / 1024:>9.1f} {length / size:>14.0f}"
+        )
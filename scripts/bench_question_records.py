@@ -0,0 +1,116 @@
+"""
+Este script compara el costo de serializar el listado de preguntas con
+instancias del modelo y con registros livianos (`QuestionRecord`).
+
+Para 20, 1.000 y 10.000 filas mide el tiempo de CPU y la memoria máxima
+asignada (tracemalloc) por request de:
+- modelo: instancias completas de Question con su autor, copiadas a diccionarios.
+- registros: filas de values_list convertidas en QuestionRecord.
+
+Las preguntas de prueba se crean dentro de una transacción que se revierte al
+final, por lo que la base de datos no se modifica.
+
+Uso:
+    python manage.py shell < scripts/bench_question_records.py
+"""
+
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from survey.models import Question, QuestionScore
+from survey.records import QuestionRecord
+from survey.views import QuestionManager
+
+SIZES = [20, 1000, 10000]
+REPEATS = 5
+
+
+def serialize_models(n):
+    questions = Question.objects.select_related("author", "score").order_by(
+        "-score__base_score", "pk"
+    )
+    return [
+        {
+            "pk": question.pk,
+            "title": question.title,
+            "author_id": question.author_id,
+            "author": question.author.username,
+            "ranking": question.score.base_score,
+        }
+        for question in questions[:n]
+    ]
+
+
+def serialize_records(n):
+    return QuestionRecord.from_rows(
+        QuestionManager.get_listed_questions().order_by("-ranking", "pk")[:n]
+    )
+
+
+def measure(function, n):
+    """
+    Devuelve el mejor tiempo de CPU en milisegundos y la memoria máxima asignada
+    en KiB de `function(n)`.
+    """
+    function(n)
+
+    cpu = min(_cpu_time(function, n) for _ in range(REPEATS))
+
+    tracemalloc.start()
+    function(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return cpu, peak / 1024
+
+
+def _cpu_time(function, n):
+    start = time.process_time()
+    function(n)
+    return (time.process_time() - start) * 1000
+
+
+with transaction.atomic():
+    author = get_user_model().objects.create_user(username="bench-author")
+    Question.objects.bulk_create(
+        (
+            Question(
+                title=f"Pregunta {i}",
+                description="Descripción de la pregunta. " * 20,
+                author=author,
+            )
+            for i in range(max(SIZES))
+        ),
+        batch_size=1000,
+    )
+    QuestionScore.objects.bulk_create(
+        (
+            QuestionScore(question_id=pk, base_score=pk % 100)
+            for pk in Question.objects.filter(author=author).values_list(
+                "pk", flat=True
+            )
+        ),
+        batch_size=1000,
+    )
+
+    print(f"{'filas':>6} {'ruta':>10} {'CPU (ms)':>10} {'memoria (KiB)':>14}")
+    for size in SIZES:
+        results = {}
+        for name, function in (
+            ("modelo", serialize_models),
+            ("registros", serialize_records),
+        ):
+            results[name] = measure(function, size)
+            cpu, memory = results[name]
+            print(f"{size:>6} {name:>10} {cpu:>10.2f} {memory:>14.1f}")
+
+        (model_cpu, model_memory), (record_cpu, record_memory) = results.values()
+        print(
+            f"{'':>6} {'ahorro':>10} {1 - record_cpu / model_cpu:>10.0%} "
+            f"{1 - record_memory / model_memory:>14.0%}"
+        )
+
+    transaction.set_rollback(True)
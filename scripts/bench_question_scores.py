@@ -0,0 +1,100 @@
+"""
+Este script compara el recálculo incremental de los puntajes
+(`refresh_question_scores`) con el recálculo completo (`recompute_rankings`) y mide
+la lectura del leaderboard desde `QuestionScore`.
+
+Crea 20.000 preguntas con 100.000 votos, ejecuta un primer recálculo completo y
+luego registra 100 votos nuevos con `apply_votes`. Se informa el tiempo de:
+- recálculo completo: cuenta los votos de todas las preguntas.
+- recálculo incremental: cuenta solo las preguntas con votos nuevos.
+- leaderboard: los 1.000 mejores pares (pk, ranking) de `get_top_scores`.
+
+El recálculo incremental se ejecuta sin margen (`overlap`), ya que todos los votos
+de prueba se escriben en el mismo minuto. Los datos se crean dentro de una
+transacción que se revierte al final, por lo que la base de datos no se modifica.
+
+Uso:
+    python manage.py shell < scripts/bench_question_scores.py
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from survey.models import Answer, Question, QuestionFeedback
+from survey.views import QuestionManager
+
+QUESTIONS = 20000
+VOTERS = 5
+NEW_VOTES = 100
+REPEATS = 3
+
+
+def elapsed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+with transaction.atomic():
+    User = get_user_model()
+    author = User.objects.create_user(username="bench-author")
+    voters = [
+        User.objects.create_user(username=f"bench-voter-{i}") for i in range(VOTERS)
+    ]
+
+    for i in range(QUESTIONS):
+        Question.objects.create(title=f"Pregunta {i}", description="", author=author)
+    pks = list(Question.objects.filter(author=author).values_list("pk", flat=True))
+
+    Answer.objects.bulk_create(
+        (
+            Answer(question_id=pk, author=voter, value=random.randint(1, 5))
+            for pk in pks
+            for voter in voters[:3]
+        ),
+        batch_size=1000,
+    )
+    QuestionFeedback.objects.bulk_create(
+        (
+            QuestionFeedback(
+                question_id=pk, author=voter, value=random.choice(["like", "dislike"])
+            )
+            for pk in pks
+            for voter in voters[3:]
+        ),
+        batch_size=1000,
+    )
+
+    no_overlap = timezone.timedelta(0)
+    QuestionManager.refresh_question_scores(overlap=no_overlap)
+
+    print(f"{QUESTIONS} preguntas, {len(pks) * VOTERS} votos, {NEW_VOTES} votos nuevos")
+    print(f"{'operación':>24} {'filas':>7} {'tiempo (ms)':>12}")
+    for _ in range(REPEATS):
+        QuestionManager.apply_votes(
+            answers={
+                (voters[0].pk, pk): random.randint(1, 5)
+                for pk in random.sample(pks, NEW_VOTES)
+            }
+        )
+
+        # El recálculo completo se ejecuta en modo de prueba para no adelantar
+        # al incremental
+        full = elapsed(lambda: QuestionManager.recompute_rankings(dry_run=True))
+        refreshed = []
+        incremental = elapsed(
+            lambda: refreshed.append(
+                QuestionManager.refresh_question_scores(overlap=no_overlap)
+            )
+        )
+        top = elapsed(lambda: list(QuestionManager.get_top_scores(1000)))
+
+        print(f"{'recálculo completo':>24} {len(pks):>7} {full:>12.1f}")
+        print(f"{'recálculo incremental':>24} {refreshed[0]:>7} {incremental:>12.1f}")
+        print(f"{'leaderboard':>24} {1000:>7} {top:>12.1f}")
+
+    transaction.set_rollback(True)
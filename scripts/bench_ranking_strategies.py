@@ -0,0 +1,96 @@
+"""
+Este script compara las estrategias de ranking de survey/ranking.py sobre la tabla
+`QuestionScore`.
+
+Crea 20.000 preguntas con 100.000 votos y, para cada estrategia, informa el tiempo
+de:
+- guardar: calcular el ranking de todas las filas con una sentencia UPDATE, como
+  al cambiar `SURVEY_RANKING_STRATEGY` y ejecutar `recompute_rankings`.
+- índice: las 20 mejores preguntas por el ranking guardado (`get_ranked_questions`),
+  que recorre el índice question_score_idx.
+- expresión: las 20 mejores preguntas ordenando por la expresión de la estrategia
+  (`get_ranked_questions(n, strategy)`), que calcula y ordena todas las filas.
+
+Los datos se crean dentro de una transacción que se revierte al final, por lo que
+la base de datos no se modifica.
+
+Uso:
+    python manage.py shell < scripts/bench_ranking_strategies.py
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import override_settings
+
+from survey.models import Answer, Question, QuestionFeedback, QuestionScore
+from survey.ranking import STRATEGIES
+from survey.views import QuestionManager
+
+QUESTIONS = 20000
+VOTERS = 5
+REPEATS = 3
+
+
+def elapsed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+with transaction.atomic():
+    User = get_user_model()
+    author = User.objects.create_user(username="bench-author")
+    voters = [
+        User.objects.create_user(username=f"bench-voter-{i}") for i in range(VOTERS)
+    ]
+
+    for i in range(QUESTIONS):
+        Question.objects.create(title=f"Pregunta {i}", description="", author=author)
+    pks = list(Question.objects.filter(author=author).values_list("pk", flat=True))
+
+    Answer.objects.bulk_create(
+        (
+            Answer(question_id=pk, author=voter, value=random.randint(1, 5))
+            for pk in pks
+            for voter in random.sample(voters[:3], random.randint(0, 3))
+        ),
+        batch_size=1000,
+    )
+    QuestionFeedback.objects.bulk_create(
+        (
+            QuestionFeedback(
+                question_id=pk, author=voter, value=random.choice(["like", "dislike"])
+            )
+            for pk in pks
+            for voter in voters[3:]
+        ),
+        batch_size=1000,
+    )
+    QuestionManager.sync_vote_counters()
+
+    print(f"{QUESTIONS} preguntas")
+    print(
+        f"{'estrategia':>10} {'guardar (ms)':>13} {'índice (ms)':>12} "
+        f"{'expresión (ms)':>15}"
+    )
+    for name in STRATEGIES:
+        with override_settings(SURVEY_RANKING_STRATEGY=name):
+            for _ in range(REPEATS):
+                stored = elapsed(
+                    lambda: QuestionScore.objects.update(
+                        base_score=QuestionManager.ranking_expression()
+                    )
+                )
+                indexed = elapsed(lambda: QuestionManager.get_ranked_questions(20))
+                computed = elapsed(
+                    lambda: QuestionManager.get_ranked_questions(20, strategy=name)
+                )
+
+                print(
+                    f"{name:>10} {stored:>13.1f} {indexed:>12.1f} {computed:>15.1f}"
+                )
+
+    transaction.set_rollback(True)
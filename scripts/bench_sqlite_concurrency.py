@@ -0,0 +1,206 @@
+"""
+Este script mide el rendimiento de lecturas y escrituras concurrentes sobre SQLite,
+con la configuración por defecto y con la de producción (WAL, synchronous=NORMAL,
+busy_timeout, mmap, BEGIN IMMEDIATE y conexiones persistentes).
+
+Para cada configuración copia una base de datos de prueba a un archivo temporal e
+inicia al mismo tiempo varios procesos:
+- lectores: piden la página principal como usuarios autenticados (sin el cache de
+  páginas, por lo que cada request consulta la base de datos).
+- escritores: votan preguntas al azar con los endpoints question-answer y
+  question-like.
+
+Se informa la cantidad de requests por segundo, la latencia p95 y los errores
+(por ejemplo, "database is locked") de cada tipo de proceso.
+
+Uso:
+    python scripts/bench_sqlite_concurrency.py
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+READERS = 4
+WRITERS = 2
+DURATION = 5
+QUESTIONS = 500
+
+
+def setup_django(path, tuned):
+    # Usa la configuración de producción sobre la base de datos temporal; sin
+    # `tuned` se usa el backend, los PRAGMA y las conexiones de la configuración
+    # por defecto
+    os.environ["DJANGO_SETTINGS_MODULE"] = "quizes.settings_production"
+    os.environ.setdefault("DJANGO_SECRET_KEY", "bench")
+    os.environ["SURVEY_WARMUP"] = "0"
+    sys.path.insert(0, str(BASE_DIR))
+
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = path
+    settings.ALLOWED_HOSTS = ["testserver"]
+    if not tuned:
+        settings.DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
+        settings.DATABASES["default"]["CONN_MAX_AGE"] = 0
+        settings.SURVEY_SQLITE_PRAGMAS = {}
+
+    import django
+
+    django.setup()
+
+
+def create_database(path):
+    setup_django(path, tuned=False)
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    from survey.models import Question, QuestionScore
+
+    call_command("migrate", verbosity=0)
+    author = User.objects.create_user(username="bench-author")
+    for i in range(READERS + WRITERS):
+        User.objects.create_user(username=f"bench-{i}")
+    Question.objects.bulk_create(
+        Question(title=f"Pregunta {i}", description="", author=author)
+        for i in range(QUESTIONS)
+    )
+    QuestionScore.objects.bulk_create(
+        QuestionScore(question_id=pk, base_score=pk)
+        for pk in Question.objects.values_list("pk", flat=True)
+    )
+
+
+def client_process(path, tuned, role, index, start_at):
+    setup_django(path, tuned)
+
+    from django.contrib.auth.models import User
+    from django.db import DatabaseError
+    from django.test import Client
+
+    from survey.models import Question
+
+    client = Client()
+    client.force_login(User.objects.get(username=f"bench-{index}"))
+    pks = list(Question.objects.values_list("pk", flat=True))
+
+    def request():
+        if role == "lector":
+            return client.get("/")
+        if random.random() < 0.5:
+            return client.post(
+                "/question/answer",
+                {"question_pk": random.choice(pks), "value": random.randint(1, 5)},
+            )
+        return client.post(
+            "/question/like",
+            {
+                "question_pk": random.choice(pks),
+                "value": random.choice(["like", "dislike"]),
+            },
+        )
+
+    time.sleep(max(0, start_at - time.time()))
+
+    latencies, errors = [], 0
+    while time.time() < start_at + DURATION:
+        start = time.perf_counter()
+        try:
+            ok = request().status_code == 200
+        except DatabaseError:
+            ok = False
+        if ok:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            errors += 1
+
+    return {"requests": len(latencies), "errors": errors, "latencies": latencies}
+
+
+def run(base, tuned):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.sqlite3")
+        shutil.copy(base, path)
+
+        start_at = time.time() + 3
+        roles = [("lector", i) for i in range(READERS)]
+        roles += [("escritor", READERS + i) for i in range(WRITERS)]
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    __file__,
+                    "client",
+                    path,
+                    str(int(tuned)),
+                    role,
+                    str(index),
+                    str(start_at),
+                ],
+                cwd=BASE_DIR,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for role, index in roles
+        ]
+
+        results = {}
+        for (role, _), process in zip(roles, processes):
+            output, _ = process.communicate()
+            result = results.setdefault(
+                role, {"requests": 0, "errors": 0, "latencies": []}
+            )
+            for name, value in json.loads(output).items():
+                result[name] += value
+
+    return results
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[int(len(values) * fraction)] if values else float("nan")
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["create"]:
+    create_database(sys.argv[2])
+
+elif __name__ == "__main__" and sys.argv[1:2] == ["client"]:
+    path, tuned, role, index, start_at = sys.argv[2:7]
+    print(
+        json.dumps(
+            client_process(path, tuned == "1", role, int(index), float(start_at))
+        )
+    )
+
+elif __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, "base.sqlite3")
+        subprocess.run(
+            [sys.executable, __file__, "create", base], cwd=BASE_DIR, check=True
+        )
+
+        print(
+            f"{READERS} lectores y {WRITERS} escritores durante {DURATION} s, "
+            f"{QUESTIONS} preguntas"
+        )
+        print(
+            f"{'configuración':>14} {'proceso':>9} {'req/s':>8} "
+            f"{'p95 (ms)':>9} {'errores':>8}"
+        )
+        for tuned in (False, True):
+            results = run(base, tuned)
+            for role, result in results.items():
+                print(
+                    f"{'producción' if tuned else 'por defecto':>14} {role:>9} "
+                    f"{result['requests'] / DURATION:>8.1f} "
+                    f"{percentile(result['latencies'], 0.95):>9.1f} "
+                    f"{result['errors']:>8}"
+                )
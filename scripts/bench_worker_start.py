@@ -0,0 +1,104 @@
+"""
+Este script mide el tiempo desde que se inicia un worker hasta el primer byte de
+su primera respuesta, con y sin el calentamiento de `SurveyConfig.ready()`.
+
+Cada prueba inicia un proceso nuevo con `quizes.settings_production`, carga la
+aplicación WSGI y atiende 100 requests a la página principal, invalidando el cache
+de páginas antes de cada uno para que todos rendericen el listado. Se informa:
+- inicio: desde que se crea el proceso hasta que la aplicación WSGI está lista.
+- primer byte: desde que se crea el proceso hasta el primer byte de la respuesta.
+- request 1 y request 100: duración del primer y del centésimo request.
+
+La base de datos configurada debe estar migrada (`python manage.py migrate`).
+
+Uso:
+    python scripts/bench_worker_start.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from statistics import median
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+TRIALS = 5
+REQUESTS = 100
+
+
+def worker(started):
+    """
+    Carga la aplicación WSGI y atiende los requests; devuelve los tiempos en
+    milisegundos.
+    """
+    from wsgiref.util import setup_testing_defaults
+
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    ready = time.time()
+
+    from survey.views import page_cache
+
+    durations = []
+    first_byte = None
+    for _ in range(REQUESTS):
+        page_cache.bump()
+        environ = {"PATH_INFO": "/", "SERVER_NAME": "localhost"}
+        setup_testing_defaults(environ)
+
+        start = time.time()
+        response = application(environ, lambda status, headers: None)
+        next(iter(response))
+        if first_byte is None:
+            first_byte = time.time()
+        durations.append(time.time() - start)
+        response.close()
+
+    return {
+        "inicio": (ready - started) * 1000,
+        "primer byte": (first_byte - started) * 1000,
+        "request 1": durations[0] * 1000,
+        "request 100": durations[-1] * 1000,
+    }
+
+
+def run(warmup):
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="quizes.settings_production",
+        DJANGO_SECRET_KEY=os.environ.get("DJANGO_SECRET_KEY", "bench"),
+        SURVEY_WARMUP="1" if warmup else "0",
+    )
+    started = time.time()
+    output = subprocess.run(
+        [sys.executable, __file__, "worker", str(started)],
+        cwd=BASE_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output)
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["worker"]:
+    sys.path.insert(0, str(BASE_DIR))
+    print(json.dumps(worker(float(sys.argv[2]))))
+
+elif __name__ == "__main__":
+    print(
+        f"{'calentamiento':>14} {'inicio':>9} {'primer byte':>12} "
+        f"{'request 1':>10} {'request 100':>12}   (ms, mediana de {TRIALS})"
+    )
+    for warmup in (False, True):
+        trials = [run(warmup) for _ in range(TRIALS)]
+        times = {name: median(trial[name] for trial in trials) for name in trials[0]}
+        print(
+            f"{'sí' if warmup else 'no':>14} {times['inicio']:>9.1f} "
+            f"{times['primer byte']:>12.1f} {times['request 1']:>10.1f} "
+            f"{times['request 100']:>12.1f}"
+        )
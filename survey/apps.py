@@ -1,7 +1,84 @@
+"""
+Módulo de configuración de la aplicación.
+
+Clases:
+    - SurveyConfig: Configuración de la aplicación, con los PRAGMA de las conexiones
+      de SQLite (`SURVEY_SQLITE_PRAGMAS`) y el calentamiento opcional del proceso al
+      iniciar (`SURVEY_WARMUP`).
+"""
+
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
 
+logger = logging.getLogger(__name__)
 
 
 class SurveyConfig(AppConfig):
+    """
+    Configuración de la aplicación `survey`.
+
+    Con `SURVEY_WARMUP`, al iniciar cada proceso se hace el trabajo que de otro modo
+    pagaría su primer request, de modo que el primer request de un worker nuevo
+    cueste lo mismo que los siguientes.
+
+    Métodos:
+        - `ready()`: Registra el receptor que aplica `SURVEY_SQLITE_PRAGMAS` a cada
+          conexión nueva y calienta el proceso si `SURVEY_WARMUP` es True.
+        - `warm_up()`: Compila las plantillas de `SURVEY_WARMUP_TEMPLATES`, resuelve
+          el URLconf y carga el leaderboard desde la base de datos.
+    """
+
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'survey'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from quizes.db import set_sqlite_pragmas
+
+        connection_created.connect(set_sqlite_pragmas, dispatch_uid="sqlite-pragmas")
+
+        if getattr(settings, "SURVEY_WARMUP", False):
+            self.warm_up()
+
+    def warm_up(self):
+        from importlib import import_module
+
+        from django.db import DatabaseError, connections
+        from django.template import engines
+        from django.urls import URLResolver, get_resolver
+        from django.utils.module_loading import import_string
+
+        from survey.views import leaderboard
+
+        # Con el loader cacheado, las plantillas quedan compiladas en memoria
+        engine = engines["django"]
+        engine.engine.template_context_processors
+        for name in getattr(settings, "SURVEY_WARMUP_TEMPLATES", []):
+            engine.get_template(name)
+
+        # Importa las vistas, compila las expresiones regulares de las URLs y arma
+        # las tablas de reverse de cada URLconf incluido
+        resolvers = [get_resolver()]
+        while resolvers:
+            resolver = resolvers.pop()
+            resolver.reverse_dict
+            for pattern in resolver.url_patterns:
+                pattern.pattern.regex
+                if isinstance(pattern, URLResolver):
+                    resolvers.append(pattern)
+
+        # Módulos que Django importa recién en el primer request
+        import_module(settings.SESSION_ENGINE)
+        import_string(settings.MESSAGE_STORAGE)
+
+        # La base de datos puede no estar migrada (por ejemplo, durante `migrate`)
+        try:
+            leaderboard.rebuild()
+        except DatabaseError:
+            logger.warning("No se pudo cargar el leaderboard al iniciar", exc_info=True)
+        finally:
+            # La conexión no debe compartirse con procesos creados con fork
+            connections.close_all()
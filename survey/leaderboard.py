@@ -0,0 +1,242 @@
+"""
+Módulo del leaderboard en memoria para el ranking de preguntas.
+
+Este módulo mantiene en cada proceso las preguntas mejor clasificadas en una lista
+ordenada con un índice por pk, de modo que la página principal obtiene el top N sin
+ordenar la tabla de preguntas en cada request.
+
+Clases:
+    - Leaderboard: Estructura ordenada y acotada de puntajes, con reconstrucción
+      desde la base de datos y sincronización entre procesos.
+
+Sincronización:
+    Cada actualización se publica como un evento numerado en el cache de Django
+    (`SURVEY_LEADERBOARD_CACHE`). Antes de cada lectura el proceso aplica los eventos
+    que aún no conoce, o se reconstruye si le faltan eventos. Los eventos se publican
+    después de confirmar la transacción, por lo que dos votos simultáneos pueden
+    numerarse en otro orden que el de sus escrituras: cada evento lleva además la
+    versión de la fila (`QuestionScore.version`, incrementada en la misma sentencia
+    que cambia el puntaje) y se descartan los eventos con una versión ya aplicada. Para sincronizar varios
+    workers el alias debe apuntar a un cache compartido con `add` e `incr` atómicos:
+    `quizes.cache.SQLiteCache` (workers de un mismo servidor), memcached o redis. Los
+    caches de archivo y de base de datos de Django no sirven: su `incr` lee y luego
+    escribe, y dos publicaciones simultáneas pueden recibir el mismo número y
+    pisarse. Con `LocMemCache` cada proceso se sincroniza solo consigo mismo, lo que
+    solo es válido con un único proceso (por ejemplo, con `runserver`).
+
+Cambio de día:
+    Al cambiar la fecha cada proceso se reconstruye, pero el primer request del día
+    puede llegar antes de que `rollover_rankings` quite los puntos del día anterior.
+    Por eso `rollover_rankings` publica en el cache la fecha hasta la que quitó esos
+    puntos (`publish_rollover(day)`), y un proceso que se reconstruyó antes de esa
+    publicación se vuelve a reconstruir en su siguiente lectura.
+"""
+
+import threading
+from bisect import bisect_left, insort
+
+from django.core.cache import caches
+from django.utils import timezone
+
+
+class Leaderboard:
+    """
+    Leaderboard acotado de puntajes de preguntas.
+
+    Guarda como máximo `capacity` preguntas ordenadas por `(-puntaje, pk)`, el mismo
+    orden que usa `QuestionManager.get_ranked_questions`. Las preguntas que no entran
+    en memoria quedan por debajo de una cota (`_ceiling`); si una lectura necesita
+    más preguntas de las que se pueden garantizar, la estructura se reconstruye.
+
+    Atributos:
+        - loader (callable): Función `loader(limit)` que devuelve los `limit` mejores
+          `(pk, puntaje, versión)` desde la base de datos.
+        - capacity (int): Cantidad máxima de preguntas en memoria.
+        - cache_alias (str): Alias del cache usado para sincronizar procesos.
+        - key_prefix (str): Prefijo de las claves de sincronización.
+        - event_timeout (int): Segundos que se conserva cada evento publicado.
+
+    Métodos:
+        - `top(n)`: Devuelve los n mejores pares `(pk, puntaje)`.
+        - `update(pk, score, version)`: Registra el puntaje de una pregunta en
+          O(log n), si su versión es posterior a la ya aplicada.
+        - `remove(pk)`: Elimina una pregunta del leaderboard.
+        - `rebuild()`: Reconstruye la estructura desde la base de datos.
+        - `invalidate()`: Obliga a todos los procesos a reconstruir la estructura.
+        - `publish_rollover(day)`: Registra que los puntos de los días anteriores a
+          `day` ya se quitaron del ranking guardado.
+        - `reset()`: Descarta el estado en memoria.
+    """
+
+    def __init__(
+        self,
+        loader,
+        capacity=1000,
+        cache_alias="default",
+        key_prefix="survey:leaderboard",
+        event_timeout=300,
+    ):
+        self.loader = loader
+        self.capacity = capacity
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self.event_timeout = event_timeout
+        self._lock = threading.RLock()
+        self.reset()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def reset(self):
+        # Descarta el estado; la próxima lectura reconstruye desde la base de datos
+        with self._lock:
+            self._entries = []
+            self._scores = {}
+            self._versions = {}
+            self._ceiling = None
+            self._day = None
+            self._rolled_over = False
+            self._seq = 0
+
+    def rebuild(self):
+        # Lee la secuencia antes de consultar: los eventos posteriores se vuelven a
+        # aplicar, lo que es seguro porque cada evento lleva el puntaje absoluto
+        today = timezone.localdate()
+        seq, rolled_over = self._current_state(today)
+        rows = list(self.loader(self.capacity + 1))
+
+        with self._lock:
+            self._entries = sorted(
+                (-score, pk) for pk, score, _ in rows[: self.capacity]
+            )
+            self._scores = {pk: score for pk, score, _ in rows[: self.capacity]}
+            self._versions = {pk: version for pk, _, version in rows[: self.capacity]}
+            self._ceiling = None
+            if len(rows) > self.capacity:
+                pk, score, _ = rows[self.capacity]
+                self._ceiling = (-score, pk)
+            self._day = today
+            self._rolled_over = rolled_over
+            self._seq = seq
+
+    def invalidate(self):
+        # Adelanta la secuencia más allá de lo que se puede aplicar evento a evento,
+        # de modo que cada proceso se reconstruye en su próxima lectura
+        seq_key = f"{self.key_prefix}:seq"
+        self.cache.add(seq_key, 0, timeout=None)
+        self.cache.incr(seq_key, self.capacity + 1)
+
+    def publish_rollover(self, day):
+        self.cache.set(f"{self.key_prefix}:rollover", day.isoformat(), timeout=None)
+
+    def top(self, n):
+        self._sync()
+
+        with self._lock:
+            # Si hay preguntas fuera de memoria no se puede completar el top
+            if len(self._entries) < min(n, self.capacity) and self._ceiling is not None:
+                self.rebuild()
+
+            return [(pk, -score) for score, pk in self._entries[:n]]
+
+    def update(self, pk, score, version):
+        self._publish(pk, score, version)
+
+    def remove(self, pk):
+        self._publish(pk, None, None)
+
+    def _apply(self, pk, score, version):
+        with self._lock:
+            # Un evento de una versión ya aplicada llegó tarde; una pregunta
+            # eliminada (versión None) no vuelve a entrar
+            known = self._versions.get(pk, -1)
+            if known is None or (version is not None and version <= known):
+                return
+            self._versions[pk] = version
+
+            previous = self._scores.pop(pk, None)
+            if previous is not None:
+                index = bisect_left(self._entries, (-previous, pk))
+                del self._entries[index]
+
+            if score is None:
+                return
+
+            key = (-score, pk)
+            if self._ceiling is not None and key > self._ceiling:
+                # Puede haber preguntas fuera de memoria con mejor puntaje
+                return
+
+            insort(self._entries, key)
+            self._scores[pk] = score
+
+            # Mantiene la memoria acotada descartando la peor pregunta
+            if len(self._entries) > self.capacity:
+                evicted = self._entries.pop()
+                del self._scores[evicted[1]]
+                self._ceiling = min(self._ceiling or evicted, evicted)
+
+    def _sync(self):
+        # El puntaje del día de hoy cambia al cambiar la fecha
+        if self._day != timezone.localdate():
+            self.rebuild()
+            return
+
+        seq, rolled_over = self._current_state(self._day)
+
+        # Se reconstruyó antes de que se quitaran los puntos del día anterior
+        if rolled_over and not self._rolled_over:
+            self.rebuild()
+            return
+
+        if seq == self._seq:
+            return
+
+        # Si el cache se reinició o faltan demasiados eventos, reconstruye
+        if seq < self._seq or seq - self._seq > self.capacity:
+            self.rebuild()
+            return
+
+        keys = [self._event_key(i) for i in range(self._seq + 1, seq + 1)]
+        events = self.cache.get_many(keys)
+        if len(events) != len(keys):
+            self.rebuild()
+            return
+
+        with self._lock:
+            for key in keys:
+                self._apply(*events[key])
+            self._seq = max(self._seq, seq)
+
+    def _publish(self, pk, score, version):
+        self._sync()
+
+        # El incremento atómico del cache asigna a cada evento un número único
+        seq_key = f"{self.key_prefix}:seq"
+        self.cache.add(seq_key, 0, timeout=None)
+        seq = self.cache.incr(seq_key)
+        self.cache.set(
+            self._event_key(seq), (pk, score, version), timeout=self.event_timeout
+        )
+
+        with self._lock:
+            self._apply(pk, score, version)
+            # Si no hubo eventos intermedios de otros procesos, ya está al día
+            if seq == self._seq + 1:
+                self._seq = seq
+
+    def _current_state(self, today):
+        # Número del último evento y si ya se quitaron los puntos de los días
+        # anteriores a `today`, con una única lectura del cache
+        seq_key = f"{self.key_prefix}:seq"
+        rollover_key = f"{self.key_prefix}:rollover"
+        values = self.cache.get_many([seq_key, rollover_key])
+        rollover = values.get(rollover_key)
+
+        return values.get(seq_key, 0), rollover is not None and (
+            rollover >= today.isoformat()
+        )
+
+    def _event_key(self, seq):
+        return f"{self.key_prefix}:event:{seq}"
@@ -0,0 +1,53 @@
+"""
+Comando para verificar y reparar los contadores de votos de las preguntas.
+
+Compara `answer_count`, `answer_sum`, `like_count` y `dislike_count` de
+`QuestionScore` con los votos almacenados en las tablas `Answer` y
+`QuestionFeedback`, informa las diferencias encontradas y, con la opción `--repair`,
+las corrige.
+
+Uso:
+    python manage.py check_vote_counters [--repair]
+"""
+
+from django.core.management.base import BaseCommand
+
+from survey.models import Question
+from survey.views import QuestionManager
+
+
+class Command(BaseCommand):
+    help = "Verifica que los contadores de votos coincidan con los votos almacenados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Recalcula los contadores de las preguntas con diferencias.",
+        )
+
+    def handle(self, *args, **options):
+        drift = list(QuestionManager.get_vote_counter_drift())
+
+        for question in drift:
+            self.stdout.write(
+                f"Pregunta {question.pk}: "
+                f"respuestas {question.answer_count} != {question.counted_answer_count}, "
+                f"suma {question.answer_sum} != {question.counted_answer_sum}, "
+                f"likes {question.like_count} != {question.counted_like_count}, "
+                f"dislikes {question.dislike_count} != {question.counted_dislike_count}"
+            )
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Los contadores están sincronizados."))
+            return
+
+        if options["repair"]:
+            repaired = QuestionManager.sync_vote_counters(
+                Question.objects.filter(pk__in=[question.pk for question in drift])
+            )
+            self.stdout.write(self.style.SUCCESS(f"Preguntas reparadas: {repaired}"))
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"Preguntas con diferencias: {len(drift)}")
+            )
@@ -0,0 +1,108 @@
+"""
+Comando para recalcular el ranking guardado de las preguntas.
+
+Recorre las preguntas por bloques, cuenta sus votos con consultas agregadas por
+bloque y guarda los contadores y el ranking de las filas que cambiaron en
+`QuestionScore` con `bulk_update`. Con `--workers`, los rangos de pk se reparten entre varios procesos
+y los cambios se guardan al final con un único `bulk_update`.
+
+Los votos mantienen el ranking guardado, `rollover_rankings` quita cada día los
+puntos del día anterior y `refresh_question_scores` recalcula las preguntas con
+votos nuevos, por lo que este recálculo completo solo es necesario para reparar
+diferencias (por ejemplo, con `--since` o `--ids`) o después de cambiar la
+estrategia de ranking (`SURVEY_RANKING_STRATEGY`): el ranking de cada fila se
+calcula en la base de datos con la expresión de la estrategia configurada.
+
+Uso:
+    python manage.py recompute_rankings [--since AAAA-MM-DD] [--ids 1,2,3]
+        [--chunk-size N] [--batch-size N] [--workers N] [--dry-run]
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from survey.models import Question
+from survey.views import QuestionManager
+
+
+class Command(BaseCommand):
+    help = "Recalcula el ranking guardado de las preguntas desde sus votos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Solo las preguntas creadas desde esta fecha (AAAA-MM-DD).",
+        )
+        parser.add_argument(
+            "--ids",
+            help="Solo las preguntas con estos pk, separados por comas.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Cantidad de preguntas leídas por bloque.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de filas por sentencia de bulk_update.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Cantidad de procesos que calculan los rangos de preguntas.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Informa cuántas preguntas cambiarían sin guardarlas.",
+        )
+
+    def handle(self, *args, **options):
+        questions = Question.objects.all()
+
+        if options["since"]:
+            try:
+                since = datetime.date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError(f"Fecha invalida: {options['since']}")
+            questions = questions.filter(created__gte=since)
+
+        if options["ids"]:
+            try:
+                pks = [int(pk) for pk in options["ids"].split(",") if pk.strip()]
+            except ValueError:
+                raise CommandError(f"Lista de preguntas invalida: {options['ids']}")
+            questions = questions.filter(pk__in=pks)
+
+        if options["chunk_size"] < 1 or options["batch_size"] < 1:
+            raise CommandError("El tamaño de bloque debe ser mayor que cero")
+        if options["workers"] < 1:
+            raise CommandError("La cantidad de procesos debe ser mayor que cero")
+
+        def progress(processed, total):
+            self.stdout.write(f"Preguntas procesadas: {processed}/{total}")
+
+        changed = QuestionManager.recompute_rankings(
+            questions,
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            progress=progress,
+            workers=options["workers"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"Preguntas con cambios (sin guardar): {changed}")
+            )
+            return
+
+        if changed:
+            QuestionManager.invalidate_rankings()
+
+        self.stdout.write(self.style.SUCCESS(f"Preguntas actualizadas: {changed}"))
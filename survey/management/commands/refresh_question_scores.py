@@ -0,0 +1,47 @@
+"""
+Comando para recalcular los puntajes de las preguntas con votos nuevos.
+
+Vuelve a contar desde las tablas `Answer` y `QuestionFeedback` solo las preguntas con
+votos escritos después de la ejecución anterior (el mayor `computed_at` de
+`QuestionScore`, menos `SURVEY_SCORE_REFRESH_OVERLAP` segundos), y guarda sus
+contadores y ranking en `QuestionScore`. La primera ejecución recalcula todas las
+preguntas.
+
+Los votos eliminados junto con su autor no dejan una fecha de escritura; esas
+diferencias las corrige `recompute_rankings`.
+
+Uso:
+    python manage.py refresh_question_scores [--since AAAA-MM-DDTHH:MM:SS]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from survey.views import QuestionManager
+
+
+class Command(BaseCommand):
+    help = "Recalcula el puntaje de las preguntas con votos desde la última ejecución."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Solo las preguntas con votos desde esta fecha (AAAA-MM-DDTHH:MM:SS).",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = parse_datetime(options["since"])
+            except ValueError:
+                since = None
+            if since is None:
+                raise CommandError(f"Fecha invalida: {options['since']}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        refreshed = QuestionManager.refresh_question_scores(since)
+
+        self.stdout.write(self.style.SUCCESS(f"Preguntas recalculadas: {refreshed}"))
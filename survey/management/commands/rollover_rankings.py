@@ -0,0 +1,29 @@
+"""
+Comando para quitar los puntos del día de hoy a las preguntas de días anteriores.
+
+Las preguntas reciben los puntos del día al crearse, incluidos en el ranking
+guardado en `QuestionScore`. Este comando se programa al comienzo de cada día
+(según `TIME_ZONE`) y les resta esos puntos a las preguntas creadas antes de hoy
+con una única sentencia UPDATE, de modo que el ranking guardado sigue siendo válido
+sin recalcular todas las preguntas. Volver a ejecutarlo no tiene efecto, y una
+ejecución atrasada también corrige los días anteriores.
+
+Uso:
+    python manage.py rollover_rankings
+
+    # Por ejemplo, con cron:
+    0 0 * * * python manage.py rollover_rankings
+"""
+
+from django.core.management.base import BaseCommand
+
+from survey.views import QuestionManager
+
+
+class Command(BaseCommand):
+    help = "Quita los puntos del día de hoy a las preguntas de días anteriores."
+
+    def handle(self, *args, **options):
+        rolled = QuestionManager.rollover_rankings()
+
+        self.stdout.write(self.style.SUCCESS(f"Preguntas actualizadas: {rolled}"))
@@ -0,0 +1,61 @@
+"""
+Comando para consultar los contadores del cache de páginas y del buffer de votos.
+
+Muestra los aciertos, fallos y páginas anteriores servidas por el cache de páginas
+(survey/page_cache.py) y las métricas del buffer de votos (survey/vote_buffer.py):
+votos en cola, vaciados, latencia y votos descartados. Los valores se suman entre
+todos los workers en el cache compartido. Con `--reset` los reinicia después de
+mostrarlos.
+
+Uso:
+    python manage.py survey_stats [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+
+from survey.views import page_cache, vote_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra los contadores del cache de páginas y del buffer de votos de todos "
+        "los workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reinicia los contadores después de mostrarlos.",
+        )
+
+    def handle(self, *args, **options):
+        stats = page_cache.stats()
+        total = stats["hits"] + stats["misses"] + stats["stale"]
+        ratio = stats["hits"] / total if total else 0
+
+        self.stdout.write(
+            f"Cache de páginas: {stats['hits']} aciertos, {stats['misses']} fallos, "
+            f"{stats['stale']} páginas anteriores ({ratio:.0%} de aciertos)"
+        )
+
+        metrics = vote_buffer.metrics()
+        latency = (
+            f"último {metrics['last_flush_ms']:.1f} ms, "
+            f"máximo {metrics['max_flush_ms']:.1f} ms"
+            if metrics["last_flush_ms"] is not None
+            else "sin vaciados"
+        )
+
+        self.stdout.write(
+            f"Buffer de votos: {metrics['queue_depth']} en cola, "
+            f"{metrics['flushes']} vaciados ({latency}), "
+            f"{metrics['flushed_votes']} votos guardados, "
+            f"{metrics['failures']} fallos, "
+            f"{metrics['dropped_votes']} votos descartados"
+        )
+
+        if options["reset"]:
+            page_cache.reset_stats()
+            vote_buffer.reset_metrics()
+            self.stdout.write(self.style.SUCCESS("Contadores reiniciados."))
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.5 on 2026-10-16 23:34
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_votes(model, **filters):
+    votes = (
+        model.objects.filter(question=OuterRef('pk'), **filters)
+        .order_by()
+        .values('question')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(votes, output_field=IntegerField()), 0)
+
+
+def backfill_vote_counters(apps, schema_editor):
+    Question = apps.get_model('survey', 'Question')
+    Answer = apps.get_model('survey', 'Answer')
+    QuestionFeedback = apps.get_model('survey', 'QuestionFeedback')
+
+    Question.objects.update(
+        answer_count=count_votes(Answer, value__range=(1, 5)),
+        like_count=count_votes(QuestionFeedback, value='like'),
+        dislike_count=count_votes(QuestionFeedback, value='dislike'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0003_question_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='answer_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Respuestas'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Dislikes'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Likes'),
+        ),
+        migrations.RunPython(backfill_vote_counters, migrations.RunPython.noop),
+    ]
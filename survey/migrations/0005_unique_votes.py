@@ -0,0 +1,60 @@
+# Generated by Django 3.2.5 on 2026-10-16 23:36
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_votes(model, **filters):
+    votes = (
+        model.objects.filter(question=OuterRef('pk'), **filters)
+        .order_by()
+        .values('question')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(votes, output_field=IntegerField()), 0)
+
+
+def dedupe_votes(apps, schema_editor):
+    Question = apps.get_model('survey', 'Question')
+    Answer = apps.get_model('survey', 'Answer')
+    QuestionFeedback = apps.get_model('survey', 'QuestionFeedback')
+
+    # Conserva el voto más reciente de cada (pregunta, autor)
+    for model in (Answer, QuestionFeedback):
+        duplicates = (
+            model.objects.values('question', 'author')
+            .annotate(total=Count('pk'), latest=Max('pk'))
+            .filter(total__gt=1)
+        )
+        for duplicate in duplicates:
+            model.objects.filter(
+                question=duplicate['question'], author=duplicate['author']
+            ).exclude(pk=duplicate['latest']).delete()
+
+    # Los contadores incluían los votos duplicados
+    Question.objects.update(
+        answer_count=count_votes(Answer, value__range=(1, 5)),
+        like_count=count_votes(QuestionFeedback, value='like'),
+        dislike_count=count_votes(QuestionFeedback, value='dislike'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0004_question_vote_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_votes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('question', 'author'), name='unique_answer_question_author'),
+        ),
+        migrations.AddConstraint(
+            model_name='questionfeedback',
+            constraint=models.UniqueConstraint(fields=('question', 'author'), name='unique_feedback_question_author'),
+        ),
+    ]
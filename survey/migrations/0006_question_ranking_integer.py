@@ -0,0 +1,41 @@
+# Generated by Django 3.2.5 on 2026-10-16 23:52
+
+from django.db import migrations, models
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+
+def backfill_rankings(apps, schema_editor):
+    Question = apps.get_model('survey', 'Question')
+
+    # Mismos puntos que QuestionManager: 10 por respuesta, 5 por like, -3 por
+    # dislike y 10 si la pregunta es del día de hoy
+    today = Case(
+        When(created=timezone.now().date(), then=Value(10)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Question.objects.update(
+        ranking=(
+            F('answer_count') * 10
+            + F('like_count') * 5
+            - F('dislike_count') * 3
+            + today
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0005_unique_votes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='question',
+            name='ranking',
+            field=models.IntegerField(default=0, verbose_name='Ranking'),
+        ),
+        migrations.RunPython(backfill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2.5 on 2026-10-16 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('survey', '0006_question_ranking_integer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to=settings.AUTH_USER_MODEL, verbose_name='Autor'),
+        ),
+        migrations.AlterField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='survey.question', verbose_name='Pregunta'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='questions', to=settings.AUTH_USER_MODEL, verbose_name='Pregunta'),
+        ),
+        migrations.AlterField(
+            model_name='questionfeedback',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='feedback', to=settings.AUTH_USER_MODEL, verbose_name='Autor'),
+        ),
+        migrations.AlterField(
+            model_name='questionfeedback',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='feedback', to='survey.question', verbose_name='Pregunta'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'value'], name='answer_question_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['author', 'question'], name='answer_author_question_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-ranking', 'id'], name='question_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['author', '-created'], name='question_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionfeedback',
+            index=models.Index(fields=['question', 'value'], name='feedback_question_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionfeedback',
+            index=models.Index(fields=['author', 'question'], name='feedback_author_question_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 3.2.5 on 2026-10-17 00:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0007_ranking_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionScore',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='survey.question', verbose_name='Pregunta')),
+                ('answer_count', models.PositiveIntegerField(default=0, verbose_name='Respuestas')),
+                ('like_count', models.PositiveIntegerField(default=0, verbose_name='Likes')),
+                ('dislike_count', models.PositiveIntegerField(default=0, verbose_name='Dislikes')),
+                ('base_score', models.IntegerField(default=0, verbose_name='Ranking')),
+                ('computed_at', models.DateTimeField(blank=True, null=True, verbose_name='Calculado')),
+            ],
+        ),
+        # Copia los contadores y el ranking de cada pregunta; computed_at queda en
+        # NULL para que el primer recálculo incremental las vuelva a contar
+        migrations.RunSQL(
+            '''
+            INSERT INTO survey_questionscore
+                (question_id, answer_count, like_count, dislike_count, base_score)
+            SELECT id, answer_count, like_count, dislike_count, ranking
+            FROM survey_question
+            ''',
+            '''
+            UPDATE survey_question SET
+                answer_count = s.answer_count,
+                like_count = s.like_count,
+                dislike_count = s.dislike_count,
+                ranking = s.base_score
+            FROM survey_questionscore AS s
+            WHERE s.question_id = survey_question.id
+            ''',
+        ),
+        migrations.RemoveIndex(
+            model_name='question',
+            name='question_ranking_idx',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='answer_count',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='dislike_count',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='like_count',
+        ),
+        migrations.RemoveField(
+            model_name='question',
+            name='ranking',
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Actualizada'),
+        ),
+        migrations.AddField(
+            model_name='questionfeedback',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Actualizado'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['updated', 'question'], name='answer_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionfeedback',
+            index=models.Index(fields=['updated', 'question'], name='feedback_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionscore',
+            index=models.Index(fields=['-base_score', 'question'], name='question_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionscore',
+            index=models.Index(fields=['computed_at'], name='question_score_computed_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2.5 on 2026-10-17 00:35
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Value, When
+from django.utils import timezone
+
+
+def backfill_today_points(apps, schema_editor):
+    Question = apps.get_model('survey', 'Question')
+    QuestionScore = apps.get_model('survey', 'QuestionScore')
+
+    # Solo las preguntas de hoy conservan sus 10 puntos; el ranking se vuelve a
+    # calcular para quitar los puntos que quedaron de días anteriores
+    created_today = Question.objects.filter(
+        pk=OuterRef('question'), created=timezone.now().date()
+    )
+    QuestionScore.objects.update(
+        today_points=Case(
+            When(Exists(created_today), then=Value(10)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    QuestionScore.objects.update(
+        base_score=(
+            F('answer_count') * 10
+            + F('like_count') * 5
+            - F('dislike_count') * 3
+            + F('today_points')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0008_question_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionscore',
+            name='today_points',
+            field=models.IntegerField(default=0, verbose_name='Puntos del día'),
+        ),
+        migrations.RunPython(backfill_today_points, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='questionscore',
+            index=models.Index(condition=models.Q(('today_points__gt', 0)), fields=['question'], name='question_score_today_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.5 on 2026-10-17 02:10
+
+from django.db import migrations, models
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_answer_sum(apps, schema_editor):
+    Answer = apps.get_model('survey', 'Answer')
+    QuestionScore = apps.get_model('survey', 'QuestionScore')
+
+    # Suma de las respuestas entre 1 y 5 de cada pregunta
+    answers = (
+        Answer.objects.filter(question=OuterRef('question'), value__range=(1, 5))
+        .order_by()
+        .values('question')
+        .annotate(total=Sum('value'))
+        .values('total')
+    )
+    QuestionScore.objects.update(
+        answer_sum=Coalesce(Subquery(answers, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0009_question_score_today_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionscore',
+            name='answer_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Suma de respuestas'),
+        ),
+        migrations.RunPython(backfill_answer_sum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0010_question_score_answer_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionscore',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Versión'),
+        ),
+    ]
@@ -4,32 +4,108 @@ Módulo de modelos para la aplicación.
 Este módulo define las clases de modelos necesarias para gestionar preguntas,
 respuestas y retroalimentación de usuarios.
 
+Managers:
+    - VoteManager: Manager de los votos con escritura atómica (upsert) por
+      pregunta y autor.
+
 Clases de Modelos:
     - Question: Modelo que representa una preguntaa.
     - Answer: Modelo que representa una respuesta a una pregunta.
     - QuestionFeedback: Modelo que representa la retroalimentación de un 
       usuario a una pregunta.
+    - QuestionScore: Modelo con los contadores de votos y el puntaje de cada
+      pregunta.
 
 Atributos Comunes:
     - created (DateField): Fecha de creación de la pregunta.
     - author (ForeignKey): Relación con el modelo de usuario que crea la pregunta.
     - title (CharField): Título de la pregunta.
     - description (TextField): Descripción detallada de la pregunta.
-    - ranking (PositiveIntegerField): Puntuación de la pregunta basada en 
-      respuestas y retroalimentación.
+    - updated (DateTimeField): Fecha de la última escritura de un voto, usada por
+      el recálculo incremental de los puntajes.
 
 """
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, router
+from django.db.models import Q
 from django.urls import reverse
 
 
+class VoteManager(models.Manager):
+    """
+    Manager para los votos de un usuario a una pregunta (`Answer` y `QuestionFeedback`).
+
+    Métodos:
+        - upsert(question_id, author_id, value): Inserta el voto o actualiza su valor
+          con una única sentencia `INSERT ... ON CONFLICT`, apoyada en la restricción
+          única (question, author) del modelo.
+        - bulk_upsert(votes): Igual que `upsert` para una lista de tuplas
+          `(question_id, author_id, value)`, en una única sentencia. Cada par
+          (pregunta, autor) debe aparecer una sola vez.
+    """
+
+    def upsert(self, question_id, author_id, value):
+        self.bulk_upsert([(question_id, author_id, value)])
+
+    def bulk_upsert(self, votes):
+        if not votes:
+            return
+
+        connection = connections[router.db_for_write(self.model)]
+        quote_name = connection.ops.quote_name
+
+        # Valores de todas las columnas, incluyendo los defaults de Python
+        fields = [
+            field
+            for field in self.model._meta.local_concrete_fields
+            if not field.primary_key
+        ]
+        params = []
+        for question_id, author_id, value in votes:
+            vote = self.model(question_id=question_id, author_id=author_id, value=value)
+            params.extend(
+                field.get_db_prep_save(field.pre_save(vote, add=True), connection)
+                for field in fields
+            )
+
+        # Ante un conflicto solo se actualizan el valor y los campos auto_now
+        updated = [
+            field
+            for field in fields
+            if field.name == "value" or getattr(field, "auto_now", False)
+        ]
+
+        row = "({})".format(", ".join(["%s"] * len(fields)))
+        sql = (
+            "INSERT INTO {table} ({columns}) VALUES {values} "
+            "ON CONFLICT ({keys}) DO UPDATE SET {updates}"
+        ).format(
+            table=quote_name(self.model._meta.db_table),
+            columns=", ".join(quote_name(field.column) for field in fields),
+            values=", ".join([row] * len(votes)),
+            keys=", ".join(
+                quote_name(column) for column in ("question_id", "author_id")
+            ),
+            updates=", ".join(
+                f"{quote_name(field.column)} = excluded.{quote_name(field.column)}"
+                for field in updated
+            ),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
 class Question(models.Model):
     """
     Modelo que representa una pregunta en la encuesta.
 
+    Los contadores de votos y el ranking se guardan aparte, en `QuestionScore`, para
+    que los votos no reescriban la fila de la pregunta.
+
     Métodos:
+        - save(): Guarda la pregunta y, si es nueva, crea su fila de `QuestionScore`.
         - get_absolute_url(): Devuelve la URL absoluta para ver y editar la pregunta.
     """
 
@@ -39,23 +115,123 @@ class Question(models.Model):
         related_name="questions",
         verbose_name="Pregunta",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     title = models.CharField("Título", max_length=200)
     description = models.TextField("Descripción")
-    ranking = models.PositiveIntegerField("Ranking", default=0)
 
     objects = models.Manager()
 
+    class Meta:
+        indexes = [
+            # Preguntas de un usuario, de la más reciente a la más antigua. Empieza
+            # por `author`, por lo que reemplaza al índice de la clave foránea
+            models.Index(
+                fields=["author", "-created"], name="question_author_created_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        # Los listados se recorren desde QuestionScore, por lo que toda pregunta
+        # necesita su fila, aunque no se cree desde las vistas. Una pregunta nueva
+        # no tiene votos y recibe los puntos del día de creación, con el puntaje
+        # calculado en el INSERT por la estrategia configurada
+        if adding:
+            # survey.ranking importa este módulo
+            from survey.ranking import SCORE_FIELDS, PointsRanking, get_strategy
+
+            today_points = PointsRanking.TODAY_POINTS
+            fields = {name: models.Value(0) for name in SCORE_FIELDS}
+            fields.update(
+                today_points=models.Value(today_points),
+                created=models.Value(self.created),
+            )
+            score = QuestionScore.objects.create(
+                question=self,
+                today_points=today_points,
+                base_score=get_strategy().expression(fields),
+            )
+            score.refresh_from_db(fields=["base_score"])
+
     def get_absolute_url(self):
         return reverse("survey:question-edit", args=[self.pk])
 
 
+class QuestionScore(models.Model):
+    """
+    Modelo con los contadores de votos y el puntaje guardado de una pregunta.
+
+    Es una tabla angosta, separada de `Question`: los votos actualizan solo esta fila,
+    y el listado y el leaderboard se ordenan recorriendo el índice
+    `question_score_idx` sin leer las filas anchas de las preguntas, con su título y
+    descripción.
+
+    Los votos aplican variaciones a los contadores y al puntaje. Los puntos del día
+    de creación se suman al crear la pregunta y se quitan con `rollover_rankings` al
+    cambiar el día, de modo que el puntaje guardado sigue siendo válido entre votos.
+    El recálculo incremental (`refresh_question_scores`) vuelve a contar desde las
+    tablas de votos solo las preguntas con votos posteriores a su última ejecución.
+
+    Atributos:
+        - question (OneToOneField): Pregunta, que es también la clave primaria.
+        - answer_count, like_count, dislike_count (PositiveIntegerField): Cantidad de
+          respuestas entre 1 y 5, likes y dislikes de la pregunta.
+        - answer_sum (PositiveIntegerField): Suma de los valores de las respuestas
+          entre 1 y 5, usada por el ranking de Wilson (survey/ranking.py).
+        - today_points (IntegerField): Puntos del día de creación incluidos en
+          `base_score`, o 0 desde el primer cambio de día.
+        - base_score (IntegerField): Ranking de la pregunta según la estrategia de
+          `SURVEY_RANKING_STRATEGY`; con la estrategia por defecto, sus contadores
+          más `today_points`. Puede ser negativo.
+        - computed_at (DateTimeField): Fecha del último recálculo desde las tablas de
+          votos, o None si los contadores solo se mantuvieron con variaciones.
+        - version (PositiveBigIntegerField): Se incrementa en cada sentencia que
+          cambia `base_score`; ordena los eventos del leaderboard
+          (survey/leaderboard.py) según el orden de las escrituras.
+    """
+
+    question = models.OneToOneField(
+        Question,
+        related_name="score",
+        verbose_name="Pregunta",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    answer_count = models.PositiveIntegerField("Respuestas", default=0)
+    answer_sum = models.PositiveIntegerField("Suma de respuestas", default=0)
+    like_count = models.PositiveIntegerField("Likes", default=0)
+    dislike_count = models.PositiveIntegerField("Dislikes", default=0)
+    today_points = models.IntegerField("Puntos del día", default=0)
+    base_score = models.IntegerField("Ranking", default=0)
+    computed_at = models.DateTimeField("Calculado", null=True, blank=True)
+    version = models.PositiveBigIntegerField("Versión", default=0)
+
+    class Meta:
+        indexes = [
+            # Listado principal y leaderboard: ORDER BY base_score DESC, question_id
+            models.Index(fields=["-base_score", "question"], name="question_score_idx"),
+            # Última ejecución del recálculo incremental: MAX(computed_at)
+            models.Index(fields=["computed_at"], name="question_score_computed_idx"),
+            # Preguntas con puntos del día que el cambio de día debe quitar
+            models.Index(
+                fields=["question"],
+                condition=Q(today_points__gt=0),
+                name="question_score_today_idx",
+            ),
+        ]
+
+
 class Answer(models.Model):
     """
     Modelo que representa una respuesta a una pregunta en la encuesta.
 
     Atributos Adicionales:
         - ANSWERS_VALUES (tuple): Elecciones posibles para el campo 'value'.
+
+    Cada usuario tiene como máximo una respuesta por pregunta.
     """
 
     ANSWERS_VALUES = (
@@ -72,17 +248,40 @@ class Answer(models.Model):
         related_name="answers",
         verbose_name="Pregunta",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     author = models.ForeignKey(
         get_user_model(),
         related_name="answers",
         verbose_name="Autor",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     value = models.PositiveIntegerField("Respuesta", default=0)
     comment = models.TextField("Comentario", default="", blank=True)
+    updated = models.DateTimeField("Actualizada", auto_now=True)
 
-    objects = models.Manager()
+    objects = VoteManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["question", "author"], name="unique_answer_question_author"
+            ),
+        ]
+        indexes = [
+            # Conteo de respuestas por pregunta y valor. Este índice y el de
+            # `author` reemplazan a los índices simples de las claves foráneas
+            models.Index(
+                fields=["question", "value"], name="answer_question_value_idx"
+            ),
+            # Respuestas de un usuario para las preguntas del listado
+            models.Index(
+                fields=["author", "question"], name="answer_author_question_idx"
+            ),
+            # Preguntas con respuestas nuevas para el recálculo incremental
+            models.Index(fields=["updated", "question"], name="answer_updated_idx"),
+        ]
 
 
 class QuestionFeedback(models.Model):
@@ -91,6 +290,8 @@ class QuestionFeedback(models.Model):
 
     Atributos Adicionales:
         - value (TextField): Campo para almacenar la retroalimentación del usuario.
+
+    Cada usuario tiene como máximo un feedback por pregunta.
     """
 
     question = models.ForeignKey(
@@ -98,13 +299,36 @@ class QuestionFeedback(models.Model):
         related_name="feedback",
         verbose_name="Pregunta",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     author = models.ForeignKey(
         get_user_model(),
         related_name="feedback",
         verbose_name="Autor",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     value = models.TextField("Feedback", default="", blank=True)
+    updated = models.DateTimeField("Actualizado", auto_now=True)
 
-    objects = models.Manager()
+    objects = VoteManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["question", "author"], name="unique_feedback_question_author"
+            ),
+        ]
+        indexes = [
+            # Conteo de likes y dislikes por pregunta; junto con el siguiente
+            # cubre las claves foráneas, que no tienen índice propio
+            models.Index(
+                fields=["question", "value"], name="feedback_question_value_idx"
+            ),
+            # Feedback de un usuario para las preguntas del listado
+            models.Index(
+                fields=["author", "question"], name="feedback_author_question_idx"
+            ),
+            # Preguntas con feedback nuevo para el recálculo incremental
+            models.Index(fields=["updated", "question"], name="feedback_updated_idx"),
+        ]
@@ -0,0 +1,201 @@
+"""
+Módulo del cache de páginas renderizadas de la aplicación.
+
+Este módulo guarda el HTML de páginas que son iguales para todos los visitantes
+(por ejemplo, la página principal para usuarios anónimos) bajo una clave versionada
+por una "generación". Las vistas que modifican preguntas o votos incrementan la
+generación, de modo que las entradas anteriores dejan de usarse sin tener que
+borrarlas.
+
+Clases:
+    - PageCache: Cache versionado con protección ante reconstrucciones simultáneas
+      y contadores de aciertos y fallos.
+
+Contadores:
+    Los aciertos y fallos se acumulan en memoria y cada proceso los suma con `incr`
+    al mismo cache de las páginas, a lo sumo una vez cada `stats_interval`
+    segundos, de modo que `stats()` (y el comando `survey_stats`) muestra el total
+    de todos los workers sin escribir en el cache en cada request.
+"""
+
+import threading
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+class PageCache:
+    """
+    Cache de páginas renderizadas versionado por generación.
+
+    Cuando una entrada no existe, solo el proceso que obtiene el lock la renderiza;
+    el resto sirve la última versión disponible (aunque sea de una generación
+    anterior) o espera brevemente a que la nueva esté lista.
+
+    Atributos:
+        - cache_alias (str): Alias del cache de Django donde se guardan las páginas.
+          El tamaño y la política de descarte se configuran en `CACHES`.
+        - timeout (int): Segundos de vida de cada página.
+        - stale_timeout (int): Segundos que se conserva la última página renderizada
+          para servirla mientras se reconstruye la nueva.
+        - lock_timeout (int): Segundos máximos que dura el lock de reconstrucción.
+        - wait_attempts (int): Cantidad de esperas si no hay una página anterior.
+        - wait_interval (float): Segundos de cada espera.
+        - key_prefix (str): Prefijo de las claves.
+        - stats_interval (float): Segundos máximos que un proceso acumula sus
+          contadores antes de sumarlos al cache.
+
+    Métodos:
+        - `get_or_render(name, render)`: Devuelve la página cacheada o la renderiza.
+        - `get_or_render_fragment(name, render)`: Igual que `get_or_render`, para
+          fragmentos HTML que se insertan en otras páginas.
+        - `generation()`: Devuelve la generación actual, que también identifica la
+          versión del leaderboard (por ejemplo, para ETags).
+        - `bump()`: Incrementa la generación e invalida las páginas cacheadas.
+        - `stats()`: Devuelve los contadores de aciertos, fallos y páginas anteriores
+          de todos los procesos.
+        - `reset_stats()`: Reinicia los contadores.
+    """
+
+    # Contadores de `stats()`
+    COUNTERS = ("hits", "misses", "stale")
+
+    def __init__(
+        self,
+        cache_alias="default",
+        timeout=60,
+        stale_timeout=3600,
+        lock_timeout=10,
+        wait_attempts=20,
+        wait_interval=0.05,
+        key_prefix="survey:page",
+        stats_interval=1.0,
+    ):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.wait_attempts = wait_attempts
+        self.wait_interval = wait_interval
+        self.key_prefix = key_prefix
+        self.stats_interval = stats_interval
+        self._lock = threading.Lock()
+        # Los contadores compartidos no se reinician al crear la instancia: cada
+        # worker que arranca los seguiría borrando
+        self._pending = dict.fromkeys(self.COUNTERS, 0)
+        self._published = time.monotonic()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def generation(self):
+        key = f"{self.key_prefix}:generation"
+        generation = self.cache.get(key)
+        if generation is None:
+            self._init_generation(key)
+            generation = self.cache.get(key)
+
+        return generation
+
+    def bump(self):
+        key = f"{self.key_prefix}:generation"
+        self._init_generation(key)
+
+        return self.cache.incr(key)
+
+    def _init_generation(self, key):
+        # Parte de un valor basado en la hora para no repetir generaciones (y ETags)
+        # si el cache se reinicia
+        self.cache.add(key, int(time.time() * 1000), timeout=None)
+
+    def stats(self):
+        self._publish_stats()
+        keys = {counter: self._stats_key(counter) for counter in self.COUNTERS}
+        values = self.cache.get_many(keys.values())
+
+        return {counter: values.get(key, 0) for counter, key in keys.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._pending = dict.fromkeys(self.COUNTERS, 0)
+            self._published = time.monotonic()
+        self.cache.delete_many([self._stats_key(counter) for counter in self.COUNTERS])
+
+    def get_or_render(self, name, render):
+        # `render` devuelve la respuesta renderizada; en un fallo se devuelve tal cual
+        status, result = self._fetch(name, render, lambda response: response.content)
+
+        if status == "misses":
+            result["X-Page-Cache"] = "miss"
+            return result
+
+        response = HttpResponse(result)
+        response["X-Page-Cache"] = "hit" if status == "hits" else status
+
+        return response
+
+    def get_or_render_fragment(self, name, render):
+        # `render` devuelve el HTML del fragmento como texto
+        return self._fetch(name, render, lambda content: content)[1]
+
+    def _fetch(self, name, render, to_content):
+        key = f"{self.key_prefix}:{name}:{self.generation()}"
+        stale_key = f"{self.key_prefix}:{name}:latest"
+
+        content = self.cache.get(key)
+        if content is not None:
+            return self._count("hits"), content
+
+        # Solo un proceso reconstruye la página
+        lock_key = f"{key}:lock"
+        if self.cache.add(lock_key, 1, timeout=self.lock_timeout):
+            try:
+                result = render()
+                content = to_content(result)
+                self.cache.set(key, content, timeout=self.timeout)
+                self.cache.set(stale_key, content, timeout=self.stale_timeout)
+            finally:
+                self.cache.delete(lock_key)
+
+            return self._count("misses"), result
+
+        # Mientras tanto se sirve la última versión renderizada
+        content = self.cache.get(stale_key)
+        if content is not None:
+            return self._count("stale"), content
+
+        for _ in range(self.wait_attempts):
+            time.sleep(self.wait_interval)
+            content = self.cache.get(key)
+            if content is not None:
+                return self._count("hits"), content
+
+        return self._count("misses"), render()
+
+    def _count(self, counter):
+        with self._lock:
+            self._pending[counter] += 1
+            due = time.monotonic() - self._published >= self.stats_interval
+
+        if due:
+            self._publish_stats()
+
+        return counter
+
+    def _publish_stats(self):
+        # Suma al cache los contadores acumulados por este proceso
+        with self._lock:
+            pending = self._pending
+            self._pending = dict.fromkeys(self.COUNTERS, 0)
+            self._published = time.monotonic()
+
+        for counter, delta in pending.items():
+            if delta:
+                key = self._stats_key(counter)
+                self.cache.add(key, 0, timeout=None)
+                self.cache.incr(key, delta)
+
+    def _stats_key(self, counter):
+        return f"{self.key_prefix}:stats:{counter}"
@@ -0,0 +1,176 @@
+"""
+Módulo de paginación por cursor (keyset) de la aplicación.
+
+A diferencia de la paginación por número de página, que descarta las filas
+anteriores con OFFSET, cada página se obtiene filtrando a partir de los valores de
+ordenamiento de la última fila mostrada. Con un índice sobre esas columnas, cada
+página cuesta una única búsqueda por rango, sin importar qué tan lejos esté.
+
+Clases:
+    - InvalidCursor: Error de un cursor alterado o que no corresponde al listado.
+    - KeysetPage: Página de resultados con los cursores de la página siguiente y
+      anterior.
+    - KeysetPaginator: Paginador de un QuerySet por un ordenamiento estable.
+"""
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    Página de resultados de `KeysetPaginator`.
+
+    Atributos:
+        - object_list (list): Filas de la página.
+        - has_next (bool), has_previous (bool): Indican si hay páginas siguientes o
+          anteriores.
+        - next_cursor (str), previous_cursor (str): Cursores opacos de la página
+          siguiente y anterior, o None.
+    """
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.has_next = has_next and bool(object_list)
+        self.has_previous = has_previous and bool(object_list)
+        self.next_cursor = (
+            paginator.cursor(object_list[-1], "next") if self.has_next else None
+        )
+        self.previous_cursor = (
+            paginator.cursor(object_list[0], "previous") if self.has_previous else None
+        )
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Paginador por cursor de un QuerySet.
+
+    El ordenamiento debe ser total (terminar en un campo único, como "pk") y
+    coincidir con un índice para que cada página sea una búsqueda por rango. Los
+    cursores se firman con `django.core.signing`, de modo que son opacos para el
+    cliente y no se pueden alterar.
+
+    Atributos:
+        - queryset (QuerySet): Filas a paginar.
+        - ordering (tuple): Campos de ordenamiento, con "-" para orden descendente
+          (por ejemplo `("-ranking", "pk")`).
+        - per_page (int): Cantidad de filas por página.
+        - salt (str): Sal de la firma de los cursores, distinta para cada listado.
+        - transform (callable): Función opcional que convierte la lista de filas
+          leídas (por ejemplo, filas de `values_list` en registros).
+
+    Métodos:
+        - `page(cursor, rows)`: Devuelve la página que indica el cursor, o la primera.
+        - `cursor(item, direction)`: Devuelve el cursor de las filas siguientes
+          ("next") o anteriores ("previous") a una fila.
+        - `get_field(name)`: Devuelve el campo de ordenamiento, del modelo o de una
+          anotación, con el que se convierten los valores del cursor.
+    """
+
+    def __init__(
+        self, queryset, ordering, per_page, salt="survey.pagination", transform=list
+    ):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.salt = salt
+        self.transform = transform
+        self.fields = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.ordering
+        ]
+
+    def page(self, cursor=None, rows=None):
+        # `rows` permite dar las primeras per_page + 1 filas ya obtenidas en este
+        # mismo orden (por ejemplo, desde el leaderboard), sin consultar la base
+        if not cursor:
+            if rows is None:
+                rows = self.transform(
+                    self.queryset.order_by(*self.ordering)[: self.per_page + 1]
+                )
+            rows = list(rows)
+            return KeysetPage(
+                self, rows[: self.per_page], len(rows) > self.per_page, False
+            )
+
+        direction, values = self.decode(cursor)
+        forward = direction == "next"
+        ordering = self.ordering if forward else self.reverse_ordering()
+
+        rows = self.transform(
+            self.queryset.filter(self.seek(values, forward)).order_by(*ordering)[
+                : self.per_page + 1
+            ]
+        )
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if forward:
+            return KeysetPage(self, rows, more, True)
+        return KeysetPage(self, rows[::-1], True, more)
+
+    def cursor(self, item, direction):
+        values = []
+        for name, _ in self.fields:
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+
+        return signing.dumps([direction, values], salt=self.salt)
+
+    def decode(self, cursor):
+        try:
+            direction, values = signing.loads(cursor, salt=self.salt)
+            if direction not in ("next", "previous") or len(values) != len(self.fields):
+                raise ValueError(direction)
+            values = [
+                self.get_field(name).to_python(value)
+                for (name, _), value in zip(self.fields, values)
+            ]
+        except (signing.BadSignature, ValidationError, TypeError, ValueError):
+            raise InvalidCursor(cursor)
+
+        return direction, values
+
+    def get_field(self, name):
+        # Campo del modelo, o de la anotación del QuerySet, con ese nombre
+        annotations = self.queryset.query.annotations
+        if name in annotations:
+            return annotations[name].output_field
+
+        model = self.queryset.model
+        return model._meta.get_field(name if name != "pk" else model._meta.pk.name)
+
+    def reverse_ordering(self):
+        return tuple(
+            name if descending else f"-{name}" for name, descending in self.fields
+        )
+
+    def seek(self, values, forward):
+        # Filas estrictamente posteriores (o anteriores) a la fila del cursor:
+        # (a > x) OR (a = x AND b > y) OR ..., según el sentido de cada campo.
+        # La cota sobre el primer campo permite a la base empezar la búsqueda por
+        # rango en el índice en lugar de recorrerlo desde el principio
+        condition = Q()
+        for i, ((name, descending), value) in enumerate(zip(self.fields, values)):
+            lookup = "lt" if descending == forward else "gt"
+            equal = {self.fields[j][0]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+
+        name, descending = self.fields[0]
+        bound = "lte" if descending == forward else "gte"
+
+        return Q(**{f"{name}__{bound}": values[0]}) & condition
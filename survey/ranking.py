@@ -0,0 +1,250 @@
+"""
+Módulo de estrategias de ranking de las preguntas.
+
+Cada estrategia compila su fórmula a una expresión del ORM sobre las columnas de
+`QuestionScore`, de modo que el puntaje se calcula en la base de datos: los
+recálculos lo guardan en `base_score` con una sentencia UPDATE, y el listado y el
+leaderboard lo ordenan recorriendo el índice `question_score_idx`, sin cargar las
+filas en Python.
+
+Clases:
+    - RankingStrategy: Interfaz de las estrategias.
+    - PointsRanking: Ranking por puntos del enunciado (10 por respuesta, 5 por like,
+      -3 por dislike y 10 el día de creación). Es la estrategia por defecto.
+    - HotRanking: Ranking "hot" con decaimiento en el tiempo.
+    - WilsonRanking: Cota inferior del intervalo de Wilson sobre los valores de 1 a 5
+      de las respuestas.
+    - JulianDay: Función SQL con el día juliano de una fecha.
+
+Funciones:
+    - score_fields(prefix, **overrides): Expresiones de las columnas que usan las
+      estrategias.
+    - get_strategy(name): Devuelve la estrategia indicada o la de
+      `SURVEY_RANKING_STRATEGY`.
+
+Cambio de estrategia:
+    El puntaje guardado corresponde a la estrategia configurada. Después de cambiar
+    `SURVEY_RANKING_STRATEGY` se debe ejecutar `python manage.py recompute_rankings`,
+    que vuelve a guardar el puntaje de las filas que no coinciden con la nueva
+    fórmula. `QuestionManager.get_ranked_questions(n, strategy)` permite comparar
+    otra estrategia sin cambiar la configuración, ordenando por su expresión.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db.models import (
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import (
+    Abs,
+    Cast,
+    Coalesce,
+    Greatest,
+    Log,
+    NullIf,
+    Round,
+    Sign,
+    Sqrt,
+)
+from django.utils.module_loading import import_string
+
+from survey.models import Question
+
+# Columnas de QuestionScore que pueden usar las estrategias
+SCORE_FIELDS = (
+    "answer_count",
+    "answer_sum",
+    "like_count",
+    "dislike_count",
+    "today_points",
+)
+
+
+class JulianDay(Func):
+    """
+    Día juliano de una fecha, como número real (`julianday` de SQLite).
+    """
+
+    function = "julianday"
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="EXTRACT(JULIAN FROM %(expressions)s)",
+            **extra_context,
+        )
+
+
+def score_fields(prefix="", **overrides):
+    # Expresiones de las columnas de QuestionScore, con `prefix` para usarlas desde
+    # otro modelo (por ejemplo, "score__" desde Question), y de la fecha de creación
+    # de la pregunta, leída con una subconsulta ya que update() no admite joins
+    fields = {name: F(f"{prefix}{name}") for name in SCORE_FIELDS}
+    fields["created"] = Subquery(
+        Question.objects.filter(pk=OuterRef(f"{prefix}question")).values("created")[:1]
+    )
+    fields.update(overrides)
+
+    return fields
+
+
+def as_integer(expression, scale):
+    # Los puntajes se guardan como enteros: se escala y redondea la expresión real
+    return Cast(
+        Round(ExpressionWrapper(expression * scale, output_field=FloatField())),
+        IntegerField(),
+    )
+
+
+class RankingStrategy:
+    """
+    Interfaz de las estrategias de ranking.
+
+    Atributos:
+        - name (str): Nombre de la estrategia en `SURVEY_RANKING_STRATEGY`.
+
+    Métodos:
+        - `expression(fields)`: Devuelve la expresión entera del puntaje a partir de
+          las expresiones de columnas de `score_fields()`.
+        - `vote_points(answers, answer_sum, likes, dislikes)`: Devuelve la variación
+          del puntaje por una variación de los contadores, o None si el puntaje no es
+          lineal en los contadores y se debe volver a calcular con `expression`.
+    """
+
+    name = None
+
+    def expression(self, fields):
+        raise NotImplementedError
+
+    def vote_points(self, answers, answer_sum, likes, dislikes):
+        return None
+
+
+class PointsRanking(RankingStrategy):
+    """
+    Ranking por puntos, con la fórmula del enunciado.
+
+    Es lineal en los contadores, por lo que cada voto suma su variación al puntaje
+    guardado sin volver a calcularlo.
+    """
+
+    name = "default"
+
+    # Puntos que aporta cada elemento al ranking
+    ANSWER_POINTS = 10
+    LIKE_POINTS = 5
+    DISLIKE_POINTS = -3
+    TODAY_POINTS = 10
+
+    def expression(self, fields):
+        return (
+            fields["answer_count"] * self.ANSWER_POINTS
+            + fields["like_count"] * self.LIKE_POINTS
+            + fields["dislike_count"] * self.DISLIKE_POINTS
+            + fields["today_points"]
+        )
+
+    def vote_points(self, answers, answer_sum, likes, dislikes):
+        return (
+            answers * self.ANSWER_POINTS
+            + likes * self.LIKE_POINTS
+            + dislikes * self.DISLIKE_POINTS
+        )
+
+
+class HotRanking(RankingStrategy):
+    """
+    Ranking "hot" con decaimiento en el tiempo.
+
+    El puntaje es `signo(p) * log10(max(|p|, 1)) + días / period`, donde `p` son los
+    puntos de votos de `PointsRanking` (sin los puntos del día) y `días` la
+    antigüedad de la fecha de creación respecto de `epoch`. Una pregunta creada
+    `period` días después necesita diez veces menos puntos para quedar igual, lo que
+    equivale a un decaimiento exponencial de las preguntas más viejas. Como el
+    puntaje no depende de la fecha actual, se puede guardar y ordenar por índice.
+
+    Atributos:
+        - period (float): Días en que el decaimiento equivale a un factor 10.
+        - epoch (date): Fecha de referencia de la antigüedad.
+        - scale (int): Factor por el que se multiplica el puntaje antes de
+          redondearlo a entero.
+    """
+
+    name = "hot"
+
+    def __init__(self, period=1.0, epoch=datetime.date(2020, 1, 1), scale=1000):
+        self.period = period
+        self.epoch = epoch
+        self.scale = scale
+
+    def expression(self, fields):
+        points = PointsRanking().expression(dict(fields, today_points=Value(0)))
+        order = Log(10, Greatest(Abs(points), 1))
+        age = JulianDay(fields["created"]) - JulianDay(Value(self.epoch.isoformat()))
+
+        return as_integer(Sign(points) * order + age / self.period, self.scale)
+
+
+class WilsonRanking(RankingStrategy):
+    """
+    Ranking por la cota inferior del intervalo de confianza de Wilson.
+
+    Cada respuesta de 1 a 5 se toma como una fracción positiva `(valor - 1) / 4`, de
+    modo que la proporción observada es `(suma - n) / (4 * n)` con `n` respuestas. La
+    cota inferior castiga a las preguntas con pocas respuestas: una pregunta con
+    muchas respuestas altas supera a otra con una sola respuesta de 5. Las preguntas
+    sin respuestas tienen puntaje 0.
+
+    Atributos:
+        - z (float): Cuantil de la normal del nivel de confianza (1.96 para 95%).
+        - scale (int): Factor por el que se multiplica la cota antes de redondearla a
+          entero.
+    """
+
+    name = "wilson"
+
+    def __init__(self, z=1.96, scale=1000):
+        self.z = z
+        self.scale = scale
+
+    def expression(self, fields):
+        # Sin respuestas, n es NULL y la cota también; se reemplaza por 0
+        n = Cast(NullIf(fields["answer_count"], 0), FloatField())
+        p = (Cast(fields["answer_sum"], FloatField()) - n) / (n * 4.0)
+        z2 = self.z * self.z
+
+        center = p + z2 / (n * 2.0)
+        margin = Sqrt(p * (1.0 - p) / n + z2 / (n * n * 4.0)) * self.z
+        bound = (center - margin) / (z2 / n + 1.0)
+
+        return Coalesce(as_integer(bound, self.scale), 0)
+
+
+# Estrategias disponibles por nombre
+STRATEGIES = {
+    strategy.name: strategy for strategy in (PointsRanking, HotRanking, WilsonRanking)
+}
+
+
+def get_strategy(name=None):
+    # Estrategia por nombre, o por la ruta de su clase (por ejemplo,
+    # "myapp.ranking.CustomRanking"); por defecto, la de SURVEY_RANKING_STRATEGY
+    if name is None:
+        name = getattr(settings, "SURVEY_RANKING_STRATEGY", PointsRanking.name)
+
+    if name in STRATEGIES:
+        return STRATEGIES[name]()
+    if "." in name:
+        return import_string(name)()
+
+    raise ValueError(f"Estrategia de ranking desconocida: {name}")
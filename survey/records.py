@@ -0,0 +1,88 @@
+"""
+Módulo de registros livianos de preguntas para los listados.
+
+Los listados solo muestran unas pocas columnas de cada pregunta. En lugar de crear
+instancias completas del modelo `Question` (con su descripción y el estado interno
+del ORM) y copiarlas a diccionarios, las filas se leen con `values_list` y se
+guardan en registros con `__slots__`, que ocupan menos memoria y se crean más
+rápido.
+
+Clases:
+    - QuestionRecord: Pregunta de un listado, con el estado del voto del usuario.
+"""
+
+
+class QuestionRecord:
+    """
+    Registro de una pregunta tal como se muestra en un listado.
+
+    Atributos:
+        - pk (int), title (str), ranking (int): Datos de la pregunta.
+        - author_id (int), author (str): Pk y nombre de usuario del autor.
+        - answer (int), like (bool), dislike (bool): Voto del usuario actual, o None
+          si el listado no tiene estado del usuario.
+
+    Métodos:
+        - `from_rows(rows)`: Crea registros desde filas de `values_list(*FIELDS)`.
+        - `from_question(question)`: Crea un registro desde una instancia de
+          `Question` con su autor y su puntaje cargados.
+        - `set_votes(answer, like, dislike)`: Agrega el voto del usuario actual.
+    """
+
+    # Columnas de values_list sobre `QuestionScore` (con el ranking anotado), en el
+    # orden de los argumentos del constructor
+    FIELDS = (
+        "pk",
+        "question__title",
+        "question__author_id",
+        "question__author__username",
+        "ranking",
+    )
+
+    __slots__ = (
+        "pk",
+        "title",
+        "author_id",
+        "author",
+        "ranking",
+        "answer",
+        "like",
+        "dislike",
+    )
+
+    def __init__(self, pk, title, author_id, author, ranking):
+        self.pk = pk
+        self.title = title
+        self.author_id = author_id
+        self.author = author
+        self.ranking = ranking
+        self.answer = self.like = self.dislike = None
+
+    def __repr__(self):
+        return f"<QuestionRecord {self.pk}: {self.title}>"
+
+    def __eq__(self, other):
+        if not isinstance(other, QuestionRecord):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    @classmethod
+    def from_rows(cls, rows):
+        return [cls(*row) for row in rows]
+
+    @classmethod
+    def from_question(cls, question):
+        return cls(
+            question.pk,
+            question.title,
+            question.author_id,
+            question.author.username,
+            question.score.base_score,
+        )
+
+    def set_votes(self, answer, like, dislike):
+        self.answer = answer
+        self.like = like
+        self.dislike = dislike
@@ -6,6 +6,7 @@ de la. Cada clase de prueba se enfoca en un componente o
 funcionalidad específica de la aplicación.
 
 Estructura General:
+- `SurveyTestCase`: Clase base que reinicia el cache y el leaderboard en cada prueba.
 - `QuestionTestCase`: Pruebas para el modelo de preguntas.
 - `AnswerTestCase`: Pruebas para el modelo de respuestas a preguntas.
 - `QuestionFeedbackTestCase`: Pruebas para el modelo de retroalimentación de preguntas.
@@ -13,24 +14,99 @@ Estructura General:
 - `QuestionListViewTest`: Pruebas para la vista de lista de preguntas.
 - `AnswerQuestionErrorTestCase`: Pruebas para el manejo de errores al responder preguntas.
 - `LikeDislikeQuestionErrorTestCase`: Pruebas para el manejo de errores al votar por preguntas.
+- `VoteCountersTestCase`: Pruebas para los contadores desnormalizados de votos.
+- `VoteUpsertTestCase`: Pruebas para la unicidad y el upsert de los votos.
+- `VoteJsonResponseTestCase`: Pruebas para la respuesta JSON de las vistas de votación.
+- `LeaderboardTestCase`: Pruebas para el leaderboard en memoria.
+- `SQLiteCacheTestCase`: Pruebas para el cache compartido entre procesos sobre SQLite.
+- `PageCacheTestCase`: Pruebas para el cache de la página principal de usuarios anónimos.
+- `QuestionOverlayTestCase`: Pruebas para el listado sin estado del usuario y el overlay.
+- `RankedQuestionsApiTestCase`: Pruebas para la API JSON del ranking con ETag.
+- `BulkVoteTestCase`: Pruebas para el registro masivo de votos.
+- `VoteBufferTestCase`: Pruebas para el buffer de escritura diferida de votos.
+- `RecomputeRankingsTestCase`: Pruebas para el recálculo del ranking guardado.
+- `QuestionScoreTestCase`: Pruebas para la tabla de puntajes y su recálculo incremental.
+- `RankingRolloverTestCase`: Pruebas para el cambio de día de los puntos del día de hoy.
+- `RankingStrategyTestCase`: Pruebas para las estrategias de ranking en la base de datos.
+- `QueryPlanTestCase`: Pruebas de que las consultas principales usan los índices.
+- `KeysetPaginationTestCase`: Pruebas para la paginación por cursor de los listados.
+- `QuestionDescriptionTestCase`: Pruebas para la carga diferida de las descripciones.
+- `WarmupTestCase`: Pruebas para el calentamiento del proceso al iniciar.
+- `ProductionCacheTestCase`: Pruebas para los caches compartidos de producción.
+- `SQLiteProfileTestCase`: Pruebas para la configuración de SQLite de producción.
+- `ReadReplicaTestCase`: Pruebas para el enrutamiento de lecturas a la réplica.
 
 Cada clase de prueba contiene métodos específicos que cubren casos de uso y escenarios
 particulares relacionados con la funcionalidad que están evaluando. Las pruebas se enfocan
 tanto en la lógica del modelo como en la interacción con las vistas.
 """
 
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import patch
 
+from django.apps import apps
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.utils import load_backend
+from django.template import engines
+from django.test import (
+    Client,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from .models import Answer, Question, QuestionFeedback
-from .views import QuestionManager
+from quizes.db import set_sqlite_pragmas
+from quizes.routers import STICKY_COOKIE, ReadReplicaRouter
 
+from .models import Answer, Question, QuestionFeedback, QuestionScore
+from .leaderboard import Leaderboard
+from .page_cache import PageCache
+from .ranking import HotRanking, PointsRanking, WilsonRanking, get_strategy
+from .records import QuestionRecord
+from .views import QuestionManager, leaderboard, page_cache, vote_buffer
+from .vote_buffer import VoteBuffer
 
-class QuestionTestCase(TestCase):
+
+class SurveyTestCase(TestCase):
+    """
+    Clase base para las pruebas de la aplicación.
+
+    La base de datos se revierte después de cada prueba, por lo que antes de cada una
+    se descarta el estado que vive fuera de ella: los caches, el leaderboard en memoria
+    y los contadores del cache de páginas.
+    """
+
+    def setUp(self):
+        self.reset_state()
+
+    @staticmethod
+    def reset_state():
+        for alias_cache in caches.all():
+            alias_cache.clear()
+        leaderboard.reset()
+        page_cache.reset_stats()
+        vote_buffer.reset()
+
+
+class QuestionTestCase(SurveyTestCase):
     """
     Clase de pruebas para el modelo `Question` y la vista `question-list`.
 
@@ -43,6 +119,8 @@ class QuestionTestCase(TestCase):
         """
         Configuración inicial para cada prueba.
         """
+        super().setUp()
+
         # Crea un usuario de prueba
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -75,7 +153,7 @@ class QuestionTestCase(TestCase):
         self.assertContains(response, "Test Question")
 
 
-class AnswerTestCase(TestCase):
+class AnswerTestCase(SurveyTestCase):
     """
     Clase de pruebas para el modelo `Answer` y la vista `question-answer`.
 
@@ -85,6 +163,8 @@ class AnswerTestCase(TestCase):
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea un usuario de prueba
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -130,7 +210,7 @@ class AnswerTestCase(TestCase):
         )
 
 
-class QuestionFeedbackTestCase(TestCase):
+class QuestionFeedbackTestCase(SurveyTestCase):
     """
     Clase de pruebas para el modelo `QuestionFeedback` y la vista `question-like`.
 
@@ -140,6 +220,8 @@ class QuestionFeedbackTestCase(TestCase):
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea un usuario de prueba
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -184,7 +266,7 @@ class QuestionFeedbackTestCase(TestCase):
         )
 
 
-class QuestionManagerTestCase(TestCase):
+class QuestionManagerTestCase(SurveyTestCase):
     """
     Clase de pruebas para el gestor de preguntas (`QuestionManager`).
 
@@ -199,9 +281,15 @@ class QuestionManagerTestCase(TestCase):
     - `test_calculate_ranking`: Verifica que el cálculo del ranking sea correcto.
     - `test_get_ranked_questions`: Verifica que las preguntas se obtengan ordenadas por ranking.
     - `test_get_serialized_questions`: Verifica la correcta serialización de las preguntas.
+    - `test_get_ranked_questions_matches_calculate_ranking`: Verifica que el ranking calculado
+      en SQL coincida con `calculate_ranking`.
+    - `test_get_ranked_questions_single_query`: Verifica que el ranking se obtenga con una
+      única consulta.
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea usuarios de prueba
         self.user1 = User.objects.create_user(
             username="testuser 1", password="testpass1"
@@ -250,6 +338,9 @@ class QuestionManagerTestCase(TestCase):
             question=self.question1, author=self.user3, value=1
         )
 
+        # Sincroniza los contadores con los votos creados directamente
+        QuestionManager.sync_vote_counters()
+
     def tearDown(self):
         # Elimina las instancias
         self.user1.delete()
@@ -282,7 +373,7 @@ class QuestionManagerTestCase(TestCase):
         # Verifica que el ranking se haya calculado correctamente
         self.assertEqual(ranking_calculated, ranking_expected)
 
-    @patch("survey.views.Question.objects.all")
+    @patch("survey.views.QuestionScore.objects.all")
     def test_get_ranked_questions(self, mock_question_objects_all):
         # Calcula el ranking para cada pregunta
         QuestionManager.calculate_ranking(self.question1)
@@ -290,7 +381,7 @@ class QuestionManagerTestCase(TestCase):
         QuestionManager.calculate_ranking(self.question3)
 
         # Configura el objeto mock para devolver la lista de preguntas
-        questions = Question.objects.filter(
+        questions = QuestionScore.objects.filter(
             pk__in=[self.question3.pk, self.question2.pk, self.question1.pk]
         )
         mock_question_objects_all.return_value = questions
@@ -301,7 +392,8 @@ class QuestionManagerTestCase(TestCase):
         # Verifica que las preguntas estén ordenadas por ranking de mayor a menor
         mock_question_objects_all.assert_called_once()
         self.assertEqual(
-            ranked_questions, [self.question1, self.question2, self.question3]
+            [question.pk for question in ranked_questions],
+            [self.question1.pk, self.question2.pk, self.question3.pk],
         )
 
     def test_get_serialized_questions(self):
@@ -317,30 +409,53 @@ class QuestionManagerTestCase(TestCase):
 
         # Verifica que las preguntas estén serializadas correctamente
         expected_result = [
-            {
-                "pk": self.question1.id,
-                "title": "Question 1",
-                "author": self.user1,
-                "ranking": self.question1.ranking,
-            },
-            {
-                "pk": self.question2.id,
-                "title": "Question 2",
-                "author": self.user2,
-                "ranking": self.question2.ranking,
-            },
-            {
-                "pk": self.question3.id,
-                "title": "Question 3",
-                "author": self.user3,
-                "ranking": self.question3.ranking,
-            },
+            QuestionRecord(
+                question.pk,
+                question.title,
+                question.author_id,
+                question.author.username,
+                question.score.base_score,
+            )
+            for question in (self.question1, self.question2, self.question3)
         ]
+        self.assertEqual(
+            [record.author for record in serialized_questions],
+            ["testuser 1", "testuser 2", "testuser 3"],
+        )
 
         self.assertEqual(serialized_questions, expected_result)
 
+    def test_get_ranked_questions_matches_calculate_ranking(self):
+        # Una pregunta antigua no recibe los puntos del día de hoy
+        Question.objects.filter(pk=self.question2.pk).update(
+            created=timezone.localdate() - timezone.timedelta(days=1)
+        )
+        QuestionManager.recompute_rankings()
+        self.question2.refresh_from_db()
+
+        ranked_questions = QuestionManager.get_ranked_questions(3)
 
-class QuestionListViewTest(TestCase):
+        # Verifica el ranking de cada pregunta y el orden resultante
+        for question in ranked_questions:
+            self.assertEqual(
+                question.ranking,
+                QuestionManager.calculate_ranking(Question.objects.get(pk=question.pk)),
+            )
+        self.assertEqual(
+            [q.pk for q in ranked_questions],
+            [self.question1.pk, self.question3.pk, self.question2.pk],
+        )
+
+    def test_get_ranked_questions_single_query(self):
+        # Obtiene el ranking con una sola consulta, sin escrituras
+        with self.assertNumQueries(1):
+            ranked_questions = list(QuestionManager.get_ranked_questions(2))
+
+        self.assertEqual(len(ranked_questions), 2)
+        self.assertEqual(ranked_questions[0].ranking, 32)
+
+
+class QuestionListViewTest(SurveyTestCase):
     """
     Clase de pruebas para la vista de lista de preguntas (`QuestionListView`).
 
@@ -353,9 +468,18 @@ class QuestionListViewTest(TestCase):
     Métodos de prueba:
     - `test_question_list_view_authenticated_user`: Verifica la vista para usuarios autenticados.
     - `test_question_list_view_unauthenticated_user`: Verifica la vista para usuarios no autenticados.
+    - `test_question_list_view_does_not_write`: Verifica que la vista no guarde el ranking.
+    - `test_question_list_view_constant_queries`: Verifica que el número de consultas no
+      dependa de la cantidad de preguntas.
+    - `test_user_question_list_single_query`: Verifica que el listado de preguntas del
+      usuario se obtenga con una única consulta, sin cargar el autor de cada fila.
+    - `test_shared_markup_renders_once`: Verifica que el modal de error y las URLs de
+      votación se rendericen una sola vez y no por cada pregunta.
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea un usuario de ejemplo
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -397,6 +521,9 @@ class QuestionListViewTest(TestCase):
             question=self.question3, author=self.user, value=1
         )
 
+        # Sincroniza los contadores con los votos creados directamente
+        QuestionManager.sync_vote_counters()
+
     def tearDown(self):
         # Elimina las instancias
         self.user.delete()
@@ -425,14 +552,15 @@ class QuestionListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
         # Verifica que las preguntas se han pasado al contexto
-        context = [q["pk"] for q in response.context["questions"]]
+        context = [q.pk for q in response.context["questions"]]
         questions = [self.question1.pk, self.question2.pk, self.question3.pk]
         self.assertQuerysetEqual(context, questions)
 
         # Verifica que las respuestas y el feedback están en el contexto para un usuario autenticado
         for question in response.context["questions"]:
-            self.assertIn("answer", question)
-            self.assertTrue("like" in question or "dislike" in question)
+            self.assertIsNotNone(question.answer)
+            self.assertIsNotNone(question.like)
+            self.assertIsNotNone(question.dislike)
 
     def test_question_list_view_unauthenticated_user(self):
         # Hace una solicitud GET a la vista sin autenticación
@@ -442,17 +570,86 @@ class QuestionListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
         # Verifica que las preguntas se han pasado al contexto
-        context = [q["pk"] for q in response.context["questions"]]
+        context = [q.pk for q in response.context["questions"]]
         questions = [self.question1.pk, self.question2.pk, self.question3.pk]
         self.assertQuerysetEqual(context, questions)
 
         # Verifica que las respuestas y el feedback no están en el contexto para un usuario no autenticado
         for question in response.context["questions"]:
-            self.assertNotIn("answer", question)
-            self.assertFalse("like" in question or "dislike" in question)
+            self.assertIsNone(question.answer)
+            self.assertIsNone(question.like)
+            self.assertIsNone(question.dislike)
 
+    def test_question_list_view_does_not_write(self):
+        rankings = dict(QuestionScore.objects.values_list("pk", "base_score"))
 
-class AnswerQuestionErrorTestCase(TestCase):
+        # Hace una solicitud GET a la vista
+        response = self.client.get(reverse("survey:question-list"))
+        self.assertEqual(response.status_code, 200)
+
+        # El ranking guardado se muestra sin modificarlo
+        self.assertEqual(response.context["questions"][0].ranking, 25)
+        self.assertEqual(
+            dict(QuestionScore.objects.values_list("pk", "base_score")), rankings
+        )
+
+    def test_question_list_view_constant_queries(self):
+        # Crea un autor con suficientes preguntas para llenar el listado
+        author = User.objects.create_user(username="author", password="testpass")
+        for i in range(25):
+            question = Question.objects.create(
+                title=f"Pregunta extra {i}", description="", author=author
+            )
+            Answer.objects.create(question=question, author=self.user, value=3)
+            QuestionFeedback.objects.create(
+                question=question, author=self.user, value="like"
+            )
+
+        login_successful = self.client.login(username="testuser", password="testpass")
+        self.assertTrue(login_successful)
+
+        # La primera visita carga el leaderboard en memoria
+        self.client.get(reverse("survey:question-list"))
+
+        # Sesión, usuario, preguntas del top y votos del usuario
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("survey:question-list"))
+
+        self.assertEqual(len(response.context["questions"]), 20)
+        for question in response.context["questions"]:
+            self.assertIsNotNone(question.answer)
+
+    def test_user_question_list_single_query(self):
+        for i in range(25):
+            Question.objects.create(
+                title=f"Pregunta extra {i}", description="", author=self.user
+            )
+
+        login_successful = self.client.login(username="testuser", password="testpass")
+        self.assertTrue(login_successful)
+
+        # Sesión, usuario y una única consulta de preguntas con el autor
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("survey:question-edit-list"))
+
+        self.assertEqual(len(response.context["questions"]), 20)
+        self.assertContains(response, "Autor:</span> testuser", count=20)
+        self.assertContains(response, ">Editar</button>", count=20)
+
+    def test_shared_markup_renders_once(self):
+        login_successful = self.client.login(username="testuser", password="testpass")
+        self.assertTrue(login_successful)
+
+        for url in ("survey:question-list", "survey:question-edit-list"):
+            response = self.client.get(reverse(url))
+
+            self.assertContains(response, 'class="card ', count=3)
+            self.assertContains(response, 'id="errorModalList"', count=1)
+            self.assertContains(response, reverse("survey:question-answer"), count=1)
+            self.assertContains(response, reverse("survey:question-like"), count=1)
+
+
+class AnswerQuestionErrorTestCase(SurveyTestCase):
     """
     Clase de pruebas para gestionar errores en la vista de respuesta a preguntas (`AnswerQuestion`).
 
@@ -470,6 +667,8 @@ class AnswerQuestionErrorTestCase(TestCase):
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea un usuario de ejemplo
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -553,7 +752,7 @@ class AnswerQuestionErrorTestCase(TestCase):
         )
 
 
-class LikeDislikeQuestionErrorTestCase(TestCase):
+class LikeDislikeQuestionErrorTestCase(SurveyTestCase):
     """
     Clase de pruebas para gestionar errores en la vista de votación a preguntas (`like_dislike_question`).
 
@@ -570,6 +769,8 @@ class LikeDislikeQuestionErrorTestCase(TestCase):
     """
 
     def setUp(self):
+        super().setUp()
+
         # Crea un usuario de ejemplo
         self.user = User.objects.create_user(username="testuser", password="testpass")
 
@@ -632,3 +833,2617 @@ class LikeDislikeQuestionErrorTestCase(TestCase):
             str(response.content, encoding="utf8"),
             {"ok": False, "error": "Valor invalido: invalid_value"},
         )
+
+
+class VoteCountersTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para los contadores desnormalizados de votos de `Question`.
+
+    Métodos de prueba:
+    - `test_answer_transitions`: Verifica el contador de respuestas en cada transición.
+    - `test_feedback_transitions`: Verifica los contadores de likes y dislikes en cada
+      transición.
+    - `test_check_vote_counters_command`: Verifica que el comando detecte y repare
+      diferencias.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de la pregunta y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Test Question",
+            description="This is a test question",
+            author=self.author,
+        )
+
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def assertCounters(self, answers, likes, dislikes):
+        # Compara los contadores almacenados con los valores esperados
+        score = QuestionScore.objects.get(pk=self.question.pk)
+        self.assertEqual(
+            (score.answer_count, score.like_count, score.dislike_count),
+            (answers, likes, dislikes),
+        )
+
+    def test_answer_transitions(self):
+        url = reverse("survey:question-answer")
+
+        # Nuevo voto, cambio de valor y respuesta anulada
+        for value, expected in (("3", 1), ("5", 1), ("0", 0), ("0", 0), ("2", 1)):
+            self.client.post(url, {"question_pk": self.question.pk, "value": value})
+            self.assertCounters(expected, 0, 0)
+
+    def test_feedback_transitions(self):
+        url = reverse("survey:question-like")
+
+        # Nuevo voto, like -> dislike, dislike -> other, other -> like, like -> other
+        transitions = (
+            ("like", (0, 1, 0)),
+            ("dislike", (0, 0, 1)),
+            ("other", (0, 0, 0)),
+            ("like", (0, 1, 0)),
+            ("like", (0, 1, 0)),
+            ("other", (0, 0, 0)),
+        )
+        for value, expected in transitions:
+            self.client.post(url, {"question_pk": self.question.pk, "value": value})
+            self.assertCounters(*expected)
+
+    def test_check_vote_counters_command(self):
+        # Crea votos sin pasar por las vistas, por lo que los contadores quedan desfasados
+        Answer.objects.create(question=self.question, author=self.user, value=4)
+        QuestionFeedback.objects.create(
+            question=self.question, author=self.user, value="dislike"
+        )
+
+        out = StringIO()
+        call_command("check_vote_counters", stdout=out)
+        self.assertIn(f"Pregunta {self.question.pk}", out.getvalue())
+        self.assertCounters(0, 0, 0)
+
+        out = StringIO()
+        call_command("check_vote_counters", "--repair", stdout=out)
+        self.assertIn("Preguntas reparadas: 1", out.getvalue())
+        self.assertCounters(1, 0, 1)
+
+        out = StringIO()
+        call_command("check_vote_counters", stdout=out)
+        self.assertIn("sincronizados", out.getvalue())
+
+
+class VoteUpsertTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la restricción única (pregunta, autor) y el upsert de votos.
+
+    Métodos de prueba:
+    - `test_upsert_inserts_and_updates`: Verifica que el upsert cree y luego actualice
+      un único registro.
+    - `test_duplicate_votes_rejected`: Verifica que la base de datos rechace votos
+      duplicados.
+    - `test_repeated_votes_keep_single_row`: Verifica que votar varias veces desde las
+      vistas mantenga un solo registro por usuario.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de la pregunta y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Test Question",
+            description="This is a test question",
+            author=self.author,
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_upsert_inserts_and_updates(self):
+        Answer.objects.upsert(self.question.pk, self.user.pk, 2)
+        Answer.objects.upsert(self.question.pk, self.user.pk, 5)
+        QuestionFeedback.objects.upsert(self.question.pk, self.user.pk, "like")
+        QuestionFeedback.objects.upsert(self.question.pk, self.user.pk, "dislike")
+
+        answer = Answer.objects.get(question=self.question, author=self.user)
+        self.assertEqual((answer.value, answer.comment), (5, ""))
+        feedback = QuestionFeedback.objects.get(
+            question=self.question, author=self.user
+        )
+        self.assertEqual(feedback.value, "dislike")
+
+    def test_duplicate_votes_rejected(self):
+        Answer.objects.create(question=self.question, author=self.user, value=1)
+        QuestionFeedback.objects.create(
+            question=self.question, author=self.user, value="like"
+        )
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Answer.objects.create(question=self.question, author=self.user, value=2)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            QuestionFeedback.objects.create(
+                question=self.question, author=self.user, value="like"
+            )
+
+    def test_repeated_votes_keep_single_row(self):
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+        for value in ("1", "4", "4"):
+            self.client.post(
+                reverse("survey:question-answer"),
+                {"question_pk": self.question.pk, "value": value},
+            )
+        for value in ("like", "dislike", "dislike"):
+            self.client.post(
+                reverse("survey:question-like"),
+                {"question_pk": self.question.pk, "value": value},
+            )
+
+        self.assertEqual(Answer.objects.get(question=self.question).value, 4)
+        self.assertEqual(
+            QuestionFeedback.objects.get(question=self.question).value, "dislike"
+        )
+
+
+class VoteJsonResponseTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la respuesta JSON de `answer_question` y `like_dislike_question`.
+
+    Métodos de prueba:
+    - `test_answer_question_returns_state`: Verifica el ranking y la respuesta devueltos.
+    - `test_like_dislike_question_returns_state`: Verifica el ranking y el feedback
+      devueltos.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de la pregunta y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Test Question",
+            description="This is a test question",
+            author=self.author,
+        )
+
+        # Guarda los puntos del día de la pregunta creada directamente
+        QuestionManager.sync_vote_counters()
+
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_answer_question_returns_state(self):
+        response = self.client.post(
+            reverse("survey:question-answer"),
+            {"question_pk": self.question.pk, "value": "4"},
+        )
+
+        # Una respuesta más los puntos del día de hoy
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": True, "ranking": 20, "answer": 4},
+        )
+
+    def test_like_dislike_question_returns_state(self):
+        response = self.client.post(
+            reverse("survey:question-like"),
+            {"question_pk": self.question.pk, "value": "dislike"},
+        )
+
+        # Un dislike más los puntos del día de hoy
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": True, "ranking": 7, "like": False, "dislike": True},
+        )
+
+
+class LeaderboardTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el leaderboard en memoria (`Leaderboard`).
+
+    Métodos de prueba:
+    - `test_top_matches_ranked_questions`: Verifica que el leaderboard coincida con el
+      ranking calculado en la base de datos después de votar.
+    - `test_question_views_update_leaderboard`: Verifica que crear y eliminar preguntas
+      actualice el leaderboard.
+    - `test_bounded_capacity`: Verifica que la memoria quede acotada y que se
+      reconstruya cuando el top no se puede garantizar.
+    - `test_sync_between_workers`: Verifica que dos instancias que comparten el cache
+      se sincronicen.
+    - `test_late_events_are_ignored`: Verifica que un evento publicado después de
+      otro más nuevo de la misma pregunta no lo pise.
+    - `test_votes_bump_version`: Verifica que cada voto incremente la versión de la
+      fila y la publique en el leaderboard.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.questions = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(4)
+        ]
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_top_matches_ranked_questions(self):
+        # Carga el leaderboard antes de votar
+        leaderboard.top(20)
+
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+        self.client.post(
+            reverse("survey:question-answer"),
+            {"question_pk": self.questions[2].pk, "value": "3"},
+        )
+        self.client.post(
+            reverse("survey:question-like"),
+            {"question_pk": self.questions[1].pk, "value": "like"},
+        )
+        self.client.post(
+            reverse("survey:question-like"),
+            {"question_pk": self.questions[0].pk, "value": "dislike"},
+        )
+
+        expected = [(q.pk, q.ranking) for q in QuestionManager.get_ranked_questions(20)]
+        with self.assertNumQueries(0):
+            self.assertEqual(leaderboard.top(20), expected)
+
+    def test_question_views_update_leaderboard(self):
+        leaderboard.top(20)
+
+        login_successful = self.client.login(username="author", password="testpass")
+        self.assertTrue(login_successful)
+        self.client.post(
+            reverse("survey:question-create"),
+            {"title": "New Question", "description": "New description"},
+        )
+        question = Question.objects.get(title="New Question")
+        self.assertIn((question.pk, 10), leaderboard.top(20))
+
+        self.client.post(reverse("survey:question-delete", args=[question.pk]))
+        self.assertNotIn(question.pk, [pk for pk, _ in leaderboard.top(20)])
+
+    def test_bounded_capacity(self):
+        scores = {1: 50, 2: 40, 3: 30, 4: 20, 5: 10}
+
+        def loader(limit):
+            rows = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(pk, score, 0) for pk, score in rows[:limit]]
+
+        board = Leaderboard(loader, capacity=3, key_prefix="test:bounded")
+        self.assertEqual(board.top(3), [(1, 50), (2, 40), (3, 30)])
+
+        # Una pregunta fuera de memoria sube al top y desplaza a la peor
+        scores[5] = 45
+        board.update(5, 45, 1)
+        self.assertEqual(board.top(3), [(1, 50), (5, 45), (2, 40)])
+        self.assertEqual(len(board._entries), 3)
+
+        # Si una pregunta baja por debajo de la cota, el top se reconstruye
+        scores[1] = 0
+        board.update(1, 0, 1)
+        self.assertEqual(board.top(3), [(5, 45), (2, 40), (3, 30)])
+
+    def test_sync_between_workers(self):
+        scores = {1: 10, 2: 20}
+
+        def loader(limit):
+            rows = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(pk, score, 0) for pk, score in rows[:limit]]
+
+        worker1 = Leaderboard(loader, key_prefix="test:sync")
+        worker2 = Leaderboard(loader, key_prefix="test:sync")
+        self.assertEqual(worker1.top(2), [(2, 20), (1, 10)])
+        self.assertEqual(worker2.top(2), [(2, 20), (1, 10)])
+
+        # El voto procesado por un worker se refleja en el otro
+        worker1.update(1, 30, 1)
+        worker1.remove(2)
+        self.assertEqual(worker2.top(2), [(1, 30)])
+
+    def test_late_events_are_ignored(self):
+        scores = {1: 10, 2: 20}
+
+        def loader(limit):
+            rows = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(pk, score, 0) for pk, score in rows[:limit]]
+
+        worker1 = Leaderboard(loader, key_prefix="test:late")
+        worker2 = Leaderboard(loader, key_prefix="test:late")
+        worker2.top(2)
+
+        # Dos votos a la misma pregunta confirman en orden 1, 2, pero el segundo
+        # se publica primero: el evento tardío de la versión 1 se descarta
+        worker1.update(1, 40, 2)
+        worker1.update(1, 30, 1)
+        self.assertEqual(worker2.top(2), [(1, 40), (2, 20)])
+        self.assertEqual(worker1.top(2), [(1, 40), (2, 20)])
+
+        # Una pregunta eliminada no vuelve con un evento anterior
+        worker1.remove(2)
+        worker1.update(2, 50, 1)
+        self.assertEqual(worker2.top(2), [(1, 40)])
+
+    def test_votes_bump_version(self):
+        leaderboard.top(20)
+        pk = self.questions[0].pk
+
+        QuestionManager.apply_votes(answers={(self.user.pk, pk): 3})
+        QuestionManager.apply_votes(feedback={(self.user.pk, pk): "like"})
+
+        version = QuestionScore.objects.get(pk=pk).version
+        self.assertEqual(version, 2)
+        self.assertEqual(leaderboard._versions[pk], version)
+
+
+class SQLiteCacheTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el cache compartido sobre SQLite (`quizes.cache.SQLiteCache`).
+
+    Métodos de prueba:
+    - `test_cache_operations`: Verifica las operaciones del cache y el vencimiento de
+      las entradas.
+    - `test_atomic_incr`: Verifica que los incrementos concurrentes desde varias
+      conexiones no repitan valores.
+    - `test_concurrent_publish`: Verifica que dos leaderboards que publican a la vez
+      no pierdan eventos.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Cache en un archivo temporal, con una conexión por hilo
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "shared": {
+                    "BACKEND": "quizes.cache.SQLiteCache",
+                    "LOCATION": os.path.join(directory.name, "cache.sqlite3"),
+                },
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.cache = caches["shared"]
+
+    def run_threads(self, target, count):
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_cache_operations(self):
+        self.cache.set("number", 1)
+        self.cache.set("data", {"pks": [1, 2]}, timeout=None)
+        self.assertEqual(self.cache.get("number"), 1)
+        self.assertEqual(
+            self.cache.get_many(["number", "data", "missing"]),
+            {"number": 1, "data": {"pks": [1, 2]}},
+        )
+
+        # add solo escribe claves inexistentes o vencidas
+        self.assertFalse(self.cache.add("number", 2))
+        self.cache.set("expired", "value", timeout=0)
+        self.assertIsNone(self.cache.get("expired"))
+        self.assertTrue(self.cache.add("expired", "new"))
+        self.assertEqual(self.cache.get("expired"), "new")
+
+        self.assertEqual(self.cache.incr("number", 4), 5)
+        self.assertEqual(self.cache.decr("number"), 4)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+        self.assertTrue(self.cache.delete("number"))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("data"))
+
+    def test_atomic_incr(self):
+        self.cache.add("seq", 0, timeout=None)
+        values = []
+
+        def increment(_):
+            for _ in range(100):
+                values.append(self.cache.incr("seq"))
+
+        self.run_threads(increment, 4)
+
+        self.assertEqual(self.cache.get("seq"), 400)
+        self.assertEqual(sorted(values), list(range(1, 401)))
+
+    def test_concurrent_publish(self):
+        def loader(limit):
+            return []
+
+        workers = [
+            Leaderboard(loader, cache_alias="shared", key_prefix="test:publish")
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.top(1)
+
+        # Dos workers publican a la vez puntajes de preguntas distintas
+        def publish(index):
+            for pk in range(index * 100, index * 100 + 100):
+                workers[index].update(pk, pk, 1)
+
+        self.run_threads(publish, 2)
+
+        self.assertEqual(workers[2].top(200), [(pk, pk) for pk in reversed(range(200))])
+
+
+class PageCacheTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el cache versionado de la página principal (`PageCache`).
+
+    Métodos de prueba:
+    - `test_anonymous_page_is_cached`: Verifica que la segunda visita anónima no consulte
+      la base de datos.
+    - `test_authenticated_page_is_not_cached`: Verifica que los usuarios autenticados
+      no usen el cache.
+    - `test_vote_invalidates_page`: Verifica que un voto cambie la generación.
+    - `test_stale_page_while_rebuilding`: Verifica que se sirva la página anterior
+      mientras otro proceso la reconstruye.
+    - `test_stats_shared_between_workers`: Verifica que los contadores de varios
+      workers se sumen en el cache y que el comando `survey_stats` los muestre.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de la pregunta y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Test Question",
+            description="This is a test question",
+            author=self.author,
+        )
+
+        # Guarda el ranking de la pregunta creada directamente
+        QuestionManager.sync_vote_counters()
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_anonymous_page_is_cached(self):
+        response = self.client.get(reverse("survey:question-list"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("survey:question-list"))
+
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        self.assertContains(response, "Test Question")
+        self.assertIn("csrftoken", response.cookies)
+        self.assertEqual(page_cache.stats(), {"hits": 1, "misses": 1, "stale": 0})
+
+    def test_authenticated_page_is_not_cached(self):
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+        self.client.get(reverse("survey:question-list"))
+        response = self.client.get(reverse("survey:question-list"))
+
+        self.assertNotIn("X-Page-Cache", response)
+        self.assertEqual(page_cache.stats(), {"hits": 0, "misses": 0, "stale": 0})
+
+    def test_vote_invalidates_page(self):
+        self.assertContains(self.client.get(reverse("survey:question-list")), "10 pts.")
+
+        voter = Client()
+        voter.login(username="voter", password="testpass")
+        voter.post(
+            reverse("survey:question-answer"),
+            {"question_pk": self.question.pk, "value": "5"},
+        )
+
+        response = self.client.get(reverse("survey:question-list"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "20 pts.")
+
+    def test_stale_page_while_rebuilding(self):
+        self.client.get(reverse("survey:question-list"))
+
+        # Otro proceso tiene el lock de reconstrucción de la nueva generación
+        generation = page_cache.bump()
+        page_cache.cache.add(f"survey:page:question-list:{generation}:lock", 1)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("survey:question-list"))
+
+        self.assertEqual(response["X-Page-Cache"], "stale")
+        self.assertContains(response, "Test Question")
+
+    def test_stats_shared_between_workers(self):
+        worker1, worker2 = [
+            PageCache(cache_alias="pages", key_prefix="test:stats", stats_interval=60)
+            for _ in range(2)
+        ]
+        for worker in (worker1, worker2):
+            worker.get_or_render_fragment("list", lambda: "<ul></ul>")
+
+        # El segundo worker todavía no sumó su acierto al cache
+        self.assertEqual(worker1.stats(), {"hits": 0, "misses": 1, "stale": 0})
+        self.assertEqual(worker2.stats(), {"hits": 1, "misses": 1, "stale": 0})
+
+        # Un worker que arranca no reinicia los contadores de los demás
+        PageCache(cache_alias="pages", key_prefix="test:stats")
+        self.assertEqual(worker1.stats(), {"hits": 1, "misses": 1, "stale": 0})
+
+        self.client.get(reverse("survey:question-list"))
+        self.client.get(reverse("survey:question-list"))
+        out = StringIO()
+        call_command("survey_stats", "--reset", stdout=out)
+        self.assertIn("1 aciertos, 1 fallos, 0 páginas anteriores", out.getvalue())
+        self.assertEqual(page_cache.stats(), {"hits": 0, "misses": 0, "stale": 0})
+
+
+class QuestionOverlayTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el listado compartido y el endpoint `question-overlay`.
+
+    Métodos de prueba:
+    - `test_overlay_returns_user_state`: Verifica los votos devueltos por el overlay.
+    - `test_overlay_single_query`: Verifica que el overlay use una única consulta.
+    - `test_overlay_anonymous_and_invalid`: Verifica el overlay para usuarios anónimos
+      y pks inválidos.
+    - `test_shell_mode_shares_cached_list`: Verifica que en modo overlay el listado se
+      comparta entre usuarios desde el cache.
+    - `test_ranked_fragment_cache_control`: Verifica el `Cache-Control` público del
+      fragmento del listado.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.questions = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(3)
+        ]
+        Answer.objects.create(question=self.questions[0], author=self.user, value=3)
+        QuestionFeedback.objects.create(
+            question=self.questions[0], author=self.user, value="like"
+        )
+        QuestionFeedback.objects.create(
+            question=self.questions[1], author=self.user, value="dislike"
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_overlay_returns_user_state(self):
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+        pks = ",".join(str(question.pk) for question in self.questions)
+        response = self.client.get(reverse("survey:question-overlay"), {"pks": pks})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {
+                "ok": True,
+                "questions": {
+                    str(self.questions[0].pk): {
+                        "answer": 3,
+                        "like": True,
+                        "dislike": False,
+                    },
+                    str(self.questions[1].pk): {
+                        "answer": 0,
+                        "like": False,
+                        "dislike": True,
+                    },
+                    str(self.questions[2].pk): {
+                        "answer": 0,
+                        "like": False,
+                        "dislike": False,
+                    },
+                },
+            },
+        )
+
+    def test_overlay_single_query(self):
+        with self.assertNumQueries(1):
+            QuestionManager.get_user_overlay(
+                self.user, [question.pk for question in self.questions]
+            )
+
+    def test_overlay_anonymous_and_invalid(self):
+        response = self.client.get(
+            reverse("survey:question-overlay"), {"pks": str(self.questions[0].pk)}
+        )
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"), {"ok": True, "questions": {}}
+        )
+
+        response = self.client.get(reverse("survey:question-overlay"), {"pks": "1,x"})
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": False, "error": "Pregunta invalida: x"},
+        )
+
+        response = self.client.get(reverse("survey:question-overlay"), {"pks": "1,²"})
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": False, "error": "Pregunta invalida: ²"},
+        )
+
+        # Pks que no entran en un entero de 64 bits
+        for pk in ("1" * 25, str(2**63)):
+            response = self.client.get(
+                reverse("survey:question-overlay"), {"pks": f"1,{pk}"}
+            )
+            self.assertJSONEqual(
+                str(response.content, encoding="utf8"),
+                {"ok": False, "error": f"Pregunta invalida: {pk}"},
+            )
+
+    @override_settings(SURVEY_LIST_OVERLAY=True)
+    def test_shell_mode_shares_cached_list(self):
+        for username in ("voter", "author"):
+            client = Client()
+            client.login(username=username, password="testpass")
+            response = client.get(reverse("survey:question-list"))
+
+            self.assertContains(response, "Question 0")
+            self.assertContains(response, reverse("survey:question-overlay"))
+            # El listado no incluye el estado del usuario
+            self.assertNotContains(response, "fas fa-star")
+            self.assertNotContains(
+                response, f"question-{self.questions[0].pk} disabled"
+            )
+
+        self.assertEqual(page_cache.stats(), {"hits": 1, "misses": 1, "stale": 0})
+
+    def test_ranked_fragment_cache_control(self):
+        response = self.client.get(reverse("survey:question-ranked"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Question 2")
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn(f"max-age={page_cache.timeout}", response["Cache-Control"])
+        self.assertNotIn("csrftoken", response.cookies)
+
+
+class RankedQuestionsApiTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la API `api-questions-ranked`.
+
+    Métodos de prueba:
+    - `test_ranked_questions`: Verifica las preguntas devueltas y el ETag.
+    - `test_not_modified_without_queries`: Verifica la respuesta 304 sin consultas.
+    - `test_vote_changes_etag`: Verifica que un voto cambie el ETag.
+    - `test_etag_shared_between_workers`: Verifica que un voto procesado por otro
+      worker cambie el ETag con un cache de páginas compartido.
+    - `test_invalid_limit`: Verifica el manejo de límites inválidos.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question1 = Question.objects.create(
+            title="Question 1", description="", author=self.author
+        )
+        self.question2 = Question.objects.create(
+            title="Question 2", description="", author=self.author
+        )
+
+        # Guarda el ranking de las preguntas creadas directamente
+        QuestionManager.sync_vote_counters()
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_ranked_questions(self):
+        response = self.client.get(
+            reverse("survey:api-questions-ranked"), {"limit": "1"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {
+                "ok": True,
+                "questions": [
+                    {
+                        "pk": self.question1.pk,
+                        "title": "Question 1",
+                        "author": "author",
+                        "ranking": 10,
+                    }
+                ],
+            },
+        )
+
+    def test_not_modified_without_queries(self):
+        etag = self.client.get(reverse("survey:api-questions-ranked"))["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("survey:api-questions-ranked"), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_vote_changes_etag(self):
+        etag = self.client.get(reverse("survey:api-questions-ranked"))["ETag"]
+
+        voter = Client()
+        voter.login(username="voter", password="testpass")
+        voter.post(
+            reverse("survey:question-like"),
+            {"question_pk": self.question2.pk, "value": "like"},
+        )
+
+        response = self.client.get(
+            reverse("survey:api-questions-ranked"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["questions"][0]["pk"], self.question2.pk)
+
+    def test_etag_shared_between_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            shared = {
+                "BACKEND": "quizes.cache.SQLiteCache",
+                "LOCATION": os.path.join(directory, "pages.sqlite3"),
+            }
+            caches_settings = {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "pages": shared,
+                "pages-worker2": shared,
+            }
+            with override_settings(CACHES=caches_settings):
+                etag = self.client.get(reverse("survey:api-questions-ranked"))["ETag"]
+
+                # Otro worker procesa un voto e incrementa la generación compartida
+                PageCache(cache_alias="pages-worker2").bump()
+
+                response = self.client.get(
+                    reverse("survey:api-questions-ranked"), HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_invalid_limit(self):
+        for limit in ("0", "²", "\n", "0" * 25 + "1"):
+            with self.subTest(limit=limit):
+                response = self.client.get(
+                    reverse("survey:api-questions-ranked"), {"limit": limit}
+                )
+
+                self.assertJSONEqual(
+                    str(response.content, encoding="utf8"),
+                    {"ok": False, "error": f"Limite invalido: {limit}"},
+                )
+                # La respuesta de error no lleva ETag, por lo que no se responde 304
+                self.assertFalse(response.has_header("ETag"))
+
+        # El ETag se arma con el límite ya convertido
+        etags = [
+            self.client.get(reverse("survey:api-questions-ranked"), {"limit": limit})[
+                "ETag"
+            ]
+            for limit in ("20", "020")
+        ]
+        self.assertEqual(etags[0], etags[1])
+
+
+class BulkVoteTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la vista `question-bulk-vote`.
+
+    Métodos de prueba:
+    - `test_bulk_vote_applies_valid_items`: Verifica los resultados por voto, los
+      votos guardados y los contadores.
+    - `test_bulk_vote_last_value_wins`: Verifica que prevalezca el último valor de una
+      pregunta repetida.
+    - `test_bulk_vote_non_decimal_digits`: Verifica que caracteres como "²" en el pk
+      o la respuesta devuelvan un error por voto.
+    - `test_bulk_vote_overflowing_values`: Verifica que un pk o una respuesta que no
+      entran en un entero de 64 bits devuelvan un error por voto.
+    - `test_bulk_vote_invalid_body`: Verifica el manejo de cuerpos inválidos.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question1 = Question.objects.create(
+            title="Question 1", description="", author=self.author
+        )
+        self.question2 = Question.objects.create(
+            title="Question 2", description="", author=self.author
+        )
+        self.own_question = Question.objects.create(
+            title="Own Question", description="", author=self.user
+        )
+
+        # Guarda los puntos del día de las preguntas creadas directamente
+        QuestionManager.sync_vote_counters()
+
+        login_successful = self.client.login(username="voter", password="testpass")
+        self.assertTrue(login_successful)
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def post_votes(self, votes):
+        return self.client.post(
+            reverse("survey:question-bulk-vote"),
+            json.dumps(votes),
+            content_type="application/json",
+        )
+
+    def test_bulk_vote_applies_valid_items(self):
+        response = self.post_votes(
+            [
+                {"question_pk": self.question1.pk, "answer": 4, "feedback": "like"},
+                {"question_pk": self.question2.pk, "feedback": "dislike"},
+                {"question_pk": self.question2.pk, "answer": "9"},
+                {"question_pk": self.own_question.pk, "answer": 1},
+                {"question_pk": 999, "answer": 1},
+                {"answer": 1},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "ok": True,
+                "results": [
+                    {
+                        "question_pk": self.question1.pk,
+                        "ok": True,
+                        "ranking": 25,
+                        "answer": 4,
+                        "like": True,
+                        "dislike": False,
+                    },
+                    {
+                        "question_pk": self.question2.pk,
+                        "ok": True,
+                        "ranking": 7,
+                        "like": False,
+                        "dislike": True,
+                    },
+                    {
+                        "question_pk": self.question2.pk,
+                        "ok": False,
+                        "error": "Valor invalido: 9",
+                    },
+                    {
+                        "question_pk": self.own_question.pk,
+                        "ok": False,
+                        "error": "No se puede votar tu propia pregunta",
+                    },
+                    {
+                        "question_pk": 999,
+                        "ok": False,
+                        "error": "Pregunta no encontrada: 999",
+                    },
+                    {"question_pk": None, "ok": False, "error": "Datos incompletos"},
+                ],
+            },
+        )
+        self.assertEqual(Answer.objects.filter(author=self.user).count(), 1)
+        self.assertEqual(QuestionFeedback.objects.filter(author=self.user).count(), 2)
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+    def test_bulk_vote_last_value_wins(self):
+        self.post_votes(
+            [
+                {"question_pk": self.question1.pk, "answer": 2},
+                {"question_pk": self.question1.pk, "answer": 0},
+            ]
+        )
+
+        self.assertEqual(Answer.objects.get(author=self.user).value, 0)
+        self.assertEqual(
+            QuestionScore.objects.get(pk=self.question1.pk).answer_count, 0
+        )
+
+    def test_bulk_vote_non_decimal_digits(self):
+        response = self.post_votes(
+            [
+                {"question_pk": "²", "answer": 3},
+                {"question_pk": self.question1.pk, "answer": "²"},
+            ]
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "ok": True,
+                "results": [
+                    {
+                        "question_pk": "²",
+                        "ok": False,
+                        "error": "Pregunta no encontrada: ²",
+                    },
+                    {
+                        "question_pk": self.question1.pk,
+                        "ok": False,
+                        "error": "El valor no es digito: ²",
+                    },
+                ],
+            },
+        )
+        self.assertFalse(Answer.objects.filter(author=self.user).exists())
+
+    def test_bulk_vote_overflowing_values(self):
+        pk = "1" * 25
+        answer = "3" * 5000
+        response = self.post_votes(
+            [
+                {"question_pk": pk, "answer": 3},
+                {"question_pk": self.question1.pk, "answer": answer},
+            ]
+        )
+
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "question_pk": pk,
+                    "ok": False,
+                    "error": f"Pregunta no encontrada: {pk}",
+                },
+                {
+                    "question_pk": self.question1.pk,
+                    "ok": False,
+                    "error": f"Valor invalido: {answer}",
+                },
+            ],
+        )
+        self.assertFalse(Answer.objects.filter(author=self.user).exists())
+
+    def test_bulk_vote_invalid_body(self):
+        response = self.client.post(
+            reverse("survey:question-bulk-vote"),
+            "no es json",
+            content_type="application/json",
+        )
+        self.assertEqual(response.json(), {"ok": False, "error": "JSON invalido"})
+
+        response = self.post_votes({"question_pk": self.question1.pk})
+        self.assertEqual(
+            response.json(), {"ok": False, "error": "Se esperaba un arreglo de votos"}
+        )
+
+
+@override_settings(SURVEY_VOTE_BUFFER=True)
+class VoteBufferTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el buffer de escritura diferida de votos.
+
+    El hilo de vaciado no se inicia durante las pruebas; los votos se guardan
+    llamando a `flush()`.
+
+    Métodos de prueba:
+    - `test_votes_are_queued_until_flush`: Verifica que los votos se encolen y se
+      guarden con los contadores al vaciar el buffer.
+    - `test_votes_are_coalesced`: Verifica que prevalezca el último voto de cada
+      usuario y pregunta.
+    - `test_failed_flush_requeues_votes`: Verifica que un vaciado fallido devuelva los
+      votos a la cola sin pisar votos más nuevos.
+    - `test_invalid_votes_are_dropped`: Verifica que un voto que falla por
+      integridad se descarte sin impedir guardar los demás.
+    - `test_metrics_shared_between_workers`: Verifica que las métricas de varios
+      workers se sumen en el cache y que el comando `survey_stats` las muestre.
+    - `test_spool_is_replayed`: Verifica que los votos respaldados al cerrar se
+      guarden en el siguiente vaciado.
+    - `test_spools_are_per_process`: Verifica que los respaldos de varios procesos no
+      se pisen.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        autostart = patch.object(vote_buffer, "autostart", False)
+        autostart.start()
+        self.addCleanup(autostart.stop)
+
+        # Crea el autor de la pregunta y dos usuarios que votan
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user1 = User.objects.create_user(username="user1", password="testpass")
+        self.user2 = User.objects.create_user(username="user2", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Question", description="", author=self.author
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user1.delete()
+        self.user2.delete()
+
+    def vote(self, username, url, value):
+        self.client.login(username=username, password="testpass")
+        return self.client.post(
+            reverse(url), {"question_pk": self.question.pk, "value": value}
+        ).json()
+
+    def test_votes_are_queued_until_flush(self):
+        data = self.vote("user1", "survey:question-answer", "4")
+        self.assertEqual(data, {"ok": True, "queued": True, "answer": 4})
+        data = self.vote("user2", "survey:question-like", "like")
+        self.assertEqual(
+            data, {"ok": True, "queued": True, "like": True, "dislike": False}
+        )
+
+        self.assertFalse(Answer.objects.exists())
+        self.assertEqual(vote_buffer.metrics()["queue_depth"], 2)
+
+        self.assertEqual(vote_buffer.flush(), 2)
+
+        score = QuestionScore.objects.get(pk=self.question.pk)
+        self.assertEqual(score.answer_count, 1)
+        self.assertEqual(score.like_count, 1)
+        self.assertEqual(Answer.objects.get(author=self.user1).value, 4)
+
+        metrics = vote_buffer.metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["flushes"], 1)
+        self.assertEqual(metrics["flushed_votes"], 2)
+        self.assertIsNotNone(metrics["last_flush_ms"])
+
+    def test_votes_are_coalesced(self):
+        self.vote("user1", "survey:question-answer", "2")
+        self.vote("user1", "survey:question-answer", "5")
+        self.vote("user1", "survey:question-like", "like")
+        self.vote("user1", "survey:question-like", "dislike")
+
+        self.assertEqual(vote_buffer.metrics()["queue_depth"], 2)
+        vote_buffer.flush()
+
+        self.assertEqual(Answer.objects.get().value, 5)
+        self.assertEqual(QuestionFeedback.objects.get().value, "dislike")
+        score = QuestionScore.objects.get(pk=self.question.pk)
+        self.assertEqual(score.like_count, 0)
+        self.assertEqual(score.dislike_count, 1)
+
+    def test_failed_flush_requeues_votes(self):
+        def apply(answers, feedback):
+            # Un voto nuevo llega mientras se guarda el lote
+            buffer.add_answer(self.user1.pk, self.question.pk, 5)
+            raise RuntimeError("database is locked")
+
+        buffer = VoteBuffer(apply=apply, autostart=False)
+        buffer.add_answer(self.user1.pk, self.question.pk, 2)
+        buffer.add_answer(self.user2.pk, self.question.pk, 3)
+
+        with self.assertRaises(RuntimeError):
+            buffer.flush()
+
+        self.assertEqual(
+            buffer._answers,
+            {
+                (self.user1.pk, self.question.pk): 5,
+                (self.user2.pk, self.question.pk): 3,
+            },
+        )
+        self.assertEqual(buffer.metrics()["failures"], 1)
+
+    def test_invalid_votes_are_dropped(self):
+        deleted = Question.objects.create(
+            title="Deleted", description="", author=self.author
+        )
+        deleted_pk = deleted.pk
+        deleted.delete()
+
+        # La clave foránea a la pregunta eliminada falla al confirmar la transacción
+        def apply(answers, feedback):
+            if any(pk == deleted_pk for _, pk in [*answers, *feedback]):
+                raise IntegrityError("FOREIGN KEY constraint failed")
+            QuestionManager.apply_votes(answers, feedback)
+
+        buffer = VoteBuffer(apply=apply, autostart=False)
+        buffer.add_answer(self.user1.pk, deleted_pk, 4)
+        buffer.add_answer(self.user2.pk, self.question.pk, 3)
+        buffer.add_feedback(self.user1.pk, self.question.pk, "like")
+
+        with self.assertLogs("survey.vote_buffer", level="WARNING"):
+            self.assertEqual(buffer.flush(), 2)
+
+        self.assertEqual(Answer.objects.get().value, 3)
+        self.assertEqual(QuestionFeedback.objects.get().value, "like")
+
+        metrics = buffer.metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["failures"], 0)
+        self.assertEqual(metrics["dropped_votes"], 1)
+
+        # Los vaciados siguientes ya no incluyen el voto inválido
+        buffer.add_answer(self.user1.pk, self.question.pk, 5)
+        self.assertEqual(buffer.flush(), 1)
+
+    def test_metrics_shared_between_workers(self):
+        worker1, worker2 = [
+            VoteBuffer(apply=QuestionManager.apply_votes, autostart=False)
+            for _ in range(2)
+        ]
+        worker1.add_answer(self.user1.pk, self.question.pk, 4)
+        worker2.add_answer(self.user2.pk, self.question.pk, 3)
+        worker2.add_feedback(self.user2.pk, self.question.pk, "like")
+
+        # La cola de cada worker se publica al consultar las métricas
+        self.assertEqual(worker1.metrics()["queue_depth"], 1)
+        self.assertEqual(worker2.metrics()["queue_depth"], 3)
+
+        self.assertEqual(worker1.flush(), 1)
+        self.assertEqual(worker2.flush(), 2)
+
+        # Un worker que arranca no reinicia las métricas de los demás
+        VoteBuffer(apply=QuestionManager.apply_votes, autostart=False)
+
+        metrics = vote_buffer.metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["flushes"], 2)
+        self.assertEqual(metrics["flushed_votes"], 3)
+        self.assertGreaterEqual(metrics["max_flush_ms"], metrics["last_flush_ms"])
+
+        out = StringIO()
+        call_command("survey_stats", "--reset", stdout=out)
+        self.assertIn("Buffer de votos: 0 en cola, 2 vaciados (último", out.getvalue())
+        self.assertIn(
+            "3 votos guardados, 0 fallos, 0 votos descartados", out.getvalue()
+        )
+
+        metrics = vote_buffer.metrics()
+        self.assertEqual(metrics["flushes"], 0)
+        self.assertIsNone(metrics["last_flush_ms"])
+
+    def test_spool_is_replayed(self):
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        spool_path = os.path.join(spool_dir.name, "vote_buffer.json")
+
+        # Un proceso que no puede guardar al cerrar respalda los votos pendientes
+        def apply(answers, feedback):
+            raise RuntimeError("database is locked")
+
+        buffer = VoteBuffer(apply=apply, spool_path=spool_path, autostart=False)
+        buffer.add_answer(self.user1.pk, self.question.pk, 3)
+        buffer.add_feedback(self.user2.pk, self.question.pk, "like")
+        with self.assertLogs("survey.vote_buffer", level="ERROR"):
+            buffer.stop()
+        self.assertEqual(len(os.listdir(spool_dir.name)), 1)
+
+        # El siguiente proceso los encola sin pisar los votos nuevos
+        buffer = VoteBuffer(
+            apply=QuestionManager.apply_votes, spool_path=spool_path, autostart=False
+        )
+        buffer.add_feedback(self.user2.pk, self.question.pk, "dislike")
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(os.listdir(spool_dir.name), [])
+
+        self.assertEqual(Answer.objects.get().value, 3)
+        self.assertEqual(QuestionFeedback.objects.get().value, "dislike")
+
+    def test_spools_are_per_process(self):
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        spool_path = os.path.join(spool_dir.name, "vote_buffer.json")
+
+        def apply(answers, feedback):
+            raise RuntimeError("database is locked")
+
+        # Dos workers que cierran a la vez respaldan votos distintos; ambos ya
+        # intentaron vaciar el buffer, por lo que no leen el respaldo del otro
+        buffers = {}
+        for pid, user in ((1001, self.user1), (1002, self.user2)):
+            buffers[pid] = VoteBuffer(
+                apply=apply, spool_path=spool_path, autostart=False
+            )
+            buffers[pid].add_answer(user.pk, self.question.pk, user.pk % 5 + 1)
+            with self.assertRaises(RuntimeError):
+                buffers[pid].flush()
+        for pid, buffer in buffers.items():
+            with patch("os.getpid", return_value=pid), self.assertLogs(
+                "survey.vote_buffer", level="ERROR"
+            ):
+                buffer.stop()
+        self.assertEqual(len(os.listdir(spool_dir.name)), 2)
+
+        buffer = VoteBuffer(
+            apply=QuestionManager.apply_votes, spool_path=spool_path, autostart=False
+        )
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(os.listdir(spool_dir.name), [])
+
+        self.assertEqual(
+            dict(Answer.objects.values_list("author", "value")),
+            {
+                self.user1.pk: self.user1.pk % 5 + 1,
+                self.user2.pk: self.user2.pk % 5 + 1,
+            },
+        )
+
+
+class RecomputeRankingsTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el comando `recompute_rankings`.
+
+    Métodos de prueba:
+    - `test_recompute_rankings`: Verifica que se recalculen contadores y ranking de
+      las preguntas con diferencias, por bloques.
+    - `test_recompute_rankings_dry_run`: Verifica que `--dry-run` no guarde cambios.
+    - `test_recompute_rankings_filters`: Verifica las opciones `--since` e `--ids`.
+    - `test_parallel_matches_serial`: Verifica que el recálculo por rangos de pk en
+      varios procesos guarde lo mismo que el recálculo en serie.
+    - `test_parallel_ranges_follow_existing_pks`: Verifica que los rangos se armen
+      con los pk existentes, sin tareas vacías por los huecos en los ids.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y dos usuarios que votan
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user1 = User.objects.create_user(username="user1", password="testpass")
+        self.user2 = User.objects.create_user(username="user2", password="testpass")
+
+        self.questions = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(5)
+        ]
+        for question in self.questions[:3]:
+            Answer.objects.create(question=question, author=self.user1, value=3)
+            QuestionFeedback.objects.create(
+                question=question, author=self.user2, value="dislike"
+            )
+
+        # Una pregunta antigua no recibe los puntos del día de hoy
+        Question.objects.filter(pk=self.questions[0].pk).update(
+            created=timezone.localdate() - timezone.timedelta(days=2)
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user1.delete()
+        self.user2.delete()
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("recompute_rankings", *args, stdout=out)
+        return out.getvalue()
+
+    def stored_rankings(self):
+        return dict(QuestionScore.objects.values_list("pk", "base_score"))
+
+    def test_recompute_rankings(self):
+        output = self.call("--chunk-size", "2", "--batch-size", "2")
+
+        self.assertIn("Preguntas procesadas: 2/5", output)
+        self.assertIn("Preguntas procesadas: 5/5", output)
+        # Las preguntas sin votos ya tienen el puntaje de su creación
+        self.assertIn("Preguntas actualizadas: 3", output)
+
+        for question in Question.objects.select_related("score"):
+            self.assertEqual(
+                question.score.base_score, QuestionManager.calculate_ranking(question)
+            )
+        self.assertEqual(self.stored_rankings()[self.questions[0].pk], 7)
+        self.assertEqual(self.stored_rankings()[self.questions[4].pk], 10)
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+        # Una segunda ejecución no encuentra cambios
+        self.assertIn("Preguntas actualizadas: 0", self.call())
+
+    def test_recompute_rankings_dry_run(self):
+        output = self.call("--dry-run")
+
+        self.assertIn("Preguntas con cambios (sin guardar): 3", output)
+        self.assertEqual(set(self.stored_rankings().values()), {10})
+
+    def test_recompute_rankings_filters(self):
+        since = timezone.localdate().isoformat()
+        pks = f"{self.questions[0].pk},{self.questions[1].pk}"
+
+        self.assertIn(
+            "Preguntas actualizadas: 1", self.call("--since", since, "--ids", pks)
+        )
+        # La pregunta antigua queda fuera del filtro y conserva el puntaje de su
+        # creación
+        self.assertEqual(self.stored_rankings()[self.questions[0].pk], 10)
+        self.assertEqual(self.stored_rankings()[self.questions[1].pk], 17)
+
+    def test_parallel_matches_serial(self):
+        # Los procesos no ven la base de datos de la prueba, por lo que los rangos se
+        # ejecutan en este proceso con un ejecutor que respeta la misma interfaz
+        class InlineExecutor(ThreadPoolExecutor):
+            def map(self, fn, *iterables):
+                return map(fn, *iterables)
+
+        def corrupt():
+            QuestionScore.objects.update(base_score=-1, answer_count=9)
+
+        corrupt()
+        serial = QuestionManager.recompute_rankings(chunk_size=2)
+        expected = self.stored_rankings()
+
+        corrupt()
+        # Los pk de los límites, tres consultas por cada uno de los tres rangos, un INSERT
+        # de las filas de puntaje que falten, un único UPDATE con todos los cambios
+        # y el UPDATE del ranking con la expresión de la estrategia
+        with self.assertNumQueries(1 + 3 * 3 + 3):
+            parallel = QuestionManager.recompute_rankings(
+                chunk_size=2, workers=3, executor=InlineExecutor()
+            )
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(self.stored_rankings(), expected)
+
+    def test_parallel_ranges_follow_existing_pks(self):
+        class RecordingExecutor(ThreadPoolExecutor):
+            def map(self, fn, queries, starts, ends, days):
+                ranges.extend(zip(starts, ends))
+                return map(fn, queries, starts, ends, days)
+
+        # Un hueco grande entre los ids no agrega rangos vacíos
+        sparse = Question.objects.create(
+            pk=self.questions[-1].pk + 10**6,
+            title="Sparse",
+            description="",
+            author=self.author,
+        )
+        pks = [question.pk for question in self.questions] + [sparse.pk]
+
+        ranges = []
+        QuestionManager.recompute_rankings(
+            chunk_size=2, workers=3, executor=RecordingExecutor()
+        )
+
+        self.assertEqual(
+            ranges, [(pks[0], pks[2]), (pks[2], pks[4]), (pks[4], sparse.pk + 1)]
+        )
+        self.assertEqual(self.stored_rankings().keys(), set(pks))
+
+
+@skipUnless(
+    multiprocessing.get_start_method() == "fork",
+    "Los procesos creados con spawn no heredan la base de datos de la prueba",
+)
+class ParallelRecomputeTestCase(TransactionTestCase):
+    """
+    Clase de pruebas para `recompute_rankings --workers` con procesos reales.
+
+    Los procesos de `ProcessPoolExecutor` no ven la base de pruebas en memoria, por
+    lo que la conexión 'default' se reemplaza por una copia de ella en un archivo
+    SQLite. Los procesos se crean con fork y heredan esa conexión (cerrada) y la
+    configuración; como las escrituras deben ser visibles para ellos, las pruebas no
+    se ejecutan dentro de una transacción.
+
+    Métodos de prueba:
+    - `test_workers_match_serial`: Verifica que el recálculo con `--workers 2` guarde
+      lo mismo que el recálculo en serie.
+    """
+
+    def setUp(self):
+        SurveyTestCase.reset_state()
+
+        # Copia la base de pruebas (con las tablas, sin filas) a un archivo y la usa
+        # como 'default' durante la prueba
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        memory = connections["default"]
+        memory.ensure_connection()
+        path = os.path.join(self.directory.name, "primary.sqlite3")
+        target = sqlite3.connect(path)
+        memory.connection.backup(target)
+        target.close()
+
+        primary = memory.__class__(dict(memory.settings_dict, NAME=path), "default")
+        connections["default"] = primary
+        self.addCleanup(setattr, connections._connections, "default", memory)
+        self.addCleanup(primary.close)
+
+        author = User.objects.create_user(username="author", password="testpass")
+        voter = User.objects.create_user(username="voter", password="testpass")
+        for i in range(7):
+            question = Question.objects.create(
+                title=f"Question {i}", description="", author=author
+            )
+            if i % 2:
+                Answer.objects.create(question=question, author=voter, value=4)
+            if i % 3:
+                QuestionFeedback.objects.create(
+                    question=question, author=voter, value="like"
+                )
+        Question.objects.filter(pk=question.pk).update(
+            created=timezone.localdate() - timezone.timedelta(days=2)
+        )
+
+    def corrupt(self):
+        QuestionScore.objects.update(base_score=-1, answer_count=9, like_count=0)
+
+    def stored_scores(self):
+        return list(
+            QuestionScore.objects.order_by("pk").values_list(
+                "pk", "answer_count", "like_count", "base_score"
+            )
+        )
+
+    def test_workers_match_serial(self):
+        self.corrupt()
+        call_command("recompute_rankings", stdout=StringIO())
+        expected = self.stored_scores()
+
+        self.corrupt()
+        out = StringIO()
+        call_command(
+            "recompute_rankings", "--workers", "2", "--chunk-size", "2", stdout=out
+        )
+
+        self.assertIn("Preguntas procesadas: 7/7", out.getvalue())
+        self.assertIn("Preguntas actualizadas: 7", out.getvalue())
+        self.assertEqual(self.stored_scores(), expected)
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+
+class QuestionScoreTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la tabla `QuestionScore` y el comando
+    `refresh_question_scores`.
+
+    Métodos de prueba:
+    - `test_votes_do_not_write_questions`: Verifica que un voto actualice solo la fila
+      de puntaje y no la de la pregunta.
+    - `test_refresh_only_new_votes`: Verifica que cada ejecución recalcule solo las
+      preguntas con votos posteriores a la anterior.
+    - `test_refresh_new_questions`: Verifica que se recalculen las preguntas nuevas
+      aunque no tengan votos.
+    - `test_vote_creates_missing_score`: Verifica que el voto a una pregunta creada
+      sin su fila de puntaje la cree desde los votos almacenados.
+    - `test_refresh_command`: Verifica el comando y su opción `--since`.
+    - `test_new_question_score`: Verifica que una pregunta nueva se cree con los
+      puntos del día y el puntaje de cada estrategia.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+        self.questions = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(3)
+        ]
+        QuestionManager.sync_vote_counters()
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def refresh(self):
+        # Sin margen, para que los votos ya contados no se vuelvan a contar
+        return QuestionManager.refresh_question_scores(overlap=timezone.timedelta(0))
+
+    def test_votes_do_not_write_questions(self):
+        self.client.login(username="voter", password="testpass")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("survey:question-like"),
+                {"question_pk": self.questions[0].pk, "value": "like"},
+            )
+
+        self.assertEqual(response.json()["ranking"], 15)
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertTrue(updates)
+        for sql in updates:
+            self.assertTrue(sql.startswith('UPDATE "survey_questionscore"'), sql)
+
+    def test_refresh_only_new_votes(self):
+        # La primera ejecución recalcula todas las preguntas
+        Answer.objects.create(question=self.questions[0], author=self.user, value=3)
+        self.assertEqual(self.refresh(), 3)
+        self.assertEqual(self.refresh(), 0)
+
+        score = QuestionScore.objects.get(pk=self.questions[0].pk)
+        self.assertEqual((score.answer_count, score.base_score), (1, 20))
+        self.assertIsNotNone(score.computed_at)
+
+        # Solo se recalcula la pregunta con votos nuevos
+        QuestionFeedback.objects.create(
+            question=self.questions[1], author=self.user, value="dislike"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.refresh(), 1)
+        self.assertFalse([q for q in queries if 'UPDATE "survey_question"' in q["sql"]])
+
+        self.assertEqual(
+            dict(QuestionScore.objects.values_list("pk", "base_score")),
+            {
+                self.questions[0].pk: 20,
+                self.questions[1].pk: 7,
+                self.questions[2].pk: 10,
+            },
+        )
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+    def test_refresh_new_questions(self):
+        self.refresh()
+
+        # Una pregunta nueva todavía no fue recalculada
+        question = Question.objects.create(
+            title="Question 3", description="", author=self.author
+        )
+        self.assertIsNone(QuestionScore.objects.get(pk=question.pk).computed_at)
+
+        self.assertEqual(self.refresh(), 1)
+        self.assertEqual(QuestionScore.objects.get(pk=question.pk).base_score, 10)
+
+    def test_vote_creates_missing_score(self):
+        # Una pregunta creada con bulk_create no tiene su fila de puntaje
+        Question.objects.bulk_create(
+            [Question(title="Question 3", description="", author=self.author)]
+        )
+        question = Question.objects.get(title="Question 3")
+        self.assertFalse(QuestionScore.objects.filter(pk=question.pk).exists())
+
+        # El voto la crea contando los votos almacenados
+        rankings = QuestionManager.apply_votes(answers={(self.user.pk, question.pk): 4})
+        self.assertEqual(rankings, {question.pk: 20})
+        self.assertEqual(QuestionScore.objects.get(pk=question.pk).answer_count, 1)
+        self.assertIn(
+            question.pk, [q.pk for q in QuestionManager.get_ranked_questions(10)]
+        )
+
+    def test_refresh_command(self):
+        out = StringIO()
+        call_command("refresh_question_scores", stdout=out)
+        self.assertIn("Preguntas recalculadas: 3", out.getvalue())
+
+        # Desde una fecha posterior a todos los votos no hay preguntas que recalcular
+        since = (timezone.now() + timezone.timedelta(hours=1)).isoformat()
+        out = StringIO()
+        call_command("refresh_question_scores", "--since", since, stdout=out)
+        self.assertIn("Preguntas recalculadas: 0", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("refresh_question_scores", "--since", "ayer")
+
+    def test_new_question_score(self):
+        score = self.questions[0].score
+        self.assertEqual((score.today_points, score.base_score), (10, 10))
+
+        # Con cada estrategia el puntaje guardado coincide con el del recálculo
+        for name in ("default", "hot", "wilson"):
+            with self.subTest(strategy=name), override_settings(
+                SURVEY_RANKING_STRATEGY=name
+            ):
+                question = Question.objects.create(
+                    title=name, description="", author=self.author
+                )
+                self.assertEqual(question.score.today_points, 10)
+                self.assertIsInstance(question.score.base_score, int)
+                self.assertEqual(
+                    QuestionManager.recompute_rankings(
+                        Question.objects.filter(pk=question.pk), dry_run=True
+                    ),
+                    0,
+                )
+
+
+class RankingRolloverTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el comando `rollover_rankings`.
+
+    Métodos de prueba:
+    - `test_rollover_removes_today_points`: Verifica que se quiten los puntos del día
+      solo a las preguntas de días anteriores, en una única sentencia.
+    - `test_votes_after_rollover`: Verifica que los votos posteriores mantengan el
+      ranking igual al calculado desde los votos.
+    - `test_rebuild_before_rollover`: Verifica que un worker que se reconstruyó al
+      cambiar el día, antes del rollover, se vuelva a reconstruir después.
+    - `test_rollover_uses_local_date`: Verifica que el día se tome de `TIME_ZONE` y
+      no de la fecha UTC.
+    - `test_rollover_command`: Verifica la salida del comando.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+        self.old, self.new = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(2)
+        ]
+        QuestionManager.sync_vote_counters()
+        QuestionManager.apply_votes(
+            answers={(self.user.pk, self.old.pk): 3},
+            feedback={(self.user.pk, self.new.pk): "like"},
+        )
+
+        # La primera pregunta pasa a ser de ayer
+        Question.objects.filter(pk=self.old.pk).update(
+            created=timezone.localdate() - timezone.timedelta(days=1)
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def test_rollover_removes_today_points(self):
+        self.assertEqual(
+            [q.pk for q in QuestionManager.get_leaderboard_questions(2)],
+            [self.old.pk, self.new.pk],
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(QuestionManager.rollover_rankings(), 1)
+
+        for question in Question.objects.select_related("score"):
+            self.assertEqual(
+                question.score.base_score, QuestionManager.calculate_ranking(question)
+            )
+        self.assertEqual(QuestionScore.objects.get(pk=self.old.pk).base_score, 10)
+        self.assertEqual(QuestionScore.objects.get(pk=self.new.pk).base_score, 15)
+
+        # El leaderboard se reconstruye con los nuevos rankings
+        self.assertEqual(
+            [q.pk for q in QuestionManager.get_leaderboard_questions(2)],
+            [self.new.pk, self.old.pk],
+        )
+
+        # Volver a ejecutarlo no tiene efecto
+        self.assertEqual(QuestionManager.rollover_rankings(), 0)
+        self.assertEqual(QuestionScore.objects.get(pk=self.old.pk).base_score, 10)
+
+    def test_votes_after_rollover(self):
+        QuestionManager.rollover_rankings()
+
+        rankings = QuestionManager.apply_votes(
+            feedback={(self.user.pk, self.old.pk): "dislike"}
+        )
+
+        self.assertEqual(rankings, {self.old.pk: 7})
+        self.assertEqual(
+            rankings[self.old.pk],
+            QuestionManager.calculate_ranking(Question.objects.get(pk=self.old.pk)),
+        )
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+    def test_rebuild_before_rollover(self):
+        # Otro worker, con el mismo cache, se reconstruye con el primer request del
+        # día, cuando la primera pregunta todavía tiene los puntos de ayer
+        worker = Leaderboard(
+            loader=QuestionManager.get_top_scores,
+            cache_alias=leaderboard.cache_alias,
+            key_prefix=leaderboard.key_prefix,
+        )
+        self.assertEqual(worker.top(2), [(self.old.pk, 20), (self.new.pk, 15)])
+
+        # Sin la invalidación, basta la fecha publicada por el rollover
+        with patch.object(leaderboard, "invalidate"):
+            QuestionManager.rollover_rankings()
+
+        self.assertEqual(worker.top(2), [(self.new.pk, 15), (self.old.pk, 10)])
+
+    @override_settings(TIME_ZONE="America/Argentina/Buenos_Aires")
+    def test_rollover_uses_local_date(self):
+        # 01:00 UTC del 18 son las 22:00 del 17 en TIME_ZONE (UTC-3)
+        now = datetime.datetime(2026, 10, 18, 1, tzinfo=datetime.timezone.utc)
+        Question.objects.filter(pk=self.old.pk).update(
+            created=datetime.date(2026, 10, 16)
+        )
+        Question.objects.filter(pk=self.new.pk).update(
+            created=datetime.date(2026, 10, 17)
+        )
+
+        with patch("django.utils.timezone.now", return_value=now):
+            # Solo la pregunta de días anteriores pierde los puntos del día
+            self.assertEqual(QuestionManager.rollover_rankings(), 1)
+            self.assertEqual(QuestionScore.objects.get(pk=self.new.pk).today_points, 10)
+
+            # El recálculo tampoco le quita los puntos del día
+            self.assertEqual(
+                QuestionManager.recompute_rankings(
+                    Question.objects.filter(pk=self.new.pk), dry_run=True
+                ),
+                0,
+            )
+
+    def test_rollover_command(self):
+        out = StringIO()
+        call_command("rollover_rankings", stdout=out)
+        self.assertIn("Preguntas actualizadas: 1", out.getvalue())
+
+
+class RankingStrategyTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para las estrategias de ranking de survey/ranking.py.
+
+    Métodos de prueba:
+    - `test_hot_strategy`: Verifica el puntaje "hot" guardado y que una pregunta más
+      nueva supere a una más vieja con los mismos puntos.
+    - `test_wilson_strategy`: Verifica la cota de Wilson guardada sobre los valores
+      de las respuestas.
+    - `test_votes_keep_strategy_score`: Verifica que los votos mantengan el ranking
+      de una estrategia no lineal sin recálculos.
+    - `test_rollover_keeps_strategy_score`: Verifica que el cambio de día no altere
+      un ranking que no usa los puntos del día.
+    - `test_switch_strategy`: Verifica que el recálculo guarde el ranking de la nueva
+      estrategia y reordene el leaderboard.
+    - `test_compare_strategy`: Verifica el orden por la expresión de otra estrategia
+      en una única consulta, sin cambiar el ranking guardado.
+    - `test_get_strategy`: Verifica la búsqueda de estrategias por nombre y por ruta.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de las preguntas y tres usuarios que votan
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.users = [
+            User.objects.create_user(username=f"voter{i}", password="testpass")
+            for i in range(3)
+        ]
+        self.old, self.new, self.empty = [
+            Question.objects.create(
+                title=f"Question {i}", description="", author=self.author
+            )
+            for i in range(3)
+        ]
+        self.yesterday = timezone.localdate() - timezone.timedelta(days=1)
+        Question.objects.filter(pk=self.old.pk).update(created=self.yesterday)
+        QuestionManager.sync_vote_counters()
+
+        # La pregunta de ayer tiene tres respuestas altas; la de hoy, una sola de 5
+        QuestionManager.apply_votes(
+            answers={
+                (self.users[0].pk, self.old.pk): 5,
+                (self.users[1].pk, self.old.pk): 5,
+                (self.users[2].pk, self.old.pk): 4,
+                (self.users[0].pk, self.new.pk): 5,
+            }
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        for user in self.users:
+            user.delete()
+
+    def hot(self, points, created):
+        # Puntaje "hot" de HotRanking con sus parámetros por defecto
+        order = math.log10(max(abs(points), 1))
+        sign = (points > 0) - (points < 0)
+        age = (created - datetime.date(2020, 1, 1)).days
+
+        return round(1000 * (sign * order + age))
+
+    def wilson(self, values, z=1.96):
+        # Cota inferior de Wilson de WilsonRanking con sus parámetros por defecto
+        n = len(values)
+        if not n:
+            return 0
+        p = (sum(values) - n) / (4 * n)
+        center = p + z * z / (2 * n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+
+        return round(1000 * (center - margin) / (1 + z * z / n))
+
+    def stored_rankings(self):
+        return {
+            pk: ranking
+            for pk, (ranking, _) in QuestionManager.get_question_scores(
+                [self.old.pk, self.new.pk, self.empty.pk]
+            ).items()
+        }
+
+    def test_hot_strategy(self):
+        with override_settings(SURVEY_RANKING_STRATEGY="hot"):
+            QuestionManager.recompute_rankings()
+
+        today = timezone.localdate()
+        self.assertEqual(
+            self.stored_rankings(),
+            {
+                self.old.pk: self.hot(30, self.yesterday),
+                self.new.pk: self.hot(10, today),
+                self.empty.pk: self.hot(0, today),
+            },
+        )
+        # Un día de antigüedad equivale a diez veces menos puntos
+        self.assertEqual(self.stored_rankings()[self.old.pk], self.hot(3, today))
+
+    def test_wilson_strategy(self):
+        with override_settings(SURVEY_RANKING_STRATEGY="wilson"):
+            QuestionManager.recompute_rankings()
+
+        rankings = self.stored_rankings()
+        self.assertEqual(
+            rankings,
+            {
+                self.old.pk: self.wilson([5, 5, 4]),
+                self.new.pk: self.wilson([5]),
+                self.empty.pk: 0,
+            },
+        )
+        # Tres respuestas altas superan a una sola respuesta de 5
+        self.assertGreater(rankings[self.old.pk], rankings[self.new.pk])
+
+    @override_settings(SURVEY_RANKING_STRATEGY="wilson")
+    def test_votes_keep_strategy_score(self):
+        QuestionManager.recompute_rankings()
+
+        rankings = QuestionManager.apply_votes(
+            answers={
+                (self.users[1].pk, self.new.pk): 2,
+                (self.users[2].pk, self.old.pk): 0,
+            }
+        )
+
+        self.assertEqual(
+            rankings,
+            {self.old.pk: self.wilson([5, 5]), self.new.pk: self.wilson([5, 2])},
+        )
+        self.assertEqual(QuestionManager.recompute_rankings(dry_run=True), 0)
+        self.assertFalse(QuestionManager.get_vote_counter_drift().exists())
+
+    @override_settings(SURVEY_RANKING_STRATEGY="hot")
+    def test_rollover_keeps_strategy_score(self):
+        QuestionManager.recompute_rankings()
+        stored = self.stored_rankings()
+
+        tomorrow = timezone.localdate() + timezone.timedelta(days=1)
+        self.assertEqual(QuestionManager.rollover_rankings(tomorrow), 2)
+
+        # El ranking "hot" no usa los puntos del día
+        self.assertEqual(self.stored_rankings(), stored)
+        self.assertFalse(QuestionScore.objects.filter(today_points__gt=0).exists())
+
+    def test_switch_strategy(self):
+        self.assertEqual(
+            [q.pk for q in QuestionManager.get_leaderboard_questions(3)],
+            [self.old.pk, self.new.pk, self.empty.pk],
+        )
+
+        with override_settings(SURVEY_RANKING_STRATEGY="hot"):
+            out = StringIO()
+            call_command("recompute_rankings", stdout=out)
+            self.assertIn("Preguntas actualizadas: 3", out.getvalue())
+
+            self.assertEqual(
+                [q.pk for q in QuestionManager.get_leaderboard_questions(3)],
+                [self.new.pk, self.old.pk, self.empty.pk],
+            )
+            self.assertEqual(QuestionManager.recompute_rankings(dry_run=True), 0)
+
+    def test_compare_strategy(self):
+        stored = self.stored_rankings()
+
+        with self.assertNumQueries(1):
+            questions = QuestionManager.get_ranked_questions(3, strategy="hot")
+
+        self.assertEqual(
+            [q.pk for q in questions], [self.new.pk, self.old.pk, self.empty.pk]
+        )
+        self.assertEqual(questions[0].ranking, self.hot(10, timezone.localdate()))
+        self.assertEqual(self.stored_rankings(), stored)
+
+    def test_get_strategy(self):
+        self.assertIsInstance(get_strategy(), PointsRanking)
+        self.assertIsInstance(get_strategy("wilson"), WilsonRanking)
+        self.assertIsInstance(get_strategy("survey.ranking.HotRanking"), HotRanking)
+
+        with override_settings(SURVEY_RANKING_STRATEGY="hot"):
+            self.assertIsInstance(get_strategy(), HotRanking)
+
+        with self.assertRaises(ValueError):
+            get_strategy("unknown")
+
+
+class QueryPlanTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para los planes de ejecución de las consultas principales.
+
+    Ejecuta cada consulta, la pasa por `EXPLAIN QUERY PLAN` de SQLite y verifica el
+    índice elegido, de modo que un cambio en las consultas no vuelva en silencio a
+    recorrer las tablas completas.
+
+    Métodos de prueba:
+    - `test_ranking_uses_index`: Verifica que el listado y el leaderboard lean el
+      índice del ranking sin ordenar en memoria.
+    - `test_vote_counts_use_index`: Verifica que los conteos de votos usen los
+      índices (pregunta, valor).
+    - `test_user_votes_use_index`: Verifica que los votos de un usuario se busquen
+      por índice.
+    - `test_user_questions_use_index`: Verifica que las preguntas de un usuario se
+      lean en el orden del índice (autor, fecha).
+    - `test_ranked_page_uses_index`: Verifica que una página por cursor sea una
+      búsqueda por rango en el índice del ranking.
+    - `test_rollover_uses_index`: Verifica que el cambio de día lea solo el índice
+      parcial de las preguntas con puntos del día.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea el autor de la pregunta y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+
+        self.question = Question.objects.create(
+            title="Question", description="", author=self.author
+        )
+        Answer.objects.create(question=self.question, author=self.user, value=3)
+        QuestionFeedback.objects.create(
+            question=self.question, author=self.user, value="like"
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def query_plans(self, function):
+        # Planes de ejecución de las consultas que ejecuta `function`
+        with CaptureQueriesContext(connection) as context:
+            function()
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if not query["sql"].startswith(("SELECT", "DELETE", "UPDATE")):
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plans.append((query["sql"], [row[-1] for row in cursor.fetchall()]))
+
+        return plans
+
+    def assertPlanUses(self, plans, table, index):
+        # Alguna consulta usa el índice, y ninguna recorre la tabla completa ni
+        # ordena en memoria
+        details = [detail for _, plan in plans for detail in plan]
+        self.assertTrue(
+            any(f"{table} USING" in d and index in d for d in details), details
+        )
+        for detail in details:
+            self.assertNotEqual(detail, f"SCAN {table}")
+            self.assertNotIn("TEMP B-TREE FOR ORDER BY", detail)
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_ranking_uses_index(self):
+        plans = self.query_plans(
+            lambda: (
+                list(QuestionManager.get_top_scores(10)),
+                list(QuestionManager.get_ranked_questions(20)),
+            )
+        )
+
+        self.assertEqual(len(plans), 2)
+        self.assertPlanUses(plans, "survey_questionscore", "question_score_idx")
+
+        # El leaderboard solo lee el índice de QuestionScore, sin joins
+        sql, plan = plans[0]
+        self.assertNotIn("JOIN", sql)
+        self.assertEqual(len(plan), 1)
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_vote_counts_use_index(self):
+        plans = self.query_plans(
+            lambda: QuestionManager.get_vote_counts([self.question.pk])
+        )
+        self.assertPlanUses(plans, "survey_answer", "answer_question_value_idx")
+        self.assertPlanUses(
+            plans, "survey_questionfeedback", "feedback_question_value_idx"
+        )
+
+        plans = self.query_plans(
+            lambda: QuestionManager.calculate_ranking(self.question)
+        )
+        self.assertPlanUses(plans, "survey_answer", "answer_question_value_idx")
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_user_votes_use_index(self):
+        # El overlay busca por (pregunta, autor), cubierto por la restricción única
+        plans = self.query_plans(
+            lambda: QuestionManager.get_user_overlay(self.user, [self.question.pk])
+        )
+        self.assertPlanUses(plans, "survey_answer", "survey_answer")
+        self.assertPlanUses(plans, "survey_questionfeedback", "survey_questionfeedback")
+
+        # Los votos de un usuario sin filtrar por pregunta, por ejemplo al
+        # eliminarlo, usan el índice (autor, pregunta)
+        plans = self.query_plans(
+            lambda: (
+                list(Answer.objects.filter(author=self.user)),
+                list(QuestionFeedback.objects.filter(author=self.user)),
+            )
+        )
+        self.assertPlanUses(plans, "survey_answer", "answer_author_question_idx")
+        self.assertPlanUses(
+            plans, "survey_questionfeedback", "feedback_author_question_idx"
+        )
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_user_questions_use_index(self):
+        self.client.login(username="author", password="testpass")
+
+        plans = self.query_plans(
+            lambda: self.client.get(reverse("survey:question-edit-list"))
+        )
+        plans = [(sql, plan) for sql, plan in plans if "survey_question" in sql]
+
+        self.assertPlanUses(plans, "survey_question", "question_author_created_idx")
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_ranked_page_uses_index(self):
+        Question.objects.create(title="Question 2", description="", author=self.author)
+        page = QuestionManager.get_ranked_page(per_page=1)
+        question = page.object_list[0]
+
+        plans = self.query_plans(
+            lambda: (
+                QuestionManager.get_ranked_page(
+                    page.paginator.cursor(question, "next")
+                ),
+                QuestionManager.get_ranked_page(
+                    page.paginator.cursor(question, "previous")
+                ),
+            )
+        )
+
+        self.assertEqual(len(plans), 2)
+        self.assertPlanUses(
+            plans, "survey_questionscore", "question_score_idx (base_score"
+        )
+
+    @skipUnlessDBFeature("supports_explaining_query_execution")
+    def test_rollover_uses_index(self):
+        plans = self.query_plans(QuestionManager.rollover_rankings)
+
+        details = [detail for _, plan in plans for detail in plan]
+        self.assertTrue(any("question_score_today_idx" in d for d in details), details)
+
+
+class KeysetPaginationTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la paginación por cursor del listado principal y de las
+    preguntas del usuario.
+
+    Métodos de prueba:
+    - `test_ranked_pages`: Verifica que las páginas siguientes y anteriores recorran
+      todas las preguntas en orden de ranking, sin repetir ni omitir ninguna.
+    - `test_anonymous_pages`: Verifica que solo la primera página anónima se cachee.
+    - `test_user_question_pages`: Verifica la paginación de las preguntas del usuario
+      por fecha de creación.
+    - `test_invalid_cursor`: Verifica que un cursor alterado devuelva 404.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea un autor con 45 preguntas, con rankings y fechas repetidos
+        self.author = User.objects.create_user(username="author", password="testpass")
+        Question.objects.bulk_create(
+            Question(title=f"Question {i}", description="", author=self.author)
+            for i in range(45)
+        )
+        today = timezone.localdate()
+        for i, question in enumerate(Question.objects.all()):
+            Question.objects.filter(pk=question.pk).update(
+                created=today - timezone.timedelta(days=i % 3)
+            )
+            QuestionScore.objects.create(question=question, base_score=(i % 4) * 10)
+
+        self.client.login(username="author", password="testpass")
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+
+    def walk(self, url):
+        # Recorre las páginas hacia adelante y luego hacia atrás
+        def pks(response):
+            return [question.pk for question in response.context["questions"]]
+
+        response = self.client.get(url)
+        forward, backward = [pks(response)], []
+        page = response.context["page_obj"]
+        while page.has_next:
+            response = self.client.get(url, {"cursor": page.next_cursor})
+            forward.append(pks(response))
+            page = response.context["page_obj"]
+
+        while page.has_previous:
+            response = self.client.get(url, {"cursor": page.previous_cursor})
+            backward.insert(0, pks(response))
+            page = response.context["page_obj"]
+
+        return forward, backward
+
+    def test_ranked_pages(self):
+        forward, backward = self.walk(reverse("survey:question-list"))
+
+        expected = list(
+            QuestionScore.objects.order_by("-base_score", "pk").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual([len(page) for page in forward], [20, 20, 5])
+        self.assertEqual(sum(forward, []), expected)
+        self.assertEqual(backward, forward[:-1])
+
+        response = self.client.get(reverse("survey:question-list"))
+        self.assertContains(response, "Siguiente")
+        self.assertNotContains(response, "Anterior")
+
+    def test_anonymous_pages(self):
+        self.client.logout()
+
+        response = self.client.get(reverse("survey:question-list"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        cursor = response.context["page_obj"].next_cursor
+
+        response = self.client.get(reverse("survey:question-list"), {"cursor": cursor})
+        self.assertNotIn("X-Page-Cache", response)
+        self.assertEqual(len(response.context["questions"]), 20)
+        self.assertContains(response, "Anterior")
+
+    def test_user_question_pages(self):
+        forward, backward = self.walk(reverse("survey:question-edit-list"))
+
+        expected = list(
+            Question.objects.order_by("-created", "pk").values_list("pk", flat=True)
+        )
+        self.assertEqual([len(page) for page in forward], [20, 20, 5])
+        self.assertEqual(sum(forward, []), expected)
+        self.assertEqual(backward, forward[:-1])
+
+    def test_invalid_cursor(self):
+        for url in ("survey:question-list", "survey:question-edit-list"):
+            response = self.client.get(reverse(url), {"cursor": "invalido"})
+            self.assertEqual(response.status_code, 404)
+
+
+class QuestionDescriptionTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la carga diferida de la descripción de las preguntas.
+
+    Métodos de prueba:
+    - `test_lists_do_not_load_description`: Verifica que los listados no lean ni
+      rendericen la descripción de las preguntas.
+    - `test_description_endpoint`: Verifica la descripción devuelta por el endpoint
+      `question-description` y su `Cache-Control` público.
+    - `test_description_not_found`: Verifica el error para una pregunta inexistente.
+    - `test_description_invalid_pk`: Verifica el error para un pk que no entra en un
+      entero de 64 bits.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea un autor con una pregunta con descripción
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.question = Question.objects.create(
+            title="Pregunta",
+            description="Descripción larga de la pregunta",
+            author=self.author,
+        )
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+
+    def test_lists_do_not_load_description(self):
+        self.client.login(username="author", password="testpass")
+        description_url = reverse(
+            "survey:question-description", kwargs={"pk": self.question.pk}
+        )
+
+        for url in ("survey:question-list", "survey:question-edit-list"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(url))
+
+            self.assertContains(response, "Pregunta")
+            self.assertContains(response, description_url)
+            self.assertNotContains(response, self.question.description)
+            for query in queries.captured_queries:
+                self.assertNotIn('"description"', query["sql"])
+
+    def test_description_endpoint(self):
+        url = reverse("survey:question-description", kwargs={"pk": self.question.pk})
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": True, "description": self.question.description},
+        )
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=300", response["Cache-Control"])
+
+    def test_description_not_found(self):
+        pk = self.question.pk + 1
+        response = self.client.get(
+            reverse("survey:question-description", kwargs={"pk": pk})
+        )
+
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": False, "error": f"Pregunta no encontrada: {pk}"},
+        )
+
+    def test_description_invalid_pk(self):
+        pk = int("1" * 25)
+        response = self.client.get(
+            reverse("survey:question-description", kwargs={"pk": pk})
+        )
+
+        self.assertJSONEqual(
+            str(response.content, encoding="utf8"),
+            {"ok": False, "error": f"Pregunta invalida: {pk}"},
+        )
+
+
+class WarmupTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para el calentamiento del proceso (`SurveyConfig.warm_up`) con la
+    configuración de producción.
+
+    Métodos de prueba:
+    - `test_warm_up`: Verifica que las plantillas queden compiladas en el loader
+      cacheado y que el leaderboard quede cargado sin consultas pendientes.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Crea un autor con una pregunta
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.question = Question.objects.create(
+            title="Pregunta", description="", author=self.author
+        )
+        QuestionScore.objects.filter(pk=self.question.pk).update(base_score=10)
+
+        # Carga la configuración de producción con una clave de prueba
+        with patch.dict(os.environ, {"DJANGO_SECRET_KEY": "test"}):
+            self.production = import_module("quizes.settings_production")
+
+    def tearDown(self):
+        # Elimina las instancias
+        self.author.delete()
+
+    def test_warm_up(self):
+        with override_settings(
+            TEMPLATES=self.production.TEMPLATES,
+            SURVEY_WARMUP_TEMPLATES=self.production.SURVEY_WARMUP_TEMPLATES,
+        ):
+            apps.get_app_config("survey").warm_up()
+
+            loader = engines["django"].engine.template_loaders[0]
+            for name in self.production.SURVEY_WARMUP_TEMPLATES:
+                self.assertIn(name, loader.get_template_cache)
+
+            with self.assertNumQueries(0):
+                self.assertEqual(leaderboard.top(20), [(self.question.pk, 10)])
+
+
+class ProductionCacheTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para los caches compartidos de la configuración de producción.
+
+    Cada alias de la configuración se instancia dos veces sobre el mismo archivo,
+    con conexiones propias, como lo harían dos workers.
+
+    Métodos de prueba:
+    - `test_shared_backends`: Verifica que ambos alias usen el cache compartido.
+    - `test_workers_share_leaderboard`: Verifica que dos leaderboards vean las
+      actualizaciones e invalidaciones del otro.
+    - `test_workers_share_page_generation`: Verifica que dos caches de páginas usen
+      la misma generación.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        with patch.dict(os.environ, {"DJANGO_SECRET_KEY": "test"}):
+            self.production = import_module("quizes.settings_production")
+
+        # Cada alias de producción, en un directorio temporal, como dos workers
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        caches_settings = {}
+        for alias, config in self.production.CACHES.items():
+            config = dict(
+                config,
+                LOCATION=os.path.join(
+                    directory.name, os.path.basename(config["LOCATION"])
+                ),
+            )
+            caches_settings[alias] = config
+            for worker in ("worker1", "worker2"):
+                caches_settings[f"{alias}-{worker}"] = config
+        settings = override_settings(CACHES=caches_settings)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_shared_backends(self):
+        for config in self.production.CACHES.values():
+            self.assertEqual(config["BACKEND"], "quizes.cache.SQLiteCache")
+
+    def test_workers_share_leaderboard(self):
+        scores = {1: 10, 2: 20}
+
+        def loader(limit):
+            rows = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(pk, score, 0) for pk, score in rows[:limit]]
+
+        worker1, worker2 = [
+            Leaderboard(loader, cache_alias=f"default-{worker}", key_prefix="test:prod")
+            for worker in ("worker1", "worker2")
+        ]
+        self.assertEqual(worker1.top(2), [(2, 20), (1, 10)])
+        self.assertEqual(worker2.top(2), [(2, 20), (1, 10)])
+
+        worker1.update(1, 30, 1)
+        self.assertEqual(worker2.top(2), [(1, 30), (2, 20)])
+        worker2.remove(1)
+        self.assertEqual(worker1.top(2), [(2, 20)])
+
+        # Una invalidación (por ejemplo, de un comando) reconstruye el otro worker
+        scores[3] = 50
+        worker2.invalidate()
+        self.assertEqual(worker1.top(2), [(3, 50), (2, 20)])
+
+    def test_workers_share_page_generation(self):
+        worker1, worker2 = [
+            PageCache(cache_alias=f"pages-{worker}")
+            for worker in ("worker1", "worker2")
+        ]
+        self.assertEqual(worker1.generation(), worker2.generation())
+
+        generation = worker1.bump()
+        self.assertEqual(worker2.generation(), generation)
+
+
+class SQLiteProfileTestCase(SurveyTestCase):
+    """
+    Clase de pruebas para la configuración de SQLite de producción.
+
+    Métodos de prueba:
+    - `test_pragmas_applied_to_new_connections`: Verifica que el receptor de
+      `connection_created` aplique `SURVEY_SQLITE_PRAGMAS`.
+    - `test_immediate_transactions`: Verifica que el backend `quizes.backends.sqlite3`
+      tome el lock de escritura al iniciar la transacción.
+    """
+
+    @override_settings(SURVEY_SQLITE_PRAGMAS={"cache_size": -4000, "busy_timeout": 250})
+    def test_pragmas_applied_to_new_connections(self):
+        set_sqlite_pragmas(sender=None, connection=connection)
+
+        with connection.cursor() as cursor:
+            self.assertEqual(cursor.execute("PRAGMA cache_size").fetchone(), (-4000,))
+            self.assertEqual(cursor.execute("PRAGMA busy_timeout").fetchone(), (250,))
+
+    def test_immediate_transactions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, "db.sqlite3")
+            wrapper = load_backend("quizes.backends.sqlite3").DatabaseWrapper(
+                dict(connection.settings_dict, NAME=name), "immediate"
+            )
+            other = sqlite3.connect(name, timeout=0, isolation_level=None)
+
+            # Sin escribir nada, la transacción ya bloquea a otros escritores
+            wrapper._start_transaction_under_autocommit()
+            with self.assertRaisesMessage(sqlite3.OperationalError, "locked"):
+                other.execute("BEGIN IMMEDIATE")
+
+            wrapper.cursor().execute("ROLLBACK")
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+            other.close()
+            wrapper.close()
+
+
+@override_settings(SURVEY_READ_DATABASE="replica")
+class ReadReplicaTestCase(TransactionTestCase):
+    """
+    Clase de pruebas para el enrutamiento de lecturas a la réplica.
+
+    La base de pruebas hace de base principal y un archivo SQLite, copiado desde ella
+    con la API de backup de SQLite, hace de réplica. Como la copia solo ve los datos
+    confirmados, las pruebas no se ejecutan dentro de una transacción.
+
+    Métodos de prueba:
+    - `test_lists_read_from_replica`: Verifica que los listados lean de la réplica
+      hasta que se copian los cambios de la principal.
+    - `test_vote_reads_own_writes`: Verifica que después de votar el usuario lea de la
+      principal y vea su voto, mientras que los demás siguen leyendo de la réplica.
+    - `test_writes_go_to_primary`: Verifica que las escrituras y las migraciones no
+      usen la réplica.
+    - `test_leaderboard_rebuilds_from_primary`: Verifica que el leaderboard
+      reconstruido en una vista de lectura cargue de la principal aunque la réplica
+      esté atrasada.
+    """
+
+    def setUp(self):
+        SurveyTestCase.reset_state()
+
+        # Crea el autor de las preguntas y un usuario que vota
+        self.author = User.objects.create_user(username="author", password="testpass")
+        self.user = User.objects.create_user(username="voter", password="testpass")
+        self.question = Question.objects.create(
+            title="Pregunta copiada", description="", author=self.author
+        )
+        QuestionScore.objects.filter(pk=self.question.pk).update(base_score=10)
+
+        # Registra la réplica sobre un archivo temporal y copia la base principal
+        self.directory = tempfile.TemporaryDirectory()
+        connections.databases["replica"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.path.join(self.directory.name, "replica.sqlite3"),
+        }
+        self.copy_to_replica()
+
+    def tearDown(self):
+        connections["replica"].close()
+        del connections.databases["replica"]
+        delattr(connections._connections, "replica")
+        self.directory.cleanup()
+
+        # Elimina las instancias
+        self.author.delete()
+        self.user.delete()
+
+    def copy_to_replica(self):
+        replica = connections["replica"]
+        replica.ensure_connection()
+        connection.ensure_connection()
+        connection.connection.backup(replica.connection)
+
+    def test_leaderboard_rebuilds_from_primary(self):
+        # Se carga el leaderboard con la réplica al día
+        self.assertEqual(leaderboard.top(1), [(self.question.pk, 10)])
+
+        # Una pregunta nueva en la principal invalida el leaderboard (como un
+        # recálculo), pero la réplica todavía no tiene la pregunta
+        question = Question.objects.create(
+            title="Pregunta nueva", description="", author=self.author
+        )
+        QuestionScore.objects.filter(pk=question.pk).update(base_score=20)
+        leaderboard.invalidate()
+
+        self.assertEqual(
+            self.client.get(reverse("survey:question-list")).status_code, 200
+        )
+        self.assertEqual(
+            leaderboard.top(2), [(question.pk, 20), (self.question.pk, 10)]
+        )
+
+    def test_lists_read_from_replica(self):
+        question = Question.objects.create(
+            title="Pregunta nueva", description="", author=self.author
+        )
+        QuestionScore.objects.filter(pk=question.pk).update(base_score=20)
+        self.client.login(username="author", password="testpass")
+
+        for url in ("survey:question-list", "survey:question-edit-list"):
+            response = self.client.get(reverse(url))
+            self.assertContains(response, "Pregunta copiada")
+            self.assertNotContains(response, "Pregunta nueva")
+
+        self.copy_to_replica()
+        for url in ("survey:question-list", "survey:question-edit-list"):
+            self.assertContains(self.client.get(reverse(url)), "Pregunta nueva")
+
+    def test_vote_reads_own_writes(self):
+        voter = Client()
+        voter.login(username="voter", password="testpass")
+
+        response = voter.post(
+            reverse("survey:question-answer"),
+            {"question_pk": self.question.pk, "value": 4},
+        )
+        self.assertEqual(response.cookies[STICKY_COOKIE]["max-age"], 5)
+
+        # El usuario que votó lee su voto desde la principal
+        response = voter.get(reverse("survey:question-list"))
+        self.assertEqual(response.context["questions"][0].answer, 4)
+        response = voter.get(
+            reverse("survey:question-overlay"), {"pks": str(self.question.pk)}
+        )
+        self.assertEqual(
+            response.json()["questions"][str(self.question.pk)]["answer"], 4
+        )
+
+        # Sin la cookie, la réplica todavía no tiene el voto
+        voter.cookies.pop(STICKY_COOKIE)
+        response = voter.get(reverse("survey:question-list"))
+        self.assertEqual(response.context["questions"][0].answer, 0)
+
+        self.copy_to_replica()
+        response = voter.get(reverse("survey:question-list"))
+        self.assertEqual(response.context["questions"][0].answer, 4)
+
+    def test_writes_go_to_primary(self):
+        router = ReadReplicaRouter()
+
+        self.assertEqual(router.db_for_write(Question), "default")
+        self.assertIsNone(router.db_for_read(Question))
+        self.assertFalse(router.allow_migrate("replica", "survey"))
+        self.assertIsNone(router.allow_migrate("default", "survey"))
@@ -6,7 +6,12 @@ from survey.views import (QuestionListView,
                           UserQuestionListView,
                           QuestionDeleteView,
                           answer_question,
-                          like_dislike_question)
+                          bulk_vote_questions,
+                          like_dislike_question,
+                          question_description,
+                          question_overlay,
+                          ranked_questions_api,
+                          ranked_questions_fragment)
 
 urlpatterns = [
     path('', QuestionListView.as_view(), name='question-list'),
@@ -16,6 +21,11 @@ urlpatterns = [
     path('question/delete/<int:pk>', QuestionDeleteView.as_view(), name='question-delete'),
     path('question/answer', answer_question, name='question-answer'),
     path('question/like', like_dislike_question, name='question-like'),
+    path('question/bulk-vote', bulk_vote_questions, name='question-bulk-vote'),
+    path('question/ranked', ranked_questions_fragment, name='question-ranked'),
+    path('question/overlay', question_overlay, name='question-overlay'),
+    path('question/description/<int:pk>', question_description, name='question-description'),
+    path('api/questions/ranked', ranked_questions_api, name='api-questions-ranked'),
 
 
 ]
\ No newline at end of file
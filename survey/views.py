@@ -8,6 +8,19 @@ Vistas Funcionales:
     - answer_question(request): Permite a los usuarios votar o responder preguntas.
     - like_dislike_question(request): Maneja la retroalimentación positiva o negativa a preguntas.
 
+    Ambas devuelven un JSON compacto con el nuevo ranking de la pregunta y el estado
+    del voto del usuario, que el listado usa para actualizar la página. Con
+    `SURVEY_VOTE_BUFFER` los votos se encolan y se guardan en lotes (survey/vote_buffer.py).
+    - bulk_vote_questions(request): Registra varios votos del usuario en una sola
+      transacción.
+    - ranked_questions_fragment(request): Devuelve el listado sin estado del usuario,
+      cacheable por cualquier capa.
+    - question_overlay(request): Devuelve los votos del usuario para varias preguntas.
+    - question_description(request, pk): Devuelve la descripción de una pregunta, que
+      los listados cargan solo al pasar el cursor o expandir la pregunta.
+    - ranked_questions_api(request): API JSON de las preguntas mejor clasificadas con
+      ETag y GET condicional.
+
 Vistas Basadas en Clases:
     - QuestionListView(ListView): Muestra una lista de preguntas ordenadas por ranking.
     - QuestionCreateView(CreateView): Permite a los usuarios crear nuevas preguntas.
@@ -19,22 +32,64 @@ Vistas Basadas en Clases:
 Funciones Auxiliares:
     - calculate_ranking(question): Calcula el ranking de una pregunta basándose en respuestas 
       y retroalimentación.
-    - get_ranked_questions(n): Obtiene las preguntas mejor clasificadas.
+    - ranking_expression(): Expresión SQL del ranking de la estrategia configurada
+      (survey/ranking.py), guardado en `QuestionScore`.
+    - recompute_rankings(questions): Recalcula el ranking guardado por bloques.
+    - update_vote_counters(question_pk, ...): Actualiza los contadores de votos.
+    - sync_vote_counters(questions): Recalcula los contadores desde los votos.
+    - refresh_question_scores(since): Recalcula solo las preguntas con votos nuevos.
+    - rollover_rankings(today): Quita los puntos del día a las preguntas de ayer.
+    - get_ranked_questions(n, strategy): Obtiene las preguntas mejor clasificadas.
+    - get_leaderboard_questions(n): Obtiene las mejores preguntas desde el leaderboard.
     - get_serialized_questions(questions): Serializa las preguntas para su presentación.
 
 """
 
+import json
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
-from django.shortcuts import redirect
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.views.decorators.http import require_POST
+from django.utils.cache import patch_cache_control
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from django.views.generic.list import ListView
 
-from survey.models import Answer, Question, QuestionFeedback
+from survey.leaderboard import Leaderboard
+from survey.models import Answer, Question, QuestionFeedback, QuestionScore
+from survey.page_cache import PageCache
+from survey.pagination import InvalidCursor, KeysetPaginator
+from survey.ranking import SCORE_FIELDS, PointsRanking, get_strategy, score_fields
+from survey.records import QuestionRecord
+from survey.vote_buffer import VoteBuffer
 
 
 class QuestionListView(ListView):
@@ -42,16 +97,24 @@ class QuestionListView(ListView):
     Vista basada en clase para mostrar una lista de preguntas clasificadas por ranking.
 
     Esta vista utiliza la clase QuestionManager para obtener y mostrar preguntas ordenadas
-    por ranking. También agrega información sobre las respuestas y feedback de un usuario
+    por ranking desde el leaderboard en memoria. También agrega información sobre las respuestas y feedback de un usuario
     autenticado.
 
+    El listado se pagina por cursor (parámetro `cursor`): la primera página sale del
+    leaderboard y las siguientes de una búsqueda por rango sobre (ranking, pk).
+
     Atributos:
         - model (Question): El modelo de datos utilizado por la vista (Question).
         - template_name (str): La plantilla HTML utilizada para renderizar la vista.
 
     Métodos:
+        - `get(request)`: Para usuarios anónimos sirve la página desde el cache de
+          páginas versionado por generación.
+        - `render_questions_html()`: Renderiza el listado de preguntas sin el estado
+          del usuario.
         - `get_context_data(**kwargs)`: Obtiene el contexto para renderizar la plantilla,
-          incluyendo preguntas, respuestas y feedback.
+          incluyendo preguntas, respuestas y feedback. Con `SURVEY_LIST_OVERLAY` el
+          listado se toma del cache sin estado del usuario.
 
     Parámetros:
         - **kwargs: Argumentos adicionales.
@@ -64,40 +127,71 @@ class QuestionListView(ListView):
     model = Question
     template_name = "survey/question_list.html"
 
+    def get(self, request, *args, **kwargs):
+        # Solo la primera página de los usuarios anónimos se cachea
+        if request.user.is_authenticated or request.GET.get("cursor"):
+            return super().get(request, *args, **kwargs)
+
+        # La página es igual para todos los usuarios anónimos, por lo que se sirve
+        # desde el cache hasta que cambie la generación del leaderboard.
+        # El token CSRF se envía en la cookie, también en los aciertos del cache
+        get_token(request)
+
+        def render():
+            return super(QuestionListView, self).get(request, *args, **kwargs).render()
+
+        return page_cache.get_or_render("question-list", render)
+
+    @staticmethod
+    def render_questions_html():
+        # Renderiza la primera página del listado sin estado del usuario, igual
+        # para todos
+        page = QuestionManager.get_ranked_page()
+
+        return render_to_string(
+            "survey/question_cards.html",
+            {
+                "questions": page.object_list,
+                "page_obj": page,
+            },
+        )
+
     def get_context_data(self, **kwargs):
+        cursor = self.request.GET.get("cursor")
+
+        # En modo overlay el listado se comparte entre usuarios desde el cache y
+        # el navegador aplica los votos del usuario con question_overlay
+        if getattr(settings, "SURVEY_LIST_OVERLAY", False) and not cursor:
+            return {
+                "questions_html": mark_safe(
+                    page_cache.get_or_render_fragment(
+                        "question-cards", self.render_questions_html
+                    )
+                )
+            }
+
         # Personaliza el contexto qeu se envía al front-end
         context = {"questions": []}
         user = self.request.user
 
-        question_manager = QuestionManager()
-        questions = question_manager.get_ranked_questions(20)
-        serialized_questions = question_manager.get_serialized_questions(questions)
+        try:
+            page = QuestionManager.get_ranked_page(cursor)
+        except InvalidCursor:
+            raise Http404("Cursor invalido")
+        questions = page.object_list
 
         # Agrega las respuestas a cada pregunta
         # Si el usuario está autenticado se muestra el contenido usado
         # en los botones de rating y like/dislike
         if user.is_authenticated:
-            for question in serialized_questions:
-                answers = Answer.objects.filter(
-                    question_id=question["pk"], author=user
-                ).values("value")
-
-                if answers.exists():
-                    question["answer"] = answers[0].get("value")
-                else:
-                    question["answer"] = 0
+            overlay = QuestionManager.get_user_overlay(
+                user, [question.pk for question in questions]
+            )
+            for question in questions:
+                question.set_votes(**overlay[question.pk])
 
-                feedback = QuestionFeedback.objects.filter(
-                    question_id=question["pk"], author=user
-                ).values("value")
-
-                if feedback.exists():
-                    if feedback[0].get("value") == "like":
-                        question["like"] = True
-                    elif feedback[0].get("value") == "dislike":
-                        question["dislike"] = True
-
-        context["questions"] = serialized_questions
+        context["questions"] = questions
+        context["page_obj"] = page
 
         return context
 
@@ -116,7 +210,8 @@ class QuestionCreateView(CreateView):
         - template_name (str): La plantilla HTML utilizada para renderizar la vista.
 
     Métodos:
-        - `form_valid(form)`: Asigna el autor de la pregunta al usuario autenticado.
+        - `form_valid(form)`: Asigna el autor de la pregunta al usuario autenticado y
+          la agrega al leaderboard.
         - `get_success_url()`: Devuelve la URL a la que se redirige después de una creación
           exitosa.
 
@@ -133,8 +228,16 @@ class QuestionCreateView(CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
+        # Question.save() crea la fila de puntaje con los puntos del día
+        with transaction.atomic():
+            response = super().form_valid(form)
 
-        return super().form_valid(form)
+        # Agrega la nueva pregunta al leaderboard e invalida las páginas cacheadas
+        score = self.object.score
+        leaderboard.update(self.object.pk, score.base_score, score.version)
+        page_cache.bump()
+
+        return response
 
     def get_success_url(self):
         return reverse_lazy("survey:question-edit-list")
@@ -154,7 +257,10 @@ class UserQuestionListView(LoginRequiredMixin, ListView):
         - context_object_name (str): El nombre del objeto de contexto utilizado en la plantilla.
 
     Métodos:
-        - `get_queryset()`: Devuelve el conjunto de preguntas filtrado por el usuario autenticado.
+        - `get_queryset()`: Devuelve el conjunto de preguntas filtrado por el usuario autenticado,
+          de la más reciente a la más antigua.
+        - `paginate_queryset(queryset, page_size)`: Obtiene la página del parámetro
+          `cursor` con paginación por cursor.
 
     Retorno:
         - QuerySet: El conjunto de preguntas filtrado."""
@@ -162,10 +268,31 @@ class UserQuestionListView(LoginRequiredMixin, ListView):
     model = Question
     template_name = "survey/question_list.html"
     context_object_name = "questions"
+    paginate_by = 20
 
     def get_queryset(self):
-        # Filtrar preguntas por el usuario autenticado
-        return Question.objects.filter(author=self.request.user)
+        # Filtrar preguntas por el usuario autenticado, de la más reciente a la más
+        # antigua (orden del índice question_author_created_idx), con el ranking
+        # guardado en QuestionScore
+        return (
+            Question.objects.filter(author=self.request.user)
+            .select_related("author")
+            .only("created", "title", "author__username")
+            .annotate(ranking=Coalesce(F("score__base_score"), 0))
+            .order_by("-created", "pk")
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # Pagina por cursor sobre (created, pk) en lugar de usar OFFSET
+        paginator = KeysetPaginator(
+            queryset, ("-created", "pk"), page_size, salt="survey.user-questions"
+        )
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor:
+            raise Http404("Cursor invalido")
+
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 class QuestionDeleteView(LoginRequiredMixin, DeleteView):
@@ -183,6 +310,7 @@ class QuestionDeleteView(LoginRequiredMixin, DeleteView):
         - `get_success_url()`: Devuelve la URL a la que se redirige después de una eliminación
           exitosa.
         - `get_queryset()`: Devuelve el conjunto de preguntas filtrado por el usuario autenticado.
+        - `delete()`: Elimina la pregunta y la quita del leaderboard.
 
     Retorno:
         - HttpResponseRedirect: Una redirección a la URL especificada en get_success_url.
@@ -199,6 +327,15 @@ class QuestionDeleteView(LoginRequiredMixin, DeleteView):
         # Filtra las preguntas solo para el usuario autenticado
         return queryset.filter(author=self.request.user)
 
+    def delete(self, request, *args, **kwargs):
+        response = super().delete(request, *args, **kwargs)
+
+        # Quita la pregunta eliminada del leaderboard e invalida las páginas cacheadas
+        leaderboard.remove(self.kwargs["pk"])
+        page_cache.bump()
+
+        return response
+
 
 class QuestionUpdateView(UpdateView):
     """
@@ -213,6 +350,7 @@ class QuestionUpdateView(UpdateView):
         - template_name (str): La plantilla HTML utilizada para renderizar la vista.
 
     Métodos:
+        - `form_valid(form)`: Guarda la pregunta e invalida las páginas cacheadas.
         - `get_success_url()`: Devuelve la URL a la que se redirige después de una actualización
           exitosa.
 
@@ -224,6 +362,14 @@ class QuestionUpdateView(UpdateView):
     fields = ["title", "description"]
     template_name = "survey/question_form.html"
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+
+        # Invalida las páginas cacheadas que muestran la pregunta
+        page_cache.bump()
+
+        return response
+
     def get_success_url(self):
         return reverse_lazy("survey:question-edit-list")
 
@@ -238,9 +384,60 @@ class QuestionManager:
     Métodos:
         - `calculate_ranking(question)`: Calcula el ranking de una pregunta según el número
           de respuestas, likes, dislikes y la fecha de creación.
-        - `get_ranked_questions(n)`: Obtiene una lista de las n preguntas mejor clasificadas
-          por ranking.
-        - `get_serialized_questions(questions)`: Serializa una lista de preguntas.
+        - `ranking_expression(prefix, **fields)`: Devuelve la expresión SQL del
+          ranking de la estrategia de `SURVEY_RANKING_STRATEGY`, calculada sobre los
+          contadores de `QuestionScore`. Con la estrategia por defecto equivale a
+          `calculate_ranking`.
+        - `today_points_expression()`: Devuelve la expresión SQL de los puntos del
+          día de hoy de cada fila de `QuestionScore`.
+        - `parse_pk(value)`: Convierte un pk recibido como texto, o devuelve None si
+          no es un entero que admita la base de datos.
+        - `parse_ranked_limit(value)`: Convierte el límite de la API de preguntas
+          mejor clasificadas, o devuelve None si es inválido.
+        - `validate_answer_value(value)`, `validate_feedback_value(value)`: Validan el
+          valor de un voto y devuelven el mensaje de error, si lo hay.
+        - `apply_votes(answers, feedback)`: Guarda votos indexados por (autor, pregunta)
+          en una transacción con upserts masivos y actualiza contadores, leaderboard y
+          cache.
+        - `update_vote_counters(question_pk, ...)`: Aplica variaciones a los contadores
+          de respuestas, suma de respuestas, likes y dislikes con expresiones F().
+        - `get_vote_counter_drift(questions)`: Devuelve las preguntas cuyos contadores
+          no coinciden con los votos almacenados.
+        - `sync_vote_counters(questions, computed_at)`: Recalcula los contadores desde
+          los votos, creando las filas de `QuestionScore` que falten.
+        - `invalidate_rankings()`: Avisa a todos los workers que los rankings
+          guardados cambiaron.
+        - `refresh_question_scores(since, overlap)`: Recalcula desde los votos solo las
+          preguntas con votos escritos después de la última ejecución.
+        - `rollover_rankings(today)`: Quita los puntos del día de hoy a las preguntas
+          de días anteriores al cambiar el día.
+        - `get_vote_counts(question_pks)`: Cuenta los votos de varias preguntas con
+          consultas agregadas.
+        - `recompute_rankings(questions, ...)`: Recalcula contadores y ranking por
+          bloques y guarda los cambios con `bulk_update`. Con `workers` mayor que 1
+          reparte rangos de pk entre procesos (`recompute_rankings_parallel`). Sin
+          `executor`, antes de crear los procesos cierra todas las conexiones del
+          proceso que llama (`connections.close_all()`), por lo que no se debe
+          llamar dentro de una transacción ni con cursores abiertos.
+        - `compute_ranking_range(query, start, end, today)`: Tarea de cada proceso;
+          devuelve los cambios de un rango de pk como arreglos compactos.
+        - `get_ranked_questions(n, strategy)`: Obtiene los registros de las n
+          preguntas mejor clasificadas por el ranking guardado usando una única
+          consulta, o por la expresión de otra estrategia para compararlas.
+        - `get_top_scores(limit)`: Obtiene los mejores (pk, ranking, versión) para
+          reconstruir el leaderboard, siempre desde la base principal.
+        - `get_leaderboard_questions(n)`: Obtiene las n mejores preguntas desde el
+          leaderboard en memoria.
+        - `get_ranked_page(cursor, per_page)`: Obtiene una página del listado por
+          ranking con paginación por cursor.
+        - `get_user_overlay(user, question_pks)`: Obtiene las respuestas y el feedback de
+          un usuario para varias preguntas con una única consulta.
+        - `get_question_scores(question_pks)`: Obtiene el ranking actual y la versión
+          de varias preguntas.
+        - `get_serialized_questions(questions)`: Serializa instancias de Question en
+          registros `QuestionRecord`.
+        - `get_listed_questions(ranking)`: Filas `values_list` con solo las columnas
+          del listado, que se convierten en registros `QuestionRecord`.
 
     Parámetros:
         - question (Question): Instancia de la clase Question para la cual se calculará
@@ -252,6 +449,9 @@ class QuestionManager:
         según la funcionalidad específica de cada uno.
     """
 
+    # Mayor pk que admite la base de datos (entero de 64 bits con signo)
+    MAX_PK = 2**63 - 1
+
     @staticmethod
     def calculate_ranking(question):
         # Cálculo del ranking
@@ -261,46 +461,738 @@ class QuestionManager:
             question=question, value="dislike"
         ).count()
 
-        # Cada respuesta suma 10 puntos al ranking
-        ranking = answers * 10
-        # Cada like suma 5 puntos al ranking
-        ranking += likes * 5
-        # Cada dislike resta 3 puntos al ranking
-        ranking -= dislikes * 3
-
-        # Agrega 10 puntos si es del día de hoy
-        if question.created == timezone.now().date():
-            ranking += 10
+        # Puntos de la fórmula del enunciado (survey/ranking.py), más los del día
+        # si es del día de hoy
+        ranking = PointsRanking().vote_points(answers, 0, likes, dislikes)
+        if question.created == timezone.localdate():
+            ranking += PointsRanking.TODAY_POINTS
 
         return ranking
 
     @staticmethod
-    def get_ranked_questions(n):
-        # Ordenamiento segun el ranking
+    def count_votes(model, **filters):
+        # Subconsulta correlacionada que cuenta los votos de cada pregunta
+        votes = (
+            model.objects.filter(question=OuterRef("pk"), **filters)
+            .order_by()
+            .values("question")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+
+        return Coalesce(Subquery(votes, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def sum_votes(model, field, **filters):
+        # Subconsulta correlacionada que suma los valores de los votos de cada
+        # pregunta
+        votes = (
+            model.objects.filter(question=OuterRef("pk"), **filters)
+            .order_by()
+            .values("question")
+            .annotate(total=Sum(field))
+            .values("total")
+        )
+
+        return Coalesce(Subquery(votes, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def ranking_expression(prefix="", **fields):
+        # Expresión SQL del ranking de la estrategia configurada, calculada sobre
+        # los contadores y los puntos del día de cada fila de QuestionScore. Las
+        # columnas se pueden reemplazar por otras expresiones (`fields`)
+        return get_strategy().expression(score_fields(prefix, **fields))
+
+    @staticmethod
+    def today_points_expression():
+        # Puntos del día de cada fila de QuestionScore. La fecha de creación se lee
+        # con una subconsulta, ya que update() no admite joins
+        created_today = Question.objects.filter(
+            pk=OuterRef("question"), created=timezone.localdate()
+        )
+
+        return Case(
+            When(Exists(created_today), then=Value(PointsRanking.TODAY_POINTS)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+    @staticmethod
+    def validate_answer_value(value):
+        # Devuelve el error de validación de una respuesta, o None si es válida
+        if not value.isdecimal():
+            return f"El valor no es digito: {value}"
+
+        if len(value) > 1 or int(value) not in range(6):
+            return f"Valor invalido: {value}"
+
+        return None
+
+    @staticmethod
+    def parse_pk(value):
+        # Pk recibido como texto, o None si no es un entero que admita la base de
+        # datos. isdecimal, a diferencia de isdigit, no acepta caracteres como "²"
+        # que int() no puede convertir, y la longitud se verifica antes de
+        # convertirlo
+        if not value.isdecimal() or len(value) > 19:
+            return None
+
+        pk = int(value)
+
+        return pk if pk <= QuestionManager.MAX_PK else None
+
+    @staticmethod
+    def parse_ranked_limit(value):
+        # Límite de la API de preguntas mejor clasificadas, entre 1 y 100, o None
+        # si es inválido. La longitud se verifica antes de convertirlo con int()
+        if not value.isdecimal() or len(value) > 3 or int(value) not in range(1, 101):
+            return None
+
+        return int(value)
+
+    @staticmethod
+    def validate_feedback_value(value):
+        # Devuelve el error de validación de un feedback, o None si es válido
+        if value not in ("like", "dislike", "other"):
+            return f"Valor invalido: {value}"
+
+        return None
+
+    @staticmethod
+    def apply_votes(answers=None, feedback=None):
+        # Guarda las respuestas y el feedback, indexados por (author_id, question_id),
+        # en una transacción: lee los valores previos, escribe cada tabla con un
+        # único upsert y ajusta los contadores de cada pregunta
+        answers = answers or {}
+        feedback = feedback or {}
+        deltas = defaultdict(
+            lambda: {"answers": 0, "answer_sum": 0, "likes": 0, "dislikes": 0}
+        )
+
+        with transaction.atomic():
+            if answers:
+                previous = QuestionManager.get_previous_votes(Answer, answers)
+                Answer.objects.bulk_upsert(
+                    [
+                        (pk, author_id, value)
+                        for (author_id, pk), value in answers.items()
+                    ]
+                )
+                for key, value in answers.items():
+                    deltas[key[1]]["answers"] += QuestionManager.answer_counter_delta(
+                        previous.get(key, 0), value
+                    )
+                    deltas[key[1]]["answer_sum"] += QuestionManager.answer_sum_delta(
+                        previous.get(key, 0), value
+                    )
+
+            if feedback:
+                previous = QuestionManager.get_previous_votes(
+                    QuestionFeedback, feedback
+                )
+                QuestionFeedback.objects.bulk_upsert(
+                    [
+                        (pk, author_id, value)
+                        for (author_id, pk), value in feedback.items()
+                    ]
+                )
+                for key, value in feedback.items():
+                    likes, dislikes = QuestionManager.feedback_counter_deltas(
+                        previous.get(key), value
+                    )
+                    deltas[key[1]]["likes"] += likes
+                    deltas[key[1]]["dislikes"] += dislikes
+
+            for pk, delta in deltas.items():
+                QuestionManager.update_vote_counters(pk, **delta)
+            scores = QuestionManager.get_question_scores(list(deltas))
+
+            # Las preguntas creadas sin su fila de QuestionScore se cuentan desde
+            # las tablas de votos
+            missing = [pk for pk in deltas if pk not in scores]
+            if missing:
+                QuestionManager.sync_vote_counters(
+                    Question.objects.filter(pk__in=missing)
+                )
+                scores.update(QuestionManager.get_question_scores(missing))
+
+        # Publica los nuevos rankings, con la versión leída en la transacción, e
+        # invalida las páginas cacheadas
+        for pk, (ranking, version) in scores.items():
+            leaderboard.update(pk, ranking, version)
+        page_cache.bump()
+
+        return {pk: ranking for pk, (ranking, _) in scores.items()}
+
+    @staticmethod
+    def get_previous_votes(model, votes):
+        # Valores actuales de los votos indicados por (author_id, question_id),
+        # bloqueados hasta el final de la transacción donde se soporte
+        rows = (
+            model.objects.select_for_update()
+            .filter(
+                author_id__in={author_id for author_id, _ in votes},
+                question_id__in={pk for _, pk in votes},
+            )
+            .values_list("author_id", "question_id", "value")
+        )
+
+        return {
+            (author_id, pk): value
+            for author_id, pk, value in rows
+            if (author_id, pk) in votes
+        }
+
+    @staticmethod
+    def answer_counter_delta(previous, value):
+        # Solo las respuestas entre 1 y 5 cuentan en el ranking
+        return int(int(value) in range(1, 6)) - int(int(previous) in range(1, 6))
+
+    @staticmethod
+    def answer_sum_delta(previous, value):
+        # Variación de la suma de las respuestas entre 1 y 5
+        def counted(answer):
+            return int(answer) if int(answer) in range(1, 6) else 0
+
+        return counted(value) - counted(previous)
+
+    @staticmethod
+    def feedback_counter_deltas(previous, value):
+        # Variación de likes y dislikes al pasar de un feedback a otro
+        likes = int(value == "like") - int(previous == "like")
+        dislikes = int(value == "dislike") - int(previous == "dislike")
+
+        return likes, dislikes
+
+    @staticmethod
+    def update_vote_counters(question_pk, answers=0, answer_sum=0, likes=0, dislikes=0):
+        # Aplica las variaciones a los contadores y al ranking con expresiones F()
+        # para que la base de datos resuelva el incremento de forma atómica. Los
+        # puntos del día ya están incluidos en el ranking guardado. Si el ranking
+        # de la estrategia no es lineal en los contadores, se vuelve a calcular
+        # con su expresión sobre los contadores ya actualizados
+        points = get_strategy().vote_points(answers, answer_sum, likes, dislikes)
+        deltas = {
+            "answer_count": answers,
+            "answer_sum": answer_sum,
+            "like_count": likes,
+            "dislike_count": dislikes,
+            "base_score": points or 0,
+        }
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+
+        if changes:
+            changes["version"] = F("version") + 1
+            score = QuestionScore.objects.filter(pk=question_pk)
+            score.update(**changes)
+            if points is None:
+                score.update(base_score=QuestionManager.ranking_expression())
+
+    @staticmethod
+    def counted_votes():
+        # Conteos reales de votos, obtenidos desde las tablas de votos
+        return {
+            "answer_count": QuestionManager.count_votes(Answer, value__range=(1, 5)),
+            "answer_sum": QuestionManager.sum_votes(
+                Answer, "value", value__range=(1, 5)
+            ),
+            "like_count": QuestionManager.count_votes(QuestionFeedback, value="like"),
+            "dislike_count": QuestionManager.count_votes(
+                QuestionFeedback, value="dislike"
+            ),
+        }
+
+    @staticmethod
+    def get_vote_counter_drift(questions=None):
+        # Preguntas cuyos contadores no coinciden con los votos almacenados. Una
+        # pregunta sin fila de QuestionScore tiene sus contadores en cero
+        if questions is None:
+            questions = Question.objects.all()
+
+        stored = {
+            field: Coalesce(F(f"score__{field}"), 0)
+            for field in QuestionManager.counted_votes()
+        }
+        counted = {
+            f"counted_{field}": expression
+            for field, expression in QuestionManager.counted_votes().items()
+        }
+
+        return (
+            questions.annotate(**stored, **counted)
+            .exclude(
+                answer_count=F("counted_answer_count"),
+                answer_sum=F("counted_answer_sum"),
+                like_count=F("counted_like_count"),
+                dislike_count=F("counted_dislike_count"),
+            )
+            .order_by("pk")
+        )
+
+    @staticmethod
+    def sync_vote_counters(questions=None, computed_at=None):
+        # Recalcula los contadores desde las tablas de votos, y con ellos el ranking.
+        # Crea antes las filas de QuestionScore de las preguntas que no la tengan
+        if questions is None:
+            questions = Question.objects.all()
+
+        QuestionScore.objects.bulk_create(
+            [
+                QuestionScore(question_id=pk)
+                for pk in questions.filter(score__isnull=True).values_list(
+                    "pk", flat=True
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+        scores = QuestionScore.objects.filter(question__in=questions.values("pk"))
+        synced = scores.update(
+            **QuestionManager.counted_votes(),
+            today_points=QuestionManager.today_points_expression(),
+        )
+
+        # computed_at se guarda al final, ya que `questions` puede filtrar por él
+        changes = {
+            "base_score": QuestionManager.ranking_expression(),
+            "version": F("version") + 1,
+        }
+        if computed_at is not None:
+            changes["computed_at"] = computed_at
+        scores.update(**changes)
+
+        return synced
+
+    @staticmethod
+    def invalidate_rankings():
+        # Después de cambiar rankings fuera de las vistas de votación, los workers
+        # reconstruyen el leaderboard y descartan las páginas cacheadas
+        leaderboard.invalidate()
+        page_cache.bump()
+
+    @staticmethod
+    def refresh_question_scores(since=None, overlap=None):
+        # Recalcula desde las tablas de votos solo las preguntas con votos escritos
+        # desde `since`; por defecto, desde la última ejecución (el mayor
+        # computed_at) menos `overlap`, que cubre los votos de transacciones que
+        # confirmaron después de que la ejecución anterior leyera las tablas. Sin
+        # ejecuciones previas recalcula todas las preguntas. Las preguntas creadas
+        # sin su fila de puntaje (con bulk_create) la reciben con su primer voto
+        started = timezone.now()
+        if overlap is None:
+            overlap = timezone.timedelta(
+                seconds=getattr(settings, "SURVEY_SCORE_REFRESH_OVERLAP", 60)
+            )
+
+        if since is None:
+            last_run = QuestionScore.objects.aggregate(last=Max("computed_at"))["last"]
+            since = last_run - overlap if last_run else None
+
         questions = Question.objects.all()
+        if since is not None:
+            # Búsquedas por rango en los índices (updated, question) de los votos,
+            # más las filas de puntaje que nunca se recalcularon
+            questions = questions.filter(
+                Q(pk__in=Answer.objects.filter(updated__gte=since).values("question"))
+                | Q(
+                    pk__in=QuestionFeedback.objects.filter(updated__gte=since).values(
+                        "question"
+                    )
+                )
+                | Q(
+                    pk__in=QuestionScore.objects.filter(
+                        computed_at__isnull=True
+                    ).values("question")
+                )
+            )
+
+        with transaction.atomic():
+            refreshed = QuestionManager.sync_vote_counters(
+                questions, computed_at=started
+            )
+
+        if refreshed:
+            QuestionManager.invalidate_rankings()
+
+        return refreshed
+
+    @staticmethod
+    def rollover_rankings(today=None):
+        # Quita los puntos del día a las preguntas creadas antes de `today`, con
+        # una única sentencia sobre las filas del índice question_score_today_idx
+        # que calcula el ranking sin esos puntos. Volver a ejecutarlo no tiene efecto
+        if today is None:
+            today = timezone.localdate()
+
+        rolled = QuestionScore.objects.filter(
+            today_points__gt=0, question__created__lt=today
+        ).update(
+            base_score=QuestionManager.ranking_expression(today_points=Value(0)),
+            today_points=0,
+            version=F("version") + 1,
+        )
+
+        # Los workers que reconstruyeron el leaderboard al cambiar el día, antes de
+        # este UPDATE, lo vuelven a reconstruir al ver la fecha publicada
+        if rolled:
+            QuestionManager.invalidate_rankings()
+        leaderboard.publish_rollover(today)
+
+        return rolled
+
+    @staticmethod
+    def get_vote_counts(question_pks):
+        # Conteos de respuestas, suma de respuestas, likes y dislikes de varias
+        # preguntas, agregados en la base de datos con una consulta por tabla
+        counts = {pk: [0, 0, 0, 0] for pk in question_pks}
+
+        answers = (
+            Answer.objects.filter(question_id__in=question_pks, value__range=(1, 5))
+            .values("question_id")
+            .annotate(total=Count("pk"), value_sum=Sum("value"))
+            .values_list("question_id", "total", "value_sum")
+        )
+        for pk, total, value_sum in answers:
+            counts[pk][0] = total
+            counts[pk][1] = value_sum
+
+        feedback = (
+            QuestionFeedback.objects.filter(
+                question_id__in=question_pks, value__in=("like", "dislike")
+            )
+            .values("question_id", "value")
+            .annotate(total=Count("pk"))
+            .values_list("question_id", "value", "total")
+        )
+        for pk, value, total in feedback:
+            counts[pk][2 if value == "like" else 3] = total
+
+        return counts
+
+    @staticmethod
+    def stored_scores():
+        # Valores guardados en QuestionScore, anotados en cada pregunta (None si la
+        # pregunta no tiene su fila), y el ranking que les corresponde según la
+        # estrategia configurada
+        stored = {
+            field: F(f"score__{field}") for field in [*SCORE_FIELDS, "base_score"]
+        }
+        stored["expected_score"] = QuestionManager.ranking_expression(
+            "score__", created=F("created")
+        )
+
+        return stored
+
+    @staticmethod
+    def get_stale_rankings(questions, today):
+        # Filas (pk, respuestas, suma de respuestas, likes, dislikes, puntos del
+        # día) de las preguntas cuyos valores guardados no coinciden con sus votos,
+        # o cuyo ranking guardado no coincide con el de la estrategia configurada
+        counts = QuestionManager.get_vote_counts([q.pk for q in questions])
 
+        stale = []
         for question in questions:
-            question.ranking = QuestionManager.calculate_ranking(question)
-            question.save()
+            values = (
+                *counts[question.pk],
+                PointsRanking.TODAY_POINTS if question.created == today else 0,
+            )
+            stored = tuple(getattr(question, field) for field in SCORE_FIELDS)
+            if stored != values or question.base_score != question.expected_score:
+                stale.append((question.pk, *values))
+
+        return stale
+
+    @staticmethod
+    def save_rankings(rows, batch_size):
+        # Guarda filas (pk, *SCORE_FIELDS) con bulk_update, insertando antes las
+        # filas de QuestionScore que falten, y recalcula su ranking con la
+        # expresión de la estrategia en una sentencia por lote
+        fields = SCORE_FIELDS
+        scores = [
+            QuestionScore(question_id=row[0], **dict(zip(fields, row[1:])))
+            for row in rows
+        ]
+        QuestionScore.objects.bulk_create(
+            scores, batch_size=batch_size, ignore_conflicts=True
+        )
+        QuestionScore.objects.bulk_update(scores, fields, batch_size=batch_size)
+
+        ranking = QuestionManager.ranking_expression()
+        for start in range(0, len(rows), batch_size):
+            QuestionScore.objects.filter(
+                pk__in=[row[0] for row in rows[start : start + batch_size]]
+            ).update(base_score=ranking, version=F("version") + 1)
+
+    @staticmethod
+    def recompute_rankings(
+        questions=None,
+        chunk_size=1000,
+        batch_size=500,
+        dry_run=False,
+        progress=None,
+        workers=1,
+        executor=None,
+    ):
+        # Recalcula contadores y ranking desde las tablas de votos por bloques de
+        # preguntas, y guarda solo las filas que cambiaron con bulk_update
+        if questions is None:
+            questions = Question.objects.all()
+
+        if workers > 1 or executor is not None:
+            return QuestionManager.recompute_rankings_parallel(
+                questions, chunk_size, batch_size, dry_run, progress, workers, executor
+            )
+
+        questions = questions.only("pk", "created")
+        questions = questions.annotate(**QuestionManager.stored_scores()).order_by("pk")
+        total = questions.count()
+        today = timezone.localdate()
+
+        processed = changed = 0
+        last_pk = None
+        while True:
+            # Recorre las preguntas por rangos de pk: SQLite no aísla una lectura
+            # abierta de las escrituras sobre la misma tabla
+            chunk = questions if last_pk is None else questions.filter(pk__gt=last_pk)
+            chunk = list(chunk[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+
+            stale = QuestionManager.get_stale_rankings(chunk, today)
+            if stale and not dry_run:
+                QuestionManager.save_rankings(stale, batch_size)
+
+            processed += len(chunk)
+            changed += len(stale)
+            if progress:
+                progress(processed, total)
+
+        return changed
+
+    @staticmethod
+    def recompute_rankings_parallel(
+        questions, chunk_size, batch_size, dry_run, progress, workers, executor=None
+    ):
+        # Divide las preguntas en rangos de pk de `chunk_size` preguntas y los
+        # procesa en `workers` procesos, cada uno con su propia conexión a la base
+        # de datos. Los límites se toman de los pk existentes (cada `chunk_size`-ésimo
+        # pk), de modo que los huecos en los ids no generan tareas vacías. El proceso
+        # principal guarda todos los cambios con un único bulk_update
+        starts = []
+        total = 0
+        for pk in (
+            questions.order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=10 * chunk_size)
+        ):
+            if total % chunk_size == 0:
+                starts.append(pk)
+            total += 1
+            last = pk
+        if not starts:
+            return 0
+
+        today = timezone.localdate()
+        ranges = list(zip(starts, starts[1:] + [last + 1]))
+
+        if executor is None:
+            # Los procesos hijos no deben heredar las conexiones abiertas. Cierra
+            # también las conexiones del proceso que llama: dentro de un bloque
+            # atomic la transacción se revierte, y fuera de él la siguiente consulta
+            # abre una conexión nueva
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup
+            )
+
+        stale = []
+        processed = 0
+        with executor:
+            results = executor.map(
+                QuestionManager.compute_ranking_range,
+                [questions.query] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                [today] * len(ranges),
+            )
+            for count, columns in results:
+                stale.extend(zip(*columns))
+                processed += count
+                if progress and count:
+                    progress(processed, total)
+
+        if stale and not dry_run:
+            QuestionManager.save_rankings(stale, batch_size)
+
+        return len(stale)
 
-        questions = questions.order_by("-ranking").all()[:n]
+    @staticmethod
+    def compute_ranking_range(query, start, end, today):
+        # Tarea de un proceso: calcula las preguntas con pk en [start, end) y
+        # devuelve las filas con cambios como arreglos compactos por columna
+        questions = Question.objects.all()
+        questions.query = query
+        chunk = list(
+            questions.filter(pk__gte=start, pk__lt=end)
+            .only("pk", "created")
+            .annotate(**QuestionManager.stored_scores())
+            .order_by("pk")
+        )
+
+        columns = tuple(array("q") for _ in range(1 + len(SCORE_FIELDS)))
+        for row in QuestionManager.get_stale_rankings(chunk, today):
+            for column, value in zip(columns, row):
+                column.append(value)
+
+        return len(chunk), columns
+
+    @staticmethod
+    def get_listed_questions(ranking=None):
+        # Filas con solo las columnas que muestra el listado, incluidos el título y
+        # el nombre del autor en la misma consulta, sin crear instancias del modelo.
+        # Se recorren desde QuestionScore para ordenar por su índice. Por defecto
+        # el ranking es el guardado, o el de la expresión `ranking`
+        return (
+            QuestionScore.objects.all()
+            .annotate(ranking=F("base_score") if ranking is None else ranking)
+            .values_list(*QuestionRecord.FIELDS)
+        )
+
+    @staticmethod
+    def get_ranked_questions(n, strategy=None):
+        # Ordenamiento segun el ranking guardado, en una única consulta que solo
+        # devuelve las n mejores preguntas. Con `strategy` se ordena por la
+        # expresión de esa estrategia, calculada en la consulta, para comparar
+        # rankings sin cambiar el guardado
+        ranking = None
+        if strategy is not None:
+            ranking = get_strategy(strategy).expression(score_fields())
+
+        return QuestionRecord.from_rows(
+            QuestionManager.get_listed_questions(ranking).order_by("-ranking", "pk")[:n]
+        )
+
+    @staticmethod
+    def get_top_scores(limit):
+        # Los mejores (pk, ranking, versión), usado para reconstruir el leaderboard.
+        # Recorre el índice question_score_idx, sin joins. Siempre lee de la base
+        # principal: el leaderboard registra el número de evento antes de cargar, y
+        # una réplica atrasada dejaría fuera eventos que ya considera aplicados
+        return (
+            QuestionScore.objects.using(DEFAULT_DB_ALIAS)
+            .order_by("-base_score", "pk")
+            .values_list("pk", "base_score", "version")[:limit]
+        )
+
+    @staticmethod
+    def get_leaderboard_questions(n):
+        # Obtiene el top n desde el leaderboard en memoria y carga solo esas
+        # preguntas, sin ordenar la tabla en la base de datos
+        entries = leaderboard.top(n)
+        questions = {
+            question.pk: question
+            for question in QuestionRecord.from_rows(
+                QuestionManager.get_listed_questions().filter(
+                    pk__in=[pk for pk, _ in entries]
+                )
+            )
+        }
+
+        ranked_questions = []
+        for pk, score in entries:
+            if pk in questions:
+                questions[pk].ranking = score
+                ranked_questions.append(questions[pk])
+
+        return ranked_questions
+
+    @staticmethod
+    def get_ranked_page(cursor=None, per_page=20):
+        # Página del listado por ranking. La primera se toma del leaderboard en
+        # memoria; las siguientes, desde el cursor con una búsqueda por rango en
+        # el índice question_score_idx
+        paginator = KeysetPaginator(
+            QuestionManager.get_listed_questions(),
+            ("-ranking", "pk"),
+            per_page,
+            salt="survey.ranked-questions",
+            transform=QuestionRecord.from_rows,
+        )
+        rows = None
+        if not cursor:
+            rows = QuestionManager.get_leaderboard_questions(per_page + 1)
 
-        return questions
+        return paginator.page(cursor, rows)
+
+    @staticmethod
+    def get_user_overlay(user, question_pks):
+        # Respuestas y feedback del usuario para las preguntas indicadas,
+        # obtenidos con una única consulta sobre ambas tablas. Las columnas
+        # combinadas se declaran como anotaciones para mantener su orden
+        # en el UNION
+        answers = (
+            Answer.objects.filter(author=user, question_id__in=question_pks)
+            .annotate(kind=Value("answer", output_field=CharField()))
+            .annotate(state=Cast("value", output_field=CharField()))
+            .values_list("question_id", "kind", "state")
+        )
+        feedback = (
+            QuestionFeedback.objects.filter(author=user, question_id__in=question_pks)
+            .annotate(kind=Value("feedback", output_field=CharField()))
+            .annotate(state=F("value"))
+            .values_list("question_id", "kind", "state")
+        )
+
+        overlay = {
+            pk: {"answer": 0, "like": False, "dislike": False} for pk in question_pks
+        }
+        for question_pk, kind, state in answers.union(feedback, all=True):
+            if kind == "answer":
+                overlay[question_pk]["answer"] = int(state)
+            else:
+                overlay[question_pk]["like"] = state == "like"
+                overlay[question_pk]["dislike"] = state == "dislike"
+
+        return overlay
+
+    @staticmethod
+    def get_question_scores(question_pks):
+        # Rankings guardados de varias preguntas, con la versión de cada fila
+        return {
+            pk: (ranking, version)
+            for pk, ranking, version in QuestionScore.objects.filter(
+                pk__in=question_pks
+            ).values_list("pk", "base_score", "version")
+        }
 
     @staticmethod
     def get_serialized_questions(questions):
-        # Serialización de las preguntas
-        serialized_questions = [
-            {
-                "pk": question.id,
-                "title": question.title,
-                "author": question.author,
-                "ranking": question.ranking,
-            }
-            for question in questions
-        ]
+        # Serialización de instancias de Question en los mismos registros que
+        # usan los listados
+        return [QuestionRecord.from_question(question) for question in questions]
 
-        return serialized_questions
+
+# Leaderboard en memoria compartido por las vistas del proceso
+leaderboard = Leaderboard(
+    loader=QuestionManager.get_top_scores,
+    capacity=getattr(settings, "SURVEY_LEADERBOARD_CAPACITY", 1000),
+    cache_alias=getattr(settings, "SURVEY_LEADERBOARD_CACHE", "default"),
+)
+
+# Cache de páginas renderizadas, invalidado por votos y cambios en las preguntas
+page_cache = PageCache(
+    cache_alias=getattr(settings, "SURVEY_PAGE_CACHE", "default"),
+    timeout=getattr(settings, "SURVEY_PAGE_CACHE_TIMEOUT", 60),
+)
+
+# Buffer de escritura diferida de votos, usado si SURVEY_VOTE_BUFFER es True
+vote_buffer = VoteBuffer(
+    apply=QuestionManager.apply_votes,
+    interval=getattr(settings, "SURVEY_VOTE_BUFFER_INTERVAL", 500) / 1000,
+    max_size=getattr(settings, "SURVEY_VOTE_BUFFER_SIZE", 500),
+    spool_path=getattr(settings, "SURVEY_VOTE_BUFFER_SPOOL", None),
+)
 
 
 @require_POST
@@ -316,9 +1208,12 @@ def answer_question(request):
         request (HttpRequest): La solicitud HTTP recibida.
 
     Retorno:
-        HttpResponse: Una redirección a la página principal ("/") después de procesar
-        la respuesta. En caso de datos incompletos, valores no numéricos o valores
-        fuera del rango permitido, devuelve un JsonResponse con un mensaje de error.
+        JsonResponse: El nuevo ranking de la pregunta y la respuesta actual del
+        usuario (`{"ok": True, "ranking": ..., "answer": ...}`). Con el buffer de
+        votos activado, el voto queda encolado y la respuesta lleva `"queued": True`
+        en lugar del ranking. En caso de datos
+        incompletos, valores no numéricos o valores fuera del rango permitido,
+        devuelve un JsonResponse con un mensaje de error.
     """
 
     # Extrae la información del request tipo POST
@@ -330,39 +1225,33 @@ def answer_question(request):
     if not question_pk or not value:
         return JsonResponse({"ok": False, "error": "Datos incompletos"})
 
-    if not value.isdigit():
-        return JsonResponse({"ok": False, "error": f"El valor no es digito: {value}"})
-
-    if int(value) not in range(6):
-        return JsonResponse({"ok": False, "error": f"Valor invalido: {value}"})
+    error = QuestionManager.validate_answer_value(value)
+    if error:
+        return JsonResponse({"ok": False, "error": error})
 
     try:
-        question = Question.objects.filter(pk=question_pk)[0]
+        question = Question.objects.only("pk", "author_id").filter(pk=question_pk)[0]
     except Exception as ex:
         return JsonResponse({"ok": False, "error": f"{ex}"})
 
-    if question.author == author:
+    if question.author_id == author.pk:
         return JsonResponse(
             {"ok": False, "error": "No se puede votar tu propia pregunta"}
         )
 
-    # Verifica si existe la entrada en el modelo Answer
-    # de lo contrario lo crea usando los datos del request
-    try:
-        answer = Answer.objects.get(question=question, author=author)
-        answer.value = value
-    except Answer.DoesNotExist:
-        answer = Answer(
-            question=question,
-            author=author,
-            value=value,
-        )
+    # Con el buffer activado el voto se guarda en el próximo vaciado, por lo que
+    # todavía no hay un ranking nuevo que devolver
+    if getattr(settings, "SURVEY_VOTE_BUFFER", False):
+        vote_buffer.add_answer(author.pk, question.pk, int(value))
+        return JsonResponse({"ok": True, "queued": True, "answer": int(value)})
 
-    # Guarda en la base de datos las entradas
-    answer.save()
+    # Guarda la respuesta y devuelve el nuevo ranking y la respuesta del usuario
+    rankings = QuestionManager.apply_votes(
+        answers={(author.pk, question.pk): int(value)}
+    )
+    ranking = rankings[question.pk]
 
-    # Redirige a /
-    return redirect("/")
+    return JsonResponse({"ok": True, "ranking": ranking, "answer": int(value)})
 
 
 @require_POST
@@ -378,9 +1267,11 @@ def like_dislike_question(request):
         request (HttpRequest): La solicitud HTTP recibida.
 
     Retorno:
-        HttpResponse: Una redirección a la página principal ("/") después de procesar
-        el voto. En caso de datos incompletos o valores inválidos, devuelve un
-        JsonResponse con un mensaje de error.
+        JsonResponse: El nuevo ranking de la pregunta y el estado actual del voto
+        del usuario (`{"ok": True, "ranking": ..., "like": ..., "dislike": ...}`).
+        Con el buffer de votos activado, el voto queda encolado y la respuesta lleva
+        `"queued": True` en lugar del ranking. En caso de datos incompletos o
+        valores inválidos, devuelve un JsonResponse con un mensaje de error.
     """
 
     # Extrae la información del request tipo POST
@@ -392,33 +1283,302 @@ def like_dislike_question(request):
     if not question_pk or not value:
         return JsonResponse({"ok": False, "error": "Datos incompletos"})
 
-    if value not in ("like", "dislike", "other"):
-        return JsonResponse({"ok": False, "error": f"Valor invalido: {value}"})
+    error = QuestionManager.validate_feedback_value(value)
+    if error:
+        return JsonResponse({"ok": False, "error": error})
 
     try:
-        question = Question.objects.filter(pk=question_pk)[0]
+        question = Question.objects.only("pk", "author_id").filter(pk=question_pk)[0]
     except Exception as ex:
         return JsonResponse({"ok": False, "error": f"{ex}"})
 
-    if question.author == author:
+    if question.author_id == author.pk:
         return JsonResponse(
             {"ok": False, "error": "No puedes votar tu propia pregunta"}
         )
 
-    # Verifica si existe la entrada en el modelo QuestionFeedback
-    # de lo contrario lo crea usando los datos del request
+    if getattr(settings, "SURVEY_VOTE_BUFFER", False):
+        vote_buffer.add_feedback(author.pk, question.pk, value)
+        return JsonResponse(
+            {
+                "ok": True,
+                "queued": True,
+                "like": value == "like",
+                "dislike": value == "dislike",
+            }
+        )
+
+    # Guarda el feedback y devuelve el nuevo ranking y el estado del voto
+    rankings = QuestionManager.apply_votes(feedback={(author.pk, question.pk): value})
+    ranking = rankings[question.pk]
+
+    return JsonResponse(
+        {
+            "ok": True,
+            "ranking": ranking,
+            "like": value == "like",
+            "dislike": value == "dislike",
+        }
+    )
+
+
+@require_POST
+@login_required
+def bulk_vote_questions(request):
+    """
+    Vista para registrar varios votos del usuario en una sola solicitud.
+
+    Recibe en el cuerpo un arreglo JSON de votos con la forma
+    `{"question_pk": ..., "answer": ..., "feedback": ...}`, donde `answer` y `feedback`
+    son opcionales (al menos uno es obligatorio) y se validan con las mismas reglas
+    que `answer_question` y `like_dislike_question`. Los votos válidos se guardan en
+    una única transacción con upserts masivos; si una pregunta aparece varias veces,
+    prevalece el último valor.
+
+    Parámetros:
+        request (HttpRequest): La solicitud HTTP recibida.
+
+    Retorno:
+        JsonResponse: `{"ok": True, "results": [...]}` con el resultado de cada voto en
+        el mismo orden recibido: el nuevo ranking y el estado del voto, o un mensaje
+        de error. Si el cuerpo no es un arreglo JSON válido, devuelve un JsonResponse
+        con un mensaje de error.
+    """
+
+    # Extrae la información del request tipo POST
     try:
-        feedback = QuestionFeedback.objects.get(question=question, author=author)
-        feedback.value = value
-    except QuestionFeedback.DoesNotExist:
-        feedback = QuestionFeedback(
-            question=question,
-            author=author,
-            value=value,
+        votes = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "JSON invalido"})
+
+    author = request.user
+
+    # Verifica la validez de la información extraída
+    if not isinstance(votes, list) or not all(isinstance(v, dict) for v in votes):
+        return JsonResponse({"ok": False, "error": "Se esperaba un arreglo de votos"})
+
+    if len(votes) > 100:
+        return JsonResponse({"ok": False, "error": "Demasiados votos"})
+
+    question_pks = {
+        QuestionManager.parse_pk(str(vote.get("question_pk", ""))) for vote in votes
+    }
+    questions = Question.objects.only("pk", "author_id").in_bulk(
+        [pk for pk in question_pks if pk is not None]
+    )
+
+    answers = {}
+    feedback = {}
+    results = []
+    for vote in votes:
+        question_pk = str(vote.get("question_pk", ""))
+        answer = vote.get("answer")
+        value = vote.get("feedback")
+        error = None
+
+        if not question_pk or (answer is None and value is None):
+            error = "Datos incompletos"
+        elif answer is not None:
+            error = QuestionManager.validate_answer_value(str(answer))
+        if not error and value is not None:
+            error = QuestionManager.validate_feedback_value(value)
+        pk = QuestionManager.parse_pk(question_pk)
+        if not error and pk not in questions:
+            error = f"Pregunta no encontrada: {question_pk}"
+        if not error and questions[pk].author_id == author.pk:
+            error = "No se puede votar tu propia pregunta"
+
+        if error:
+            results.append(
+                {"question_pk": vote.get("question_pk"), "ok": False, "error": error}
+            )
+            continue
+
+        if answer is not None:
+            answers[pk] = int(answer)
+        if value is not None:
+            feedback[pk] = value
+        results.append({"question_pk": pk, "ok": True})
+
+    # Guarda todos los votos válidos en una transacción
+    rankings = {}
+    if answers or feedback:
+        rankings = QuestionManager.apply_votes(
+            {(author.pk, pk): value for pk, value in answers.items()},
+            {(author.pk, pk): value for pk, value in feedback.items()},
         )
 
-    # Guarda en la base de datos las entradas
-    feedback.save()
+    for result in results:
+        if result["ok"]:
+            pk = result["question_pk"]
+            result["ranking"] = rankings[pk]
+            if pk in answers:
+                result["answer"] = answers[pk]
+            if pk in feedback:
+                result["like"] = feedback[pk] == "like"
+                result["dislike"] = feedback[pk] == "dislike"
 
-    # Redirige a /
-    return redirect("/")
+    return JsonResponse({"ok": True, "results": results})
+
+
+@require_GET
+def ranked_questions_fragment(request):
+    """
+    Vista del listado de preguntas mejor clasificadas sin estado del usuario.
+
+    Devuelve el mismo fragmento HTML que usa la página principal en modo overlay,
+    tomado del cache de páginas y con `Cache-Control` público, de modo que cualquier
+    cache intermedio puede guardarlo.
+
+    Parámetros:
+        request (HttpRequest): La solicitud HTTP recibida.
+
+    Retorno:
+        HttpResponse: El fragmento HTML con las tarjetas de las preguntas.
+    """
+
+    response = HttpResponse(
+        page_cache.get_or_render_fragment(
+            "question-cards", QuestionListView.render_questions_html
+        )
+    )
+    patch_cache_control(response, public=True, max_age=page_cache.timeout)
+
+    return response
+
+
+@require_GET
+@cache_control(private=True, no_cache=True)
+def question_overlay(request):
+    """
+    Vista del estado de los votos del usuario para un conjunto de preguntas.
+
+    Recibe los pks de las preguntas en el parámetro `pks`, separados por comas, y
+    devuelve la respuesta y el like/dislike del usuario autenticado para cada una.
+    Para usuarios anónimos devuelve un estado vacío.
+
+    Parámetros:
+        request (HttpRequest): La solicitud HTTP recibida.
+
+    Retorno:
+        JsonResponse: `{"ok": True, "questions": {pk: {"answer", "like", "dislike"}}}`.
+        En caso de pks inválidos o demasiadas preguntas, devuelve un JsonResponse con
+        un mensaje de error.
+    """
+
+    # Extrae la información del request tipo GET
+    values = [value for value in request.GET.get("pks", "").split(",") if value]
+
+    # Verifica la validez de la información extraída
+    pks = [QuestionManager.parse_pk(value) for value in values]
+    for value, pk in zip(values, pks):
+        if pk is None:
+            return JsonResponse({"ok": False, "error": f"Pregunta invalida: {value}"})
+
+    if len(pks) > 100:
+        return JsonResponse({"ok": False, "error": "Demasiadas preguntas"})
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"ok": True, "questions": {}})
+
+    overlay = QuestionManager.get_user_overlay(request.user, pks)
+
+    return JsonResponse({"ok": True, "questions": overlay})
+
+
+@require_GET
+def question_description(request, pk):
+    """
+    Vista de la descripción de una pregunta.
+
+    Los listados no cargan la descripción de las preguntas; el navegador la pide a
+    esta vista al pasar el cursor o expandir una pregunta. La respuesta tiene
+    `Cache-Control` público por `SURVEY_DESCRIPTION_MAX_AGE` segundos, de modo que
+    cada descripción se pide una vez y cualquier cache intermedio puede guardarla.
+
+    Parámetros:
+        request (HttpRequest): La solicitud HTTP recibida.
+        pk (int): Pk de la pregunta.
+
+    Retorno:
+        JsonResponse: `{"ok": True, "description": str}`. Si el pk no es válido o la
+        pregunta no existe, devuelve un JsonResponse con un mensaje de error.
+    """
+
+    # Verifica la validez de la información recibida
+    if pk > QuestionManager.MAX_PK:
+        return JsonResponse({"ok": False, "error": f"Pregunta invalida: {pk}"})
+
+    description = (
+        Question.objects.filter(pk=pk).values_list("description", flat=True).first()
+    )
+
+    if description is None:
+        return JsonResponse({"ok": False, "error": f"Pregunta no encontrada: {pk}"})
+
+    response = JsonResponse({"ok": True, "description": description})
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=getattr(settings, "SURVEY_DESCRIPTION_MAX_AGE", 300),
+    )
+
+    return response
+
+
+def ranked_questions_etag(request):
+    # Versión del leaderboard: cambia con cada voto o cambio en las preguntas y con
+    # el día (por los puntos de las preguntas de hoy). Se calcula sin consultar la
+    # base de datos. La generación se guarda en SURVEY_PAGE_CACHE, que con varios
+    # workers debe ser un cache compartido (quizes/settings_production.py): así
+    # todos los workers devuelven el mismo ETag y ninguno responde 304 con datos
+    # anteriores a un voto procesado por otro. Un límite inválido no lleva ETag, de
+    # modo que su respuesta de error nunca se responde con 304
+    limit = QuestionManager.parse_ranked_limit(request.GET.get("limit", "20"))
+    if limit is None:
+        return None
+
+    return f"ranked-{page_cache.generation()}-{timezone.localdate()}-{limit}"
+
+
+@require_GET
+@cache_control(no_cache=True)
+@condition(etag_func=ranked_questions_etag)
+def ranked_questions_api(request):
+    """
+    API de lectura de las preguntas mejor clasificadas.
+
+    Devuelve los registros de las preguntas del leaderboard (`QuestionRecord`)
+    con un ETag fuerte derivado de la versión del leaderboard. Si el ETag enviado en
+    `If-None-Match` coincide, responde `304 Not Modified` sin consultar la base de
+    datos.
+
+    Parámetros:
+        request (HttpRequest): La solicitud HTTP recibida. Acepta el parámetro `limit`
+        (1 a 100, 20 por defecto).
+
+    Retorno:
+        JsonResponse: `{"ok": True, "questions": [...]}` con pk, título, autor y ranking
+        de cada pregunta. En caso de un límite inválido, devuelve un JsonResponse con
+        un mensaje de error.
+    """
+
+    # Extrae la información del request tipo GET
+    value = request.GET.get("limit", "20")
+
+    # Verifica la validez de la información extraída
+    limit = QuestionManager.parse_ranked_limit(value)
+    if limit is None:
+        return JsonResponse({"ok": False, "error": f"Limite invalido: {value}"})
+
+    serialized_questions = [
+        {
+            "pk": question.pk,
+            "title": question.title,
+            "author": question.author,
+            "ranking": question.ranking,
+        }
+        for question in QuestionManager.get_leaderboard_questions(limit)
+    ]
+
+    return JsonResponse({"ok": True, "questions": serialized_questions})
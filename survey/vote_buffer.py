@@ -0,0 +1,350 @@
+"""
+Módulo del buffer de escritura diferida de votos.
+
+En momentos de mucha actividad los votos llegan más rápido de lo que SQLite puede
+confirmar una transacción por clic. Con el buffer activado (`SURVEY_VOTE_BUFFER`),
+las vistas de votación encolan el voto en memoria y un hilo en segundo plano los
+guarda en lotes, en una sola transacción.
+
+Clases:
+    - VoteBuffer: Cola de votos agrupados por (usuario, pregunta) con vaciado
+      periódico, respaldo en disco al cerrar el proceso y métricas.
+
+Durabilidad:
+    Los votos encolados viven en la memoria del proceso. Al terminar el proceso se
+    intenta un último vaciado; si falla, los votos pendientes se escriben en un archivo
+    JSON propio del proceso junto a `SURVEY_VOTE_BUFFER_SPOOL` (por ejemplo,
+    `vote_buffer.<pid>-<ms>.json`), de modo que varios workers que cierran a la vez no
+    se pisan. El primer vaciado de cualquier proceso vuelve a encolar todos los
+    archivos respaldados. Un proceso que termina de forma abrupta pierde los votos aún
+    no guardados.
+
+Votos inválidos:
+    Si un lote falla por un error de integridad (por ejemplo, un voto de una pregunta
+    o un usuario eliminados después de encolarlo), los votos se guardan de a uno y se
+    descartan, con un aviso en el log, los que vuelven a fallar. Así un voto inválido
+    no impide guardar los demás. Ante otros errores (por ejemplo, "database is
+    locked") el lote completo vuelve a la cola.
+
+Métricas:
+    Cada proceso suma sus contadores con `incr` al cache `cache_alias` después de
+    cada vaciado, de modo que `metrics()` (y el comando `survey_stats`) muestra el
+    total de todos los workers. La profundidad de la cola de cada proceso se publica
+    en cada vaciado y al consultar las métricas, y la latencia máxima es aproximada
+    si dos workers la actualizan a la vez.
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import IntegrityError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class VoteBuffer:
+    """
+    Buffer de votos con escritura diferida.
+
+    Cada voto se guarda por `(author_id, question_id)`, de modo que si un usuario
+    vota varias veces la misma pregunta antes del vaciado solo se escribe el último
+    valor.
+
+    Atributos:
+        - apply (callable): Función `apply(answers, feedback)` que guarda los votos en
+          una transacción (`QuestionManager.apply_votes`).
+        - interval (float): Segundos entre vaciados del hilo en segundo plano.
+        - max_size (int): Cantidad de votos pendientes que adelanta el vaciado.
+        - spool_path (str): Ruta base de los archivos de respaldo de los votos
+          pendientes al cerrar; cada proceso escribe su propio archivo.
+        - autostart (bool): Si es True, el hilo se inicia con el primer voto.
+        - cache_alias (str): Alias del cache de Django donde se comparten las
+          métricas entre procesos.
+        - key_prefix (str): Prefijo de las claves de las métricas.
+
+    Métodos:
+        - `add_answer(author_id, question_id, value)`: Encola una respuesta.
+        - `add_feedback(author_id, question_id, value)`: Encola un like o dislike.
+        - `flush()`: Guarda ahora los votos pendientes y devuelve cuántos se guardaron.
+        - `start()`: Inicia el hilo de vaciado periódico.
+        - `stop()`: Detiene el hilo y vacía los votos pendientes.
+        - `metrics()`: Devuelve la profundidad de la cola, la latencia de los vaciados
+          y la cantidad de votos inválidos descartados de todos los procesos.
+        - `reset_metrics()`: Reinicia los contadores y la latencia de todos los
+          procesos, sin tocar la profundidad de la cola.
+        - `reset()`: Descarta los votos pendientes y reinicia todas las métricas.
+    """
+
+    # Contadores de `metrics()` que se suman entre procesos
+    COUNTERS = ("flushes", "flushed_votes", "failures", "dropped_votes")
+
+    def __init__(
+        self,
+        apply,
+        interval=0.5,
+        max_size=500,
+        spool_path=None,
+        autostart=True,
+        cache_alias="default",
+        key_prefix="survey:vote_buffer",
+    ):
+        self.apply = apply
+        self.interval = interval
+        self.max_size = max_size
+        self.spool_path = spool_path
+        self.autostart = autostart
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self._lock = threading.Lock()
+        # Solo un vaciado a la vez, sea del hilo o de una llamada directa
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._spool_loaded = False
+        self._atexit_registered = False
+        # Las métricas compartidas no se reinician al crear la instancia: cada
+        # worker que arranca las seguiría borrando
+        self._answers = {}
+        self._feedback = {}
+        self._pending = dict.fromkeys(self.COUNTERS, 0)
+        self._published_depth = 0
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def reset(self):
+        with self._lock:
+            self._answers = {}
+            self._feedback = {}
+            self._published_depth = 0
+        self.cache.delete(self._metric_key("queue_depth"))
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        with self._lock:
+            self._pending = dict.fromkeys(self.COUNTERS, 0)
+        keys = self.COUNTERS + ("last_flush_ms", "max_flush_ms")
+        self.cache.delete_many([self._metric_key(name) for name in keys])
+
+    def add_answer(self, author_id, question_id, value):
+        self._add(self._answers, author_id, question_id, value)
+
+    def add_feedback(self, author_id, question_id, value):
+        self._add(self._feedback, author_id, question_id, value)
+
+    def _add(self, pending, author_id, question_id, value):
+        with self._lock:
+            pending[(author_id, question_id)] = value
+            depth = len(self._answers) + len(self._feedback)
+
+        if self.autostart:
+            self.start()
+        if depth >= self.max_size:
+            self._wake.set()
+
+    def metrics(self):
+        self._publish_metrics()
+        names = self.COUNTERS + ("queue_depth", "last_flush_ms", "max_flush_ms")
+        keys = {name: self._metric_key(name) for name in names}
+        values = self.cache.get_many(keys.values())
+
+        metrics = {name: values.get(key, 0) for name, key in keys.items()}
+        for name in ("last_flush_ms", "max_flush_ms"):
+            metrics[name] = values.get(keys[name])
+
+        return metrics
+
+    def _publish_metrics(self, flush_ms=None):
+        # Suma al cache los contadores acumulados por este proceso y la variación
+        # de su cola desde la última publicación
+        with self._lock:
+            pending = self._pending
+            self._pending = dict.fromkeys(self.COUNTERS, 0)
+            depth = len(self._answers) + len(self._feedback)
+            pending["queue_depth"] = depth - self._published_depth
+            self._published_depth = depth
+
+        for name, delta in pending.items():
+            if delta:
+                key = self._metric_key(name)
+                self.cache.add(key, 0, timeout=None)
+                self.cache.incr(key, delta)
+
+        if flush_ms is not None:
+            max_key = self._metric_key("max_flush_ms")
+            current_max = self.cache.get(max_key)
+            values = {self._metric_key("last_flush_ms"): flush_ms}
+            if current_max is None or flush_ms > current_max:
+                values[max_key] = flush_ms
+            self.cache.set_many(values, timeout=None)
+
+    def _metric_key(self, name):
+        return f"{self.key_prefix}:metrics:{name}"
+
+    def flush(self):
+        with self._flush_lock:
+            self._load_spool()
+
+            # Toma los votos pendientes; los que lleguen mientras tanto esperan al
+            # siguiente vaciado
+            with self._lock:
+                answers, self._answers = self._answers, {}
+                feedback, self._feedback = self._feedback, {}
+
+            if not answers and not feedback:
+                return 0
+
+            start = time.perf_counter()
+            count = len(answers) + len(feedback)
+            try:
+                try:
+                    self.apply(answers, feedback)
+                except IntegrityError:
+                    count -= self._apply_each(answers, feedback)
+            except Exception:
+                # Devuelve los votos (los que no se guardaron) a la cola sin pisar
+                # valores más nuevos
+                with self._lock:
+                    for key, value in answers.items():
+                        self._answers.setdefault(key, value)
+                    for key, value in feedback.items():
+                        self._feedback.setdefault(key, value)
+                    self._pending["failures"] += 1
+                self._publish_metrics()
+                raise
+
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._pending["flushes"] += 1
+                self._pending["flushed_votes"] += count
+            self._publish_metrics(flush_ms=elapsed)
+
+            return count
+
+    def _apply_each(self, answers, feedback):
+        # Guarda los votos de a uno y descarta los que fallan por integridad. Quita
+        # de `answers` y `feedback` cada voto procesado, de modo que si otro error
+        # interrumpe el recorrido solo los pendientes vuelven a la cola
+        dropped = 0
+        for pending, kind in ((answers, "answer"), (feedback, "feedback")):
+            for key, value in list(pending.items()):
+                votes = ({key: value}, {}) if kind == "answer" else ({}, {key: value})
+                try:
+                    self.apply(*votes)
+                except IntegrityError:
+                    logger.warning(
+                        "Se descarta el voto inválido %s %s=%r", kind, key, value
+                    )
+                    dropped += 1
+                del pending[key]
+
+        with self._lock:
+            self._pending["dropped_votes"] += dropped
+
+        return dropped
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="vote-buffer", daemon=True
+            )
+            self._thread.start()
+
+            # Al cerrar el proceso guarda los votos pendientes o los respalda
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("No se pudieron guardar los votos pendientes")
+            self._write_spool()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("No se pudieron guardar los votos pendientes")
+            finally:
+                # El hilo usa su propia conexión a la base de datos
+                close_old_connections()
+
+    def _write_spool(self):
+        if not self.spool_path:
+            return
+
+        with self._lock:
+            data = {
+                "answers": [[*key, value] for key, value in self._answers.items()],
+                "feedback": [[*key, value] for key, value in self._feedback.items()],
+            }
+
+        if not data["answers"] and not data["feedback"]:
+            return
+
+        # Un archivo por proceso, escrito con otro nombre y renombrado al final para
+        # que ningún proceso lea un archivo a medio escribir
+        root, extension = os.path.splitext(str(self.spool_path))
+        path = f"{root}.{os.getpid()}-{int(time.time() * 1000)}{extension}"
+        with open(f"{path}.tmp", "w") as spool:
+            json.dump(data, spool)
+        os.replace(f"{path}.tmp", path)
+
+    def _load_spool(self):
+        # Vuelve a encolar los votos respaldados por procesos anteriores, sin pisar
+        # los votos recibidos después
+        if self._spool_loaded:
+            return
+        self._spool_loaded = True
+
+        if not self.spool_path:
+            return
+
+        root, extension = os.path.splitext(str(self.spool_path))
+        paths = glob.glob(f"{glob.escape(root)}.*{extension}")
+        if os.path.exists(self.spool_path):
+            paths.append(str(self.spool_path))
+
+        for path in paths:
+            # Solo el proceso que logra renombrar el archivo lo vuelve a encolar
+            claimed = f"{path}.{os.getpid()}.loading"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue
+
+            with open(claimed) as spool:
+                data = json.load(spool)
+
+            with self._lock:
+                for author_id, question_id, value in data.get("answers", []):
+                    self._answers.setdefault((author_id, question_id), value)
+                for author_id, question_id, value in data.get("feedback", []):
+                    self._feedback.setdefault((author_id, question_id), value)
+
+            os.remove(claimed)